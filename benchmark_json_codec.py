@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Micro-benchmark of the JSON codec backends on a 1000-record Pokémon dataset."""
+
+import os
+import sys
+import time
+
+# Add the datasolver path to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'datasolver'))
+
+from providers.mcp.tools import codec
+from providers.mcp.tools.pinning import canonical_json
+
+STAT_NAMES = ["hp", "attack", "defense", "special-attack", "special-defense", "speed"]
+TYPE_NAMES = ["normal", "fire", "water", "grass", "electric", "psychic", "dragon", "fairy"]
+
+
+def build_dataset(num_records: int = 1000) -> dict:
+    """Build a dataset shaped like ``PokemonTool`` output with stats, abilities and moves.
+
+    Float fields cover the exponent and fraction formats where the backends'
+    output differs from the standard library.
+    """
+    records = []
+    for i in range(1, num_records + 1):
+        records.append({
+            "id": i,
+            "name": f"pokémon-{i}",
+            "height": i % 30 + 1,
+            "weight": i * 7 % 1000 + 1,
+            "types": [TYPE_NAMES[i % len(TYPE_NAMES)], TYPE_NAMES[(i * 3) % len(TYPE_NAMES)]],
+            "base_experience": 50 + i % 250,
+            "height_m": (i % 30 + 1) / 10,
+            "capture_rate": 1 / (i + 1),
+            "egg_steps": i * 1e14,
+            "stats": {stat: 20 + (i * (index + 3)) % 130 for index, stat in enumerate(STAT_NAMES)},
+            "abilities": [
+                {"name": f"ability-{i % 300}", "is_hidden": False, "slot": 1},
+                {"name": f"ability-{(i * 7) % 300}", "is_hidden": True, "slot": 3}
+            ],
+            "moves": [f"move-{(i * 13 + m) % 900}" for m in range(20)]
+        })
+    return {
+        "data": records,
+        "count": len(records),
+        "data_type": "pokemon",
+        "source": "PokéAPI via direct requests",
+        "cached": False
+    }
+
+
+def available_backends() -> dict:
+    """Return ``{name: (dumpb, loads)}`` for every installed backend."""
+    backends = {}
+    for name, factory in (("orjson", codec._orjson_codec), ("msgspec", codec._msgspec_codec)):
+        try:
+            backends[name] = factory()
+        except (ImportError, AttributeError, TypeError):
+            pass
+    backends["json"] = (codec._stdlib_dumpb, codec._stdlib_loads)
+    return backends
+
+
+def best_of(fn, repeat: int) -> float:
+    """Return the fastest of ``repeat`` timed runs in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run_benchmark(num_records: int = 1000, repeat: int = 20):
+    """Time compact, canonical and indented encoding plus decoding per backend."""
+    print("⏱️  JSON Codec Micro-benchmark")
+    print("=" * 50)
+
+    dataset = build_dataset(num_records)
+    payload = codec._stdlib_dumpb(dataset)
+    print(f"Dataset: {num_records} records, {len(payload) // 1024} KB compact")
+    print(f"Active codec: {codec.BACKEND} (set JSON_CODEC to force one)\n")
+
+    # Content hashes use canonical_json, which stays on the standard library
+    assert canonical_json(dataset) == codec._stdlib_dumpb(dataset, sort_keys=True)
+
+    cases = [
+        ("encode", lambda dumpb, loads: dumpb(dataset)),
+        ("encode sorted", lambda dumpb, loads: dumpb(dataset, sort_keys=True)),
+        ("encode indent", lambda dumpb, loads: dumpb(dataset, indent=True)),
+        ("decode", lambda dumpb, loads: loads(payload))
+    ]
+
+    results = {}
+    print(f"{'backend':<10}" + "".join(f"{name:>16}" for name, _ in cases))
+    for backend, (dumpb, loads) in available_backends().items():
+        # Backends may format floats differently but must round-trip the same data
+        assert loads(dumpb(dataset, sort_keys=True)) == dataset, backend
+        results[backend] = [best_of(lambda: case(dumpb, loads), repeat) for _, case in cases]
+        print(f"{backend:<10}" + "".join(f"{ms:>13.2f} ms" for ms in results[backend]))
+
+    baseline = results["json"]
+    for backend, timings in results.items():
+        if backend == "json":
+            continue
+        speedups = ", ".join(
+            f"{name} {base / ms:.1f}x" for (name, _), base, ms in zip(cases, baseline, timings)
+        )
+        print(f"\n🚀 {backend} vs stdlib json: {speedups}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -1,7 +1,6 @@
 """Main data solver implementation focused on Pokémon data generation."""
 
 import os
-import json
 import logging
 from typing import Dict, Any, Optional
 from pathlib import Path
@@ -12,6 +11,7 @@ from .providers.provider import DataProvider
 from .providers.mcp.tools.tool import MCPTool
 from .providers.mcp.tools.pokemon import PokemonTool
 from .providers.mcp.client import MCPClient
+from .writer import open_writer, output_options
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('DataSolver')
@@ -34,16 +34,29 @@ class DataSolver:
         # For Pokémon-focused solver, always use MCP with PokemonTool
         return cls(provider_type=ProviderType.MCP, mcp_tools=[PokemonTool])
 
-    def __init__(self, provider_type: ProviderType = ProviderType.MCP, mcp_tools: Optional[list] = None):
+    def __init__(self, provider_type: ProviderType = ProviderType.MCP, mcp_tools: Optional[list] = None,
+                 pretty_json: Optional[bool] = None, output_format: Optional[str] = None,
+                 compression: Optional[str] = None):
         """Initialize solver with Pokémon-focused MCP provider
         
         Args:
             provider_type: Type of provider to use (defaults to MCP for Pokémon)
             mcp_tools: List of MCP tool classes to use (defaults to [PokemonTool])
+            pretty_json: Indent dataset files instead of writing compact JSON
+                (defaults to DATASET_PRETTY_JSON or false)
+            output_format: Dataset format: json, jsonl, columnar or parquet
+                (defaults to DATASET_FORMAT or json; an RFD's ``output_format`` wins)
+            compression: gzip, zstd or none
+                (defaults to DATASET_COMPRESSION or none; an RFD's ``compression`` wins)
         """
         # Always use MCP provider with PokemonTool for this focused implementation
         from .providers.mcp.client import MCPClient
         self.provider = MCPClient(tools=mcp_tools or [PokemonTool])
+        if pretty_json is None:
+            pretty_json = os.getenv("DATASET_PRETTY_JSON", "false").lower() == "true"
+        self.pretty_json = pretty_json
+        self.output_format = output_format
+        self.compression = compression
         logger.info(f"Initialized Pokémon DataSolver with MCP provider")
     
     def solve(self, rfd: Dict) -> Optional[str]:
@@ -60,15 +73,14 @@ class DataSolver:
             if not self._is_pokemon_request(rfd):
                 logger.warning("RFD does not appear to be Pokémon-related. Processing anyway...")
             
-            dataset = self.provider.generate_dataset(rfd)
-            if not dataset:
-                return None
-                
-            file_path = f"data/pokemon_rfd_{rfd.get('rfd_id', 'unknown')}_solution.json"
-            os.makedirs("data", exist_ok=True)
+            output_format, compression = output_options(rfd, self.output_format, self.compression)
             
-            with open(file_path, 'w') as f:
-                json.dump(dataset, f, indent=2)
+            # Records reach the temp file as the tool yields them; it is renamed into place at the end
+            stream = self.provider.stream_dataset(rfd)
+            with open_writer(f"data/pokemon_rfd_{rfd.get('rfd_id', 'unknown')}_solution",
+                             output_format, compression, pretty=self.pretty_json) as writer:
+                writer.write_all(stream)
+                file_path = writer.close(stream.metadata)
             
             logger.info(f"Pokémon dataset generated successfully at: {file_path}")
             return file_path
@@ -6,7 +6,7 @@ from typing import Dict, Any, Optional, List, Type
 from pathlib import Path
 
 from .provider import MCPProvider
-from .tools.tool import MCPTool
+from .tools.tool import MCPTool, DatasetStream
 from .tools.pokemon import PokemonTool
 
 logger = logging.getLogger('MCPClient')
@@ -74,6 +74,36 @@ class MCPClient(MCPProvider):
         """
         return list(self._tools.keys())
     
+    def _resolve_tool(self, rfd: Dict) -> MCPTool:
+        """Pick the tool for an RFD and check that it can handle it
+        
+        Args:
+            rfd: Request for data
+            
+        Returns:
+            Tool instance named by the RFD's ``mcp_tool`` (or the first registered tool)
+            
+        Raises:
+            ValueError: If no compatible tool is available
+        """
+        # Get tool from RFD or use default
+        tool_name = rfd.get("mcp_tool")
+        if not tool_name:
+            # Use first available tool if none specified
+            tool_name = next(iter(self._tools)) if self._tools else None
+            if not tool_name:
+                raise ValueError("No MCP tools available")
+        
+        tool = self.get_tool(tool_name)
+        if not tool:
+            raise ValueError(f"MCP tool not found: {tool_name}")
+        
+        # Validate RFD
+        if not tool.validate_rfd(rfd):
+            raise ValueError(f"RFD not compatible with {tool_name} tool")
+        
+        return tool
+    
     def generate_dataset(self, rfd: Dict) -> Dict[str, Any]:
         """Generate dataset using MCP tools
         
@@ -84,26 +114,32 @@ class MCPClient(MCPProvider):
             Generated dataset
         """
         try:
-            # Get tool from RFD or use default
-            tool_name = rfd.get("mcp_tool")
-            if not tool_name:
-                # Use first available tool if none specified
-                tool_name = next(iter(self._tools)) if self._tools else None
-                if not tool_name:
-                    raise ValueError("No MCP tools available")
-            
-            tool = self.get_tool(tool_name)
-            if not tool:
-                raise ValueError(f"MCP tool not found: {tool_name}")
-            
-            # Validate RFD
-            if not tool.validate_rfd(rfd):
-                raise ValueError(f"RFD not compatible with {tool_name} tool")
+            tool = self._resolve_tool(rfd)
             
             # Generate data
             result = tool.generate_data(rfd)
             return result
             
+        except Exception as e:
+            logger.error(f"Failed to generate dataset: {e}")
+            raise
+    
+    def stream_dataset(self, rfd: Dict) -> DatasetStream:
+        """Generate dataset using MCP tools as a lazy record stream
+        
+        Records are produced only as the stream is iterated, so the caller
+        can write or upload them while later ones are still being fetched.
+        
+        Args:
+            rfd: Request for data
+            
+        Returns:
+            Stream of records; its ``metadata`` is set once it is exhausted
+        """
+        try:
+            tool = self._resolve_tool(rfd)
+            return DatasetStream(tool.stream_data(rfd))
+            
         except Exception as e:
             logger.error(f"Failed to generate dataset: {e}")
             raise 
\ No newline at end of file
@@ -0,0 +1,315 @@
+"""Async-native Pokémon tool for event-loop hosts such as the MCP server."""
+
+import asyncio
+import copy
+import functools
+import logging
+from typing import Dict, Any, List, Optional
+from .pokemon import PokemonTool
+from . import codec
+from .projection import project
+from .http_client import http2_enabled, keepalive_expiry
+from .single_flight import AsyncSingleFlight
+from .schema_plan import ProjectionPlan
+
+logger = logging.getLogger('AsyncPokemonTool')
+
+
+class AsyncPokemonTool(PokemonTool):
+    """``PokemonTool`` whose request path and record builders are coroutines.
+
+    PokéAPI requests go through an ``httpx.AsyncClient`` when httpx is
+    installed, otherwise through the synchronous request path on the default
+    executor. Either way the event loop stays free while records are fetched,
+    so concurrent tool calls interleave instead of queueing.
+
+    Caching, projection, planning and record building are shared with
+    ``PokemonTool``; the synchronous ``generate_data`` keeps working.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the tool; arguments are passed to ``PokemonTool``."""
+        super().__init__(*args, **kwargs)
+        self._async_client = None
+        self.async_rfd_flight = AsyncSingleFlight()
+        self.async_request_flight = AsyncSingleFlight()
+        try:
+            import httpx
+            self._httpx = httpx
+        except ImportError:
+            self._httpx = None
+            logger.info("httpx not installed, async requests will run on the default executor")
+
+    def _get_async_client(self):
+        """Create the shared ``httpx.AsyncClient`` on first use."""
+        if self._async_client is None:
+            self._async_client = self._httpx.AsyncClient(
+                timeout=10,
+                follow_redirects=True,
+                http2=http2_enabled(),
+                limits=self._httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                    keepalive_expiry=keepalive_expiry()
+                )
+            )
+        return self._async_client
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get cache statistics, including async coalescing counters."""
+        stats = super().get_cache_stats()
+        stats['single_flight']['async_rfds'] = self.async_rfd_flight.get_stats()
+        stats['single_flight']['async_requests'] = self.async_request_flight.get_stats()
+        return stats
+
+    async def aclose(self) -> None:
+        """Close the async HTTP client."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    async def _make_request_async(self, endpoint: str) -> Optional[Dict]:
+        """Async counterpart of ``_make_request``."""
+        # Serve from the local snapshot when one is loaded
+        if self.snapshot:
+            record = self.snapshot.get(endpoint)
+            if record is not None:
+                return record
+
+        return await self._request_api_async(endpoint)
+
+    async def _request_api_async(self, endpoint: str) -> Optional[Dict]:
+        """Async counterpart of ``_request_api``."""
+        if self.offline:
+            logger.warning(f"Offline mode: {endpoint} not found in Pokédex snapshot")
+            return None
+
+        if self._httpx is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._request_api, endpoint)
+
+        url = f"{self.base_url}/{endpoint}"
+
+        # Check cache first
+        cached = self.cache.get(url)
+        if cached is not None:
+            return cached
+
+        # Identical URLs already in flight share one fetch
+        data, _ = await self.async_request_flight.do(url, lambda: self._fetch_and_project_async(endpoint, url))
+        return data
+
+    async def _fetch_and_project_async(self, endpoint: str, url: str) -> Optional[Dict]:
+        """Async counterpart of ``_fetch_and_project``."""
+        raw = await self._fetch_raw_async(endpoint, url)
+        if raw is None:
+            return None
+
+        try:
+            data = project(endpoint, raw)
+        except (KeyError, IndexError, TypeError) as e:
+            logger.warning(f"Unexpected response shape for {url}: {e}")
+            return None
+
+        # Cache the projected record
+        self.cache.set(url, data)
+
+        return data
+
+    async def _fetch_raw_async(self, endpoint: str, url: str) -> Optional[Dict]:
+        """Async counterpart of ``_fetch_raw`` using ``httpx``.
+
+        Response store reads and writes are SQLite calls and run on the
+        default executor so they never block the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        stored = await loop.run_in_executor(None, self.response_store.get, endpoint) if self.response_store else None
+        if stored and stored.is_fresh(self.response_store.max_age_seconds):
+            try:
+                return codec.loads(stored.body)
+            except ValueError:
+                logger.warning(f"Discarding corrupt stored response for {endpoint}")
+                stored = None
+
+        try:
+            # Wait for a token to stay within the PokéAPI rate limit
+            await self.rate_limiter.acquire_async()
+            headers = stored.conditional_headers() if stored else {}
+            response = await self._get_async_client().get(url, headers=headers)
+
+            if stored and response.status_code == 304:
+                # Upstream confirmed our copy is current
+                await loop.run_in_executor(None, self.response_store.touch, endpoint)
+                return codec.loads(stored.body)
+
+            response.raise_for_status()
+            data = codec.loads(response.content)
+            if self.response_store:
+                await loop.run_in_executor(None, functools.partial(
+                    self.response_store.put, endpoint, response.content,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified")
+                ))
+            return data
+        except Exception as e:
+            if stored:
+                # Serve the stale copy rather than failing outright
+                logger.warning(f"Revalidation of {url} failed, serving stored copy: {e}")
+                try:
+                    return codec.loads(stored.body)
+                except ValueError:
+                    pass
+            logger.warning(f"Failed to fetch {url}: {e}")
+            return None
+
+    async def _fetch_many_async(self, endpoints: List[str]) -> List[Optional[Dict]]:
+        """Async counterpart of ``_fetch_many``, bounded by ``max_concurrency``."""
+        results: List[Optional[Dict]] = [None] * len(endpoints)
+        pending = []
+        for index, endpoint in enumerate(endpoints):
+            record = self.snapshot.get(endpoint) if self.snapshot else None
+            if record is not None:
+                results[index] = record
+            else:
+                pending.append(index)
+
+        if not pending:
+            return results
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(endpoint: str) -> Optional[Dict]:
+            async with semaphore:
+                return await self._request_api_async(endpoint)
+
+        fetched = await asyncio.gather(*(fetch(endpoints[index]) for index in pending))
+        for index, record in zip(pending, fetched):
+            results[index] = record
+        return results
+
+    async def generate_data_async(self, rfd: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of ``generate_data``.
+
+        IPFS cache lookups and stores use blocking HTTP calls and run on the
+        default executor.
+        """
+        try:
+            # Identical RFDs in flight share one generation (and one IPFS pin)
+            key = self.ipfs_cache._fingerprint_rfd(rfd)
+            result, shared = await self.async_rfd_flight.do(key, lambda: self._generate_in_rfd_flight(key, rfd))
+            if shared:
+                logger.info("Joined an in-flight generation for an identical RFD")
+                # Callers own their result; the leader's records must not be shared
+                result = copy.deepcopy(result)
+            return result
+
+        except Exception as e:
+            logger.error(f"Error generating Pokémon data: {e}")
+            raise RuntimeError(f"Failed to generate Pokémon data: {e}")
+
+    async def _generate_in_rfd_flight(self, key: str, rfd: Dict[str, Any]) -> Dict[str, Any]:
+        """Lead or join ``key`` in ``rfd_flight``, the key space sync callers use.
+
+        Warm-ups, stale revalidations and ``generate_data`` run on threads
+        under ``rfd_flight``; registering async generations there too lets
+        a live request join a warm-up of the same RFD (and the reverse)
+        instead of generating it a second time.
+        """
+        call, leader = self.rfd_flight.begin(key)
+        if not leader:
+            logger.info("Joined an in-flight generation (e.g. a warm-up) for an identical RFD")
+            result = await asyncio.get_running_loop().run_in_executor(None, self.rfd_flight.wait, call)
+            if result is None:
+                # The leader was a stream that was abandoned before it finished
+                return await self._generate_result_async(rfd)
+            return copy.deepcopy(result)
+
+        try:
+            result = await self._generate_result_async(rfd)
+        except Exception as e:
+            self.rfd_flight.finish(key, call, error=e)
+            raise
+        except BaseException:
+            # Cancelled: followers generate for themselves
+            self.rfd_flight.finish(key, call)
+            raise
+        self.rfd_flight.finish(key, call, result=result)
+        return result
+
+    async def _generate_result_async(self, rfd: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of ``_generate_result``."""
+        loop = asyncio.get_running_loop()
+
+        # 1. Try IPFS cache first
+        cached_result = await loop.run_in_executor(None, self._get_cached_result, rfd)
+        if cached_result is not None:
+            return cached_result
+
+        # 2. Generate fresh data if not in cache
+        params = self._parse_rfd(rfd)
+        logger.info(f"Generating fresh {params['data_type']} dataset with {params['num_records']} records")
+
+        if params["data_type"] == "pokemon":
+            records = await self._generate_pokemon_data_async(**self._pokemon_args(params))
+        else:
+            records = await self._generate_resource_data_async(params["data_type"], params["num_records"])
+
+        result = self._build_result(params["data_type"], records)
+
+        # 3. Store result in IPFS cache
+        await loop.run_in_executor(None, self._store_result, rfd, result)
+        return result
+
+    async def _generate_pokemon_data_async(self, num_records: int, pokemon_names: List[str],
+                                           pokemon_ids: List[int], generation: Optional[int],
+                                           type_filter: Optional[str], min_stats: Optional[Dict[str, int]],
+                                           include_stats: bool, include_abilities: bool,
+                                           include_moves: bool,
+                                           schema_plan: Optional[ProjectionPlan] = None) -> List[Dict[str, Any]]:
+        """Async counterpart of ``_generate_pokemon_data``."""
+        generation_endpoint, type_endpoint = self._planning_endpoints(
+            pokemon_names, pokemon_ids, generation, type_filter, min_stats
+        )
+        generation_data, type_data = await asyncio.gather(
+            self._make_request_async(generation_endpoint) if generation_endpoint else _none(),
+            self._make_request_async(type_endpoint) if type_endpoint else _none()
+        )
+        targets = self._plan_pokemon_targets(num_records, pokemon_names, pokemon_ids, generation,
+                                             type_filter, min_stats, generation_data, type_data)
+        flags, build = self._pokemon_builder(include_stats, include_abilities, include_moves)
+        scan = self._filters_after_fetch(type_filter, min_stats, type_data)
+        loop = asyncio.get_running_loop()
+
+        records = []
+        rejected = []
+        position = 0
+        while len(records) < num_records and position < len(targets):
+            batch = targets[position:position + self._batch_size(num_records - len(records), scan)]
+            position += len(batch)
+
+            endpoints = [self._pokemon_endpoint(target) for target in batch]
+            # The record cache commits to SQLite on reads and writes, so it runs off the event loop
+            entries, missing = await loop.run_in_executor(None, self._cached_entries, endpoints, flags)
+            responses = await self._fetch_many_async([endpoints[index] for index in missing])
+            await loop.run_in_executor(None, self._fill_entries, endpoints, entries, missing, responses, flags, build)
+            records.extend(self._select_pokemon_records(entries, type_filter, min_stats, schema_plan, rejected))
+
+        del records[num_records:]
+        self._report_schema_rejections(num_records, len(records), rejected)
+        return records
+
+    async def _generate_resource_data_async(self, data_type: str, num_records: int) -> List[Dict[str, Any]]:
+        """Async counterpart of ``_generate_resource_data``."""
+        resource, targets = self._resource_targets(data_type, num_records)
+        endpoints = [f"{resource}/{target}" for target in targets]
+        loop = asyncio.get_running_loop()
+        entries, missing = await loop.run_in_executor(None, self._cached_entries, endpoints, "")
+        responses = await self._fetch_many_async([endpoints[index] for index in missing])
+        await loop.run_in_executor(None, self._fill_entries, endpoints, entries, missing, responses, "",
+                                   self._resource_builder(resource))
+        return [dict(entry["record"]) for entry in entries if entry is not None]
+
+
+async def _none() -> None:
+    """Placeholder coroutine for lookups that are not needed."""
+    return None
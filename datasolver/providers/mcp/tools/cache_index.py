@@ -0,0 +1,186 @@
+"""Persistent fingerprint→CID index for the IPFS cache backed by SQLite."""
+
+import logging
+import os
+import sqlite3
+import threading
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger('CacheIndex')
+
+DEFAULT_INDEX_PATH = os.path.join("data", "cache", "ipfs_cache_index.db")
+
+
+class CacheIndex:
+    """Durable mapping of RFD fingerprint to ``{'cid', 'timestamp', 'data_type'}``.
+
+    The index behaves like the dict it replaces (``in``, ``[]``, ``del``,
+    ``items()``) so ``IPFSCache`` can keep treating it as plain metadata,
+    but every write is committed to SQLite and survives restarts. WAL mode
+    lets other processes read the index while this one writes.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        """Open (or create) the index.
+
+        Args:
+            path: SQLite database file path (":memory:" for a non-persistent index)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS cache_entries (
+                cache_key TEXT PRIMARY KEY,
+                cid TEXT NOT NULL,
+                timestamp INTEGER NOT NULL,
+                data_type TEXT
+            )"""
+        )
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(cache_entries)")]
+        if "data_type" not in columns:
+            # Indexes created before per-type TTLs; their entries fall back to the default TTL
+            self._conn.execute("ALTER TABLE cache_entries ADD COLUMN data_type TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_entries_timestamp ON cache_entries(timestamp)")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS rfd_usage (
+                cache_key TEXT PRIMARY KEY,
+                rfd TEXT NOT NULL,
+                hits INTEGER NOT NULL,
+                last_seen INTEGER NOT NULL
+            )"""
+        )
+        self._conn.commit()
+        logger.info(f"Opened IPFS cache index at {path} ({len(self)} entries)")
+
+    @classmethod
+    def from_env(cls) -> "CacheIndex":
+        """Open the index named by IPFS_CACHE_INDEX_PATH (or the default path).
+
+        An empty IPFS_CACHE_INDEX_PATH, or a path that cannot be opened,
+        yields an in-memory index that is lost on restart.
+        """
+        path = os.getenv("IPFS_CACHE_INDEX_PATH", DEFAULT_INDEX_PATH)
+        if path:
+            try:
+                return cls(path)
+            except Exception as e:
+                logger.warning(f"Could not open IPFS cache index {path}, using memory: {e}")
+        return cls(":memory:")
+
+    def __contains__(self, cache_key: str) -> bool:
+        return self.get(cache_key) is not None
+
+    def __getitem__(self, cache_key: str) -> Dict[str, Any]:
+        entry = self.get(cache_key)
+        if entry is None:
+            raise KeyError(cache_key)
+        return entry
+
+    def __setitem__(self, cache_key: str, entry: Dict[str, Any]) -> None:
+        self.put(cache_key, entry['cid'], entry['timestamp'], entry.get('data_type'))
+
+    def __delitem__(self, cache_key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE cache_key = ?", (cache_key,))
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Look up the CID, store time and data type for a fingerprint."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cid, timestamp, data_type FROM cache_entries WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+        return {'cid': row[0], 'timestamp': row[1], 'data_type': row[2]} if row else None
+
+    def put(self, cache_key: str, cid: str, timestamp: int, data_type: Optional[str] = None) -> None:
+        """Record (or replace) the CID for a fingerprint."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (cache_key, cid, timestamp, data_type) VALUES (?, ?, ?, ?)",
+                (cache_key, cid, timestamp, data_type)
+            )
+            self._conn.commit()
+
+    def put_many(self, entries: List[Tuple[str, str, int, Optional[str]]]) -> int:
+        """Record several ``(cache_key, cid, timestamp, data_type)`` entries, keeping the newest per key.
+
+        Returns:
+            Number of entries inserted or updated
+        """
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT INTO cache_entries (cache_key, cid, timestamp, data_type) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(cache_key) DO UPDATE SET cid = excluded.cid, timestamp = excluded.timestamp, "
+                "data_type = excluded.data_type "
+                "WHERE excluded.timestamp > cache_entries.timestamp",
+                entries
+            )
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Iterate over ``(cache_key, {'cid', 'timestamp', 'data_type'})`` pairs."""
+        with self._lock:
+            rows = self._conn.execute("SELECT cache_key, cid, timestamp, data_type FROM cache_entries").fetchall()
+        return iter([
+            (key, {'cid': cid, 'timestamp': timestamp, 'data_type': data_type})
+            for key, cid, timestamp, data_type in rows
+        ])
+
+    def values(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over ``{'cid', 'timestamp', 'data_type'}`` entries."""
+        return (entry for _, entry in self.items())
+
+    def record_usage_many(self, usage: List[Tuple[str, str, int, int]]) -> None:
+        """Add ``(cache_key, rfd, hits, last_seen)`` request counts in one transaction."""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO rfd_usage (cache_key, rfd, hits, last_seen) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(cache_key) DO UPDATE SET rfd = excluded.rfd, hits = hits + excluded.hits, "
+                "last_seen = MAX(last_seen, excluded.last_seen)",
+                usage
+            )
+            self._conn.commit()
+
+    def top_usage(self, limit: int, since: int = 0) -> List[Tuple[str, str, int]]:
+        """Return the most requested ``(cache_key, rfd, hits)`` seen since ``since``."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT cache_key, rfd, hits FROM rfd_usage WHERE last_seen >= ? "
+                "ORDER BY hits DESC, last_seen DESC LIMIT ?",
+                (since, limit)
+            ).fetchall()
+
+    def purge_older_than(self, cutoff: int) -> int:
+        """Delete entries stored (and usage last seen) before ``cutoff`` and compact the database file.
+
+        Returns:
+            Number of entries deleted
+        """
+        with self._lock:
+            count = self._conn.execute("DELETE FROM cache_entries WHERE timestamp < ?", (cutoff,)).rowcount
+            self._conn.execute("DELETE FROM rfd_usage WHERE last_seen < ?", (cutoff,))
+            self._conn.commit()
+            if count:
+                # Reclaim the freed pages and fold the WAL back into the main file
+                self._conn.execute("VACUUM")
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return count
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
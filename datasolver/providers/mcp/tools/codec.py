@@ -0,0 +1,122 @@
+"""Pluggable JSON codec: orjson, then msgspec, then the standard library.
+
+Every backend writes compact UTF-8 (non-ASCII kept as is) that decodes
+to the same data, but the bytes are not identical: orjson and msgspec
+format floats differently (``1e16`` rather than ``1e+16``) and write NaN
+and infinities as ``null``. Integers wider than 64 bits are handed to the
+standard library. Anything hashed for content addressing must therefore
+use ``pinning.canonical_json``, which always uses the standard library.
+JSON_CODEC forces a backend (``orjson``, ``msgspec`` or ``json``); the
+default picks the fastest one available.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Union
+
+logger = logging.getLogger('JSONCodec')
+
+BACKENDS = ("orjson", "msgspec", "json")
+
+
+def _stdlib_dumpb(obj: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+    if indent:
+        return json.dumps(obj, indent=2, sort_keys=sort_keys, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), sort_keys=sort_keys, ensure_ascii=False).encode('utf-8')
+
+
+def _stdlib_loads(data: Union[str, bytes]) -> Any:
+    return json.loads(data)
+
+
+def _orjson_codec():
+    import orjson
+
+    def dumpb(obj: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+        # Non-string keys are stringified like the standard library does
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option)
+
+    return dumpb, orjson.loads
+
+
+def _msgspec_codec():
+    import msgspec
+
+    encoder = msgspec.json.Encoder()
+    sorted_encoder = msgspec.json.Encoder(order="sorted")
+    decoder = msgspec.json.Decoder()
+
+    def dumpb(obj: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+        body = (sorted_encoder if sort_keys else encoder).encode(obj)
+        return msgspec.json.format(body, indent=2) if indent else body
+
+    return dumpb, decoder.decode
+
+
+def _select_backend():
+    """Return ``(name, dumpb, loads)`` for JSON_CODEC or the fastest installed backend."""
+    requested = os.getenv("JSON_CODEC", "auto").lower()
+    if requested not in BACKENDS:
+        if requested != "auto":
+            logger.warning(f"Unknown JSON_CODEC {requested}, picking the fastest available codec")
+        candidates = BACKENDS
+    else:
+        candidates = (requested,)
+
+    for name in candidates:
+        if name == "json":
+            break
+        try:
+            dumpb, loads = _orjson_codec() if name == "orjson" else _msgspec_codec()
+            return name, dumpb, loads
+        except (ImportError, AttributeError, TypeError):
+            # Not installed, or a version without the features used here
+            if requested == name:
+                logger.warning(f"JSON codec {name} not available, using the standard library")
+    return "json", _stdlib_dumpb, _stdlib_loads
+
+
+BACKEND, _dumpb, _loads = _select_backend()
+
+
+def dumpb(obj: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """Serialize ``obj`` to UTF-8 JSON bytes.
+
+    Args:
+        obj: Value to serialize
+        indent: Indent by two spaces instead of writing compactly
+        sort_keys: Sort object keys
+    """
+    try:
+        return _dumpb(obj, indent=indent, sort_keys=sort_keys)
+    except (TypeError, OverflowError):
+        if BACKEND == "json":
+            raise
+        # orjson and msgspec stop at 64-bit integers; the standard library does not
+        return _stdlib_dumpb(obj, indent=indent, sort_keys=sort_keys)
+
+
+def dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> str:
+    """Serialize ``obj`` to a JSON string (see ``dumpb``)."""
+    return dumpb(obj, indent=indent, sort_keys=sort_keys).decode('utf-8')
+
+
+def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+    """Deserialize JSON from a string or UTF-8 bytes.
+
+    Raises:
+        ValueError: If the input is not valid JSON
+    """
+    try:
+        return _loads(data)
+    except ValueError:
+        raise
+    except Exception as e:
+        # msgspec raises its own DecodeError; callers only need to catch ValueError
+        raise ValueError(str(e)) from e
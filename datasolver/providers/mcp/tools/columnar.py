@@ -0,0 +1,228 @@
+"""Memory-mapped columnar Pokédex store for stats and type queries.
+
+The store is a single binary file of fixed-width int32 columns (one value
+per Pokémon) followed by the newline-separated names. It is opened with
+``mmap`` so columns are read straight from the page cache; filters run as
+column scans (vectorized with numpy when it is installed) and return only
+the matching Pokémon IDs.
+
+File layout (little-endian)::
+
+    magic "EDXC" | version u32 | rows u32 | names_length u32
+    one int32 column per entry in COLUMNS, ``rows`` values each
+    UTF-8 names joined by "\\n"
+"""
+
+import logging
+import mmap
+import os
+import struct
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger('ColumnarPokedex')
+
+DEFAULT_COLUMNS_PATH = os.path.join("data", "pokedex_columns.bin")
+
+MAGIC = b"EDXC"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sIII")
+
+STAT_NAMES = ["hp", "attack", "defense", "special-attack", "special-defense", "speed"]
+
+TYPE_NAMES = ['normal', 'fire', 'water', 'electric', 'grass', 'ice', 'fighting',
+              'poison', 'ground', 'flying', 'psychic', 'bug', 'rock', 'ghost',
+              'dragon', 'dark', 'steel', 'fairy']
+TYPE_BITS = {type_name: 1 << bit for bit, type_name in enumerate(TYPE_NAMES)}
+
+# Column order in the file; missing values are stored as -1
+COLUMNS = ["id", "generation", "height", "weight", "base_experience"] + STAT_NAMES + ["type_mask"]
+
+
+def type_mask(types: List[str]) -> int:
+    """Encode a list of type names as a bitmask."""
+    mask = 0
+    for type_name in types:
+        mask |= TYPE_BITS.get(type_name, 0)
+    return mask
+
+
+def write_columns(path: str, pokemon: List[Dict[str, Any]], generations: Dict[int, int]) -> int:
+    """Write projected Pokémon records to a columnar store file.
+
+    Args:
+        path: Destination file
+        pokemon: Projected Pokémon records (see ``projection.project_pokemon``)
+        generations: Generation number per Pokémon ID
+
+    Returns:
+        Number of rows written
+    """
+    rows = sorted(pokemon, key=lambda record: record["id"])
+
+    def value(record: Dict[str, Any], column: str) -> int:
+        if column == "generation":
+            return generations.get(record["id"], -1)
+        if column == "type_mask":
+            return type_mask(record.get("types", []))
+        if column in STAT_NAMES:
+            return record.get("stats", {}).get(column, -1)
+        result = record.get(column)
+        return -1 if result is None else result
+
+    names = "\n".join(record["name"] for record in rows).encode("utf-8")
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(rows), len(names)))
+        for column in COLUMNS:
+            f.write(struct.pack(f"<{len(rows)}i", *(value(record, column) for record in rows)))
+        f.write(names)
+    os.replace(tmp_path, path)
+
+    logger.info(f"Wrote {len(rows)} rows to columnar store {path}")
+    return len(rows)
+
+
+class ColumnarPokedex:
+    """Read-only, memory-mapped view over a columnar store file."""
+
+    def __init__(self, path: str):
+        """Map the store file into memory.
+
+        Raises:
+            ValueError: If the file is not a columnar store of a supported version
+        """
+        self.path = path
+        self._columns = {}
+        self._arrays = None
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, rows, names_length = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} columnar Pokédex store")
+
+        self.rows = rows
+        self._view = memoryview(self._mmap)
+        offset = HEADER.size
+        for column in COLUMNS:
+            # Zero-copy int32 view over the mapped column
+            self._columns[column] = self._view[offset:offset + rows * 4].cast("i")
+            offset += rows * 4
+        self.names = bytes(self._view[offset:offset + names_length]).decode("utf-8").split("\n") if rows else []
+
+        try:
+            import numpy
+            self._np = numpy
+            self._arrays = {
+                column: numpy.frombuffer(self._mmap, dtype="<i4", count=rows, offset=HEADER.size + index * rows * 4)
+                for index, column in enumerate(COLUMNS)
+            }
+        except ImportError:
+            self._np = None
+            self._arrays = None
+
+        logger.info(f"Mapped columnar Pokédex store {path} ({rows} rows)")
+
+    @classmethod
+    def from_env(cls) -> Optional["ColumnarPokedex"]:
+        """Open the store named by POKEDEX_COLUMNS_PATH (or the default path) if present."""
+        path = os.getenv("POKEDEX_COLUMNS_PATH", DEFAULT_COLUMNS_PATH)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            return cls(path)
+        except Exception as e:
+            logger.warning(f"Could not open columnar Pokédex store {path}: {e}")
+            return None
+
+    def column(self, name: str) -> memoryview:
+        """Return the int32 view of a column."""
+        return self._columns[name]
+
+    def query(self, generation: Optional[int] = None, type_filter: Optional[str] = None,
+              min_stats: Optional[Dict[str, int]] = None, limit: Optional[int] = None) -> List[int]:
+        """Return the IDs of Pokémon matching every given filter, in ID order.
+
+        Args:
+            generation: Only Pokémon introduced in this generation
+            type_filter: Only Pokémon having this type
+            min_stats: Minimum base value per stat name (e.g. {"speed": 100})
+            limit: Maximum number of IDs to return
+
+        Raises:
+            ValueError: If a stat name in ``min_stats`` is unknown
+        """
+        conditions = []
+        if generation is not None:
+            conditions.append(("generation", "eq", int(generation)))
+        if type_filter:
+            bit = TYPE_BITS.get(type_filter.lower())
+            if bit is None:
+                return []
+            conditions.append(("type_mask", "and", bit))
+        for stat, minimum in (min_stats or {}).items():
+            if stat not in STAT_NAMES:
+                raise ValueError(f"Unknown stat: {stat}")
+            conditions.append((stat, "ge", int(minimum)))
+
+        if self._arrays is not None:
+            ids = self._query_numpy(conditions)
+        else:
+            ids = self._query_scan(conditions)
+        return ids[:limit] if limit is not None else ids
+
+    def _query_numpy(self, conditions) -> List[int]:
+        """Evaluate conditions as vectorized numpy masks."""
+        mask = self._np.ones(self.rows, dtype=bool)
+        for column, op, operand in conditions:
+            values = self._arrays[column]
+            if op == "eq":
+                mask &= values == operand
+            elif op == "and":
+                mask &= (values & operand) != 0
+            else:
+                mask &= values >= operand
+        return self._arrays["id"][mask].tolist()
+
+    def _query_scan(self, conditions) -> List[int]:
+        """Evaluate conditions by narrowing a candidate row list column by column."""
+        candidates = range(self.rows)
+        for column, op, operand in conditions:
+            values = self._columns[column]
+            if op == "eq":
+                candidates = [row for row in candidates if values[row] == operand]
+            elif op == "and":
+                candidates = [row for row in candidates if values[row] & operand]
+            else:
+                candidates = [row for row in candidates if values[row] >= operand]
+        ids = self._columns["id"]
+        return [ids[row] for row in candidates]
+
+    def close(self) -> None:
+        """Release the memory map and file handle."""
+        for view in self._columns.values():
+            view.release()
+        self._columns = {}
+        self._arrays = None
+        if hasattr(self, "_view"):
+            self._view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # numpy views still reference the map; it is released when they are collected
+            pass
+        self._file.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store statistics."""
+        return {
+            'path': self.path,
+            'rows': self.rows,
+            'vectorized': self._arrays is not None
+        }
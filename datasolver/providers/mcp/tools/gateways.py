@@ -0,0 +1,216 @@
+"""IPFS gateway pool that races fetches across gateways."""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from . import codec
+from .http_client import get_http_client
+
+logger = logging.getLogger('GatewayPool')
+
+# Bytes read per chunk, so a race that is decided is noticed mid-download
+CHUNK_SIZE = 64 * 1024
+
+DEFAULT_GATEWAYS = [
+    "https://gateway.pinata.cloud/ipfs/",
+    "https://ipfs.io/ipfs/",
+    "https://dweb.link/ipfs/"
+]
+
+
+class GatewayStats:
+    """Latency and health bookkeeping for one gateway."""
+
+    def __init__(self, url: str):
+        """Start with no latency samples and a closed circuit."""
+        self.url = url
+        self.ewma_latency: Optional[float] = None
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the stats as a plain dict."""
+        return {
+            'ewma_latency_ms': round(self.ewma_latency * 1000, 1) if self.ewma_latency is not None else None,
+            'successes': self.successes,
+            'failures': self.failures,
+            'circuit_open': self.open_until > time.monotonic()
+        }
+
+
+class GatewayPool:
+    """Fetch IPFS content by racing the healthiest, fastest gateways.
+
+    Gateways are ranked by an exponentially weighted moving average of
+    their response latency (gateways without samples rank first so they
+    get measured). Each fetch fires at the top ``race_width`` gateways in
+    parallel and returns the first valid response. Stragglers that have
+    not started are cancelled; the others give up as soon as their response
+    starts arriving, closing its connection, and record the time spent as a
+    latency sample. A gateway that fails ``failure_threshold`` times in a
+    row is skipped for ``cooldown_seconds``.
+    """
+
+    def __init__(self, gateways: Optional[List[str]] = None, race_width: int = 3,
+                 timeout: float = 10, alpha: float = 0.3, failure_threshold: int = 3,
+                 cooldown_seconds: float = 60, max_workers: int = 16):
+        """Initialize the pool.
+
+        Args:
+            gateways: Gateway URL prefixes, each followed directly by the CID
+            race_width: Number of gateways raced per fetch
+            timeout: Per-request timeout in seconds
+            alpha: EWMA smoothing factor for latency samples
+            failure_threshold: Consecutive failures that open a gateway's circuit
+            cooldown_seconds: How long an open circuit keeps a gateway out
+            max_workers: Threads shared by all concurrent fetches; a straggler
+                waiting on a slow gateway holds one until its response starts
+                or ``timeout`` passes
+        """
+        self.gateways = {url: GatewayStats(url) for url in (gateways or DEFAULT_GATEWAYS)}
+        self.race_width = max(1, race_width)
+        self.timeout = timeout
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(self.race_width, max_workers), thread_name_prefix="ipfs-gateway"
+        )
+
+    @classmethod
+    def from_env(cls) -> "GatewayPool":
+        """Create a pool from IPFS_GATEWAYS and IPFS_GATEWAY_* environment variables."""
+        gateways = [url.strip() for url in os.getenv("IPFS_GATEWAYS", "").split(",") if url.strip()]
+        return cls(
+            gateways=gateways or None,
+            race_width=int(os.getenv("IPFS_GATEWAY_RACE_WIDTH", 3)),
+            timeout=float(os.getenv("IPFS_GATEWAY_TIMEOUT", 10)),
+            failure_threshold=int(os.getenv("IPFS_GATEWAY_FAILURE_THRESHOLD", 3)),
+            cooldown_seconds=float(os.getenv("IPFS_GATEWAY_COOLDOWN", 60)),
+            max_workers=int(os.getenv("IPFS_GATEWAY_WORKERS", 16))
+        )
+
+    def ranked(self) -> List[str]:
+        """Return gateways with a closed circuit, fastest first."""
+        now = time.monotonic()
+        with self._lock:
+            available = [stats for stats in self.gateways.values() if stats.open_until <= now]
+            if not available:
+                # Every circuit is open: fall back to the gateway that reopens soonest
+                available = [min(self.gateways.values(), key=lambda stats: stats.open_until)]
+        available.sort(key=lambda stats: -1.0 if stats.ewma_latency is None else stats.ewma_latency)
+        return [stats.url for stats in available]
+
+    def _record(self, url: str, latency: Optional[float]) -> None:
+        """Record a success (with its latency) or, if ``latency`` is None, a failure."""
+        with self._lock:
+            stats = self.gateways[url]
+            if latency is None:
+                stats.failures += 1
+                stats.consecutive_failures += 1
+                if stats.consecutive_failures >= self.failure_threshold:
+                    stats.open_until = time.monotonic() + self.cooldown_seconds
+                    logger.warning(f"Gateway {url} failed {stats.consecutive_failures} times, cooling down")
+                return
+            stats.successes += 1
+            stats.consecutive_failures = 0
+            stats.open_until = 0.0
+            if stats.ewma_latency is None:
+                stats.ewma_latency = latency
+            else:
+                stats.ewma_latency = self.alpha * latency + (1 - self.alpha) * stats.ewma_latency
+
+    def _fetch_one(self, url: str, cid: str, decided: threading.Event) -> Optional[Dict[str, Any]]:
+        """Fetch ``cid`` from one gateway, recording the outcome.
+
+        Gives up, closing the connection, once ``decided`` is set by another
+        gateway winning the race.
+        """
+        started = time.monotonic()
+        try:
+            status, body = self._get(f"{url}{cid}", decided)
+            if body is None:
+                # Lost the race: at least this slow, but not a failure
+                self._record(url, time.monotonic() - started)
+                return None
+            if status == 200:
+                data = codec.loads(body)
+                self._record(url, time.monotonic() - started)
+                return data
+            logger.debug(f"Gateway {url} returned {status} for {cid}")
+        except Exception as e:
+            logger.debug(f"Failed to fetch from {url}: {e}")
+        self._record(url, None)
+        return None
+
+    def _get(self, url: str, decided: threading.Event) -> Tuple[int, Optional[bytes]]:
+        """Stream a GET, returning ``(status, body)``; the body is None if ``decided`` was set first."""
+        client = get_http_client()
+        if callable(getattr(client, "stream", None)):
+            # httpx streams through a context manager
+            with client.stream("GET", url, timeout=self.timeout) as response:
+                return response.status_code, _read_unless(response.iter_bytes(), decided)
+        response = client.get(url, timeout=self.timeout, stream=True)
+        try:
+            return response.status_code, _read_unless(response.iter_content(CHUNK_SIZE), decided)
+        finally:
+            response.close()
+
+    def fetch(self, cid: str) -> Optional[Dict[str, Any]]:
+        """Fetch JSON content for ``cid`` from whichever raced gateway answers first.
+
+        The ``race_width`` fastest gateways are raced; each one that fails is
+        replaced by the next gateway in ranked order, so every available
+        gateway is tried before giving up.
+
+        Returns:
+            The decoded document, or None if every gateway failed
+        """
+        candidates = self.ranked()
+        decided = threading.Event()
+        pending = {
+            self._executor.submit(self._fetch_one, url, cid, decided): url
+            for url in candidates[:self.race_width]
+        }
+        fallbacks = iter(candidates[self.race_width:])
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = pending.pop(future)
+                    data = future.result()
+                    if data is not None:
+                        logger.debug(f"Retrieved {cid} from {url}")
+                        return data
+                    fallback = next(fallbacks, None)
+                    if fallback is not None:
+                        logger.debug(f"Gateway {url} failed for {cid}, trying {fallback}")
+                        pending[self._executor.submit(self._fetch_one, fallback, cid, decided)] = fallback
+            return None
+        finally:
+            # Stragglers close their connections instead of downloading a response nobody reads
+            decided.set()
+            for future in pending:
+                future.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-gateway latency and circuit state."""
+        with self._lock:
+            return {url: stats.to_dict() for url, stats in self.gateways.items()}
+
+
+def _read_unless(chunks: Iterator[bytes], decided: threading.Event) -> Optional[bytes]:
+    """Join response chunks, or return None as soon as ``decided`` is set."""
+    body = []
+    for chunk in chunks:
+        if decided.is_set():
+            return None
+        body.append(chunk)
+    return None if decided.is_set() else b"".join(body)
@@ -0,0 +1,130 @@
+"""Shared, pooled HTTP client for PokéAPI, Pinata and IPFS gateway calls.
+
+Every outbound call goes through one process-wide client, so keep-alive
+connections to each host are reused across requests instead of paying a
+new TCP and TLS handshake per call. The client is a ``requests.Session``
+with a sized connection pool per host. When HTTP_HTTP2 is enabled and
+``httpx`` (with ``h2``) is installed, it is an ``httpx.Client`` that
+multiplexes requests over HTTP/2 instead; both expose the same
+``get``/``post`` interface used by callers. The httpx client is set up to
+behave like the session: it follows redirects and has no client-wide
+timeout, so the timeout each caller passes is the one that applies.
+
+Configuration (environment):
+    HTTP_POOL_CONNECTIONS: Number of hosts to keep pools for (default 10)
+    HTTP_POOL_MAXSIZE: Connections kept alive per host (default 16)
+    HTTP_KEEPALIVE_EXPIRY: Idle seconds before a connection is closed (httpx only, default 30)
+    HTTP_HTTP2: Enable HTTP/2 when httpx and h2 are installed (default false)
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Optional
+
+logger = logging.getLogger('HTTPClient')
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def pool_maxsize() -> int:
+    """Return the configured number of pooled connections per host."""
+    return max(1, int(os.getenv("HTTP_POOL_MAXSIZE", 16)))
+
+
+def keepalive_expiry() -> float:
+    """Return the configured idle keep-alive expiry in seconds."""
+    return float(os.getenv("HTTP_KEEPALIVE_EXPIRY", 30))
+
+
+def http2_enabled() -> bool:
+    """Return True if HTTP/2 is requested and httpx with h2 is available."""
+    if os.getenv("HTTP_HTTP2", "false").lower() != "true":
+        return False
+    try:
+        import httpx  # noqa: F401
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        logger.warning("HTTP_HTTP2 is enabled but httpx/h2 are not installed, using HTTP/1.1")
+        return False
+
+
+def _mount_adapters(session, maxsize: int) -> None:
+    """Mount pooled adapters sized for ``maxsize`` connections per host."""
+    import requests
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=max(1, int(os.getenv("HTTP_POOL_CONNECTIONS", 10))),
+        pool_maxsize=maxsize
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.pool_maxsize = maxsize
+
+
+def create_http_client(maxsize: Optional[int] = None) -> Any:
+    """Create a new pooled HTTP client.
+
+    Args:
+        maxsize: Connections kept alive per host (defaults to HTTP_POOL_MAXSIZE)
+
+    Returns:
+        An ``httpx.Client`` when HTTP/2 is enabled, otherwise a ``requests.Session``
+
+    Raises:
+        ImportError: If requests is not installed (and HTTP/2 is not enabled)
+    """
+    maxsize = maxsize or pool_maxsize()
+
+    if http2_enabled():
+        import httpx
+        client = httpx.Client(
+            http2=True,
+            # Match requests: follow redirects, and no default timeout (callers pass their own)
+            follow_redirects=True,
+            timeout=None,
+            limits=httpx.Limits(
+                max_connections=None,
+                max_keepalive_connections=maxsize,
+                keepalive_expiry=keepalive_expiry()
+            )
+        )
+        logger.info("Created HTTP/2 client")
+        return client
+
+    import requests
+    session = requests.Session()
+    _mount_adapters(session, maxsize)
+    logger.info(f"Created pooled HTTP client ({maxsize} connections per host)")
+    return session
+
+
+def get_http_client(min_pool_size: Optional[int] = None) -> Any:
+    """Return the process-wide pooled HTTP client, creating it on first use.
+
+    Args:
+        min_pool_size: Connections per host the caller may use concurrently;
+            the pool is grown to at least this size
+
+    Returns:
+        The shared ``requests.Session`` or ``httpx.Client``
+    """
+    global _client
+    with _client_lock:
+        wanted = max(pool_maxsize(), min_pool_size or 0)
+        if _client is None:
+            _client = create_http_client(wanted)
+        elif getattr(_client, "pool_maxsize", wanted) < wanted:
+            # Grow the requests pool so concurrent workers don't discard connections
+            _mount_adapters(_client, wanted)
+        return _client
+
+
+def close_http_client() -> None:
+    """Close the shared client and its pooled connections."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
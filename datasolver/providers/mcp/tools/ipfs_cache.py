@@ -1,22 +1,49 @@
 """IPFS-backed cache layer for Pokémon data using Pinata."""
 
+import atexit
 import json
 import hashlib
+import threading
 import time
 import logging
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, Callable, List, Optional, Set
 import os
+from . import codec
+from .http_client import get_http_client
+from .cache_index import CacheIndex
+from .memory_cache import LRUCache
+from .response_store import ResponseStore
+from .write_behind import WriteBehindQueue
+from .gateways import GatewayPool
+from .pinning import pin_bytes, pinata_headers, get_content_index, canonical_dataset
+from .schema_plan import compile_schema
 
 logger = logging.getLogger('IPFSCache')
 
+
+def rfd_data_type(rfd: Dict[str, Any]) -> str:
+    """Return an RFD's data type, honouring the ``type``/``pokemon_data_type`` aliases."""
+    return rfd.get("data_type") or rfd.get("type") or rfd.get("pokemon_data_type") or "pokemon"
+
+
 class IPFSCache:
     """IPFS-backed cache using Pinata for Pokémon data."""
     
-    def __init__(self, ttl_minutes: int = 60):
+    def __init__(self, ttl_minutes: int = 60, ttl_by_type: Optional[Dict[str, float]] = None,
+                 max_stale_minutes: Optional[float] = None, rebuild_on_start: Optional[bool] = None):
         """Initialize IPFS cache with Pinata.
         
         Args:
             ttl_minutes: Time-to-live for cache entries in minutes
+            ttl_by_type: Per-``data_type`` TTLs in minutes overriding ``ttl_minutes``
+                (defaults to IPFS_CACHE_TTL_BY_TYPE, e.g. ``pokemon=1440,types=10080``)
+            max_stale_minutes: How long past its TTL an entry may still be served
+                while it is refreshed in the background
+                (defaults to IPFS_CACHE_MAX_STALE_MINUTES or 1440)
+            rebuild_on_start: Rebuild an empty index from Pinata's pin list in
+                the background (defaults to IPFS_CACHE_REBUILD_ON_START or false)
         """
         # Load environment variables if not already loaded
         try:
@@ -26,14 +53,134 @@ class IPFSCache:
             pass  # dotenv not installed, environment should be set manually
         
         self.ttl_seconds = ttl_minutes * 60
-        self.cache_metadata = {}  # In-memory metadata: fingerprint -> {cid, timestamp}
+        if ttl_by_type is None:
+            ttl_by_type = self._parse_ttl_by_type(os.getenv("IPFS_CACHE_TTL_BY_TYPE", ""))
+        self.ttl_by_type = {data_type: int(minutes * 60) for data_type, minutes in ttl_by_type.items()}
+        if max_stale_minutes is None:
+            max_stale_minutes = float(os.getenv("IPFS_CACHE_MAX_STALE_MINUTES", 1440))
+        self.max_stale_seconds = int(max_stale_minutes * 60)
+        self.cache_metadata = CacheIndex.from_env()  # Persistent metadata: fingerprint -> {cid, timestamp}
         self.pinata_available = self._check_pinata_config()
         
+        # L1 tiers in front of the IPFS gateways, keyed by CID (reached via the fingerprint index)
+        self.memory_tier = LRUCache(max_bytes=int(float(os.getenv("IPFS_CACHE_MEMORY_MB", 32)) * 1024 * 1024))
+        self.disk_tier = self._open_disk_tier()
+        self.gateways = GatewayPool.from_env()
+        self.tier_hits = {'memory': 0, 'disk': 0, 'ipfs': 0}
+        self.tier_misses = 0
+        
+        # Stale-while-revalidate: the owner registers a callback that regenerates an RFD
+        self.revalidator: Optional[Callable[[Dict[str, Any]], None]] = None
+        self._revalidating: Set[str] = set()
+        self._revalidate_lock = threading.Lock()
+        self._revalidate_executor = ThreadPoolExecutor(
+            max_workers=max(1, int(os.getenv("IPFS_CACHE_REVALIDATE_WORKERS", 1))),
+            thread_name_prefix="ipfs-cache-revalidate"
+        )
+        self.stale_hits = 0
+        self.revalidations = 0
+        
+        # Request counts for warm-up, buffered and written in batches off the request path
+        self._usage: Dict[str, List[Any]] = {}  # cache_key -> [rfd JSON, hits, last_seen]
+        self._usage_lock = threading.Lock()
+        self._usage_flush_scheduled = False
+        self._usage_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ipfs-cache-usage")
+        
+        # Pin results in the background so callers don't wait on Pinata
+        self.write_queue = None
+        if self.pinata_available and os.getenv("IPFS_CACHE_WRITE_BEHIND", "true").lower() == "true":
+            self.write_queue = WriteBehindQueue(
+                self._store_now,
+                max_size=int(os.getenv("IPFS_CACHE_WRITE_QUEUE_SIZE", 1000)),
+                batch_size=int(os.getenv("IPFS_CACHE_WRITE_BATCH_SIZE", 10)),
+                workers=int(os.getenv("IPFS_CACHE_WRITE_WORKERS", 2)),
+                max_retries=int(os.getenv("IPFS_CACHE_WRITE_RETRIES", 3)),
+                name="ipfs-cache-writer"
+            )
+            # Flush queued pins before the interpreter exits
+            atexit.register(self.flush, float(os.getenv("IPFS_CACHE_FLUSH_TIMEOUT", 30)))
+        
         if self.pinata_available:
             logger.info(f"IPFS cache initialized with {ttl_minutes}min TTL using Pinata")
+            atexit.register(self.flush_usage)
+            if rebuild_on_start is None:
+                rebuild_on_start = os.getenv("IPFS_CACHE_REBUILD_ON_START", "false").lower() == "true"
+            if rebuild_on_start and len(self.cache_metadata) == 0:
+                # A fresh node recovers the CIDs it pinned before from Pinata, off the startup path
+                threading.Thread(target=self.rebuild_index, name="ipfs-cache-rebuild", daemon=True).start()
         else:
             logger.warning("Pinata not configured, cache will be disabled")
     
+    def _parse_ttl_by_type(self, spec: str) -> Dict[str, float]:
+        """Parse a ``data_type=minutes`` list such as ``pokemon=1440,types=10080``."""
+        ttls = {}
+        for item in spec.split(","):
+            data_type, _, minutes = item.partition("=")
+            if not data_type.strip():
+                continue
+            try:
+                ttls[data_type.strip()] = float(minutes)
+            except ValueError:
+                logger.warning(f"Ignoring invalid IPFS cache TTL: {item.strip()}")
+        return ttls
+    
+    def ttl_for(self, data_type: Optional[str]) -> int:
+        """Return the freshness window in seconds for a data type (None for the default)."""
+        return self.ttl_by_type.get(data_type, self.ttl_seconds)
+    
+    def _retention_seconds(self) -> int:
+        """Return the age after which no index entry can be served, fresh or stale."""
+        longest = max([self.ttl_seconds, *self.ttl_by_type.values()])
+        return longest + self.max_stale_seconds if self.revalidator else longest
+    
+    def _open_disk_tier(self) -> Optional[ResponseStore]:
+        """Open the on-disk payload spill named by IPFS_CACHE_DISK_PATH (empty disables it)."""
+        path = os.getenv("IPFS_CACHE_DISK_PATH", os.path.join("data", "cache", "ipfs_payloads.db"))
+        if not path:
+            return None
+        try:
+            # CIDs are content addresses, so spilled payloads never need revalidation
+            return ResponseStore(
+                path,
+                max_bytes=int(float(os.getenv("IPFS_CACHE_DISK_MAX_MB", 256)) * 1024 * 1024),
+                max_age_seconds=0
+            )
+        except Exception as e:
+            logger.warning(f"IPFS cache disk tier disabled, could not open {path}: {e}")
+            return None
+    
+    def _get_local(self, cid: str) -> Optional[Dict[str, Any]]:
+        """Look up a payload in the memory tier, then the disk tier."""
+        data = self.memory_tier.get(cid)
+        if data is not None:
+            self.tier_hits['memory'] += 1
+            return dict(data)
+        
+        if self.disk_tier:
+            stored = self.disk_tier.get(cid)
+            if stored is not None:
+                try:
+                    data = codec.loads(stored.body)
+                except ValueError:
+                    logger.warning(f"Discarding corrupt spilled payload for CID: {cid}")
+                    return None
+                self.memory_tier.set(cid, data, size=len(stored.body))
+                self.tier_hits['disk'] += 1
+                return dict(data)
+        
+        return None
+    
+    def _put_local(self, cid: str, data: Dict[str, Any]) -> None:
+        """Keep a payload in the memory tier and spill it to the disk tier."""
+        data = dict(data)
+        body = codec.dumpb(data)
+        self.memory_tier.set(cid, data, size=len(body))
+        if self.disk_tier:
+            try:
+                self.disk_tier.put(cid, body)
+            except Exception as e:
+                logger.warning(f"Failed to spill payload {cid} to disk: {e}")
+    
     def _check_pinata_config(self) -> bool:
         """Check if Pinata is properly configured."""
         api_key = os.getenv("PINATA_API_KEY")
@@ -44,10 +191,11 @@ class IPFSCache:
         """Create a deterministic fingerprint for an RFD."""
         # Create a stable representation by sorting keys
         cache_relevant_fields = {
-            'data_type': rfd.get('data_type', 'pokemon'),
+            'data_type': rfd_data_type(rfd),
             'num_records': rfd.get('num_records', 10),
             'generation': rfd.get('generation'),
             'type_filter': rfd.get('type_filter'),
+            'min_stats': rfd.get('min_stats') or None,
             'pokemon_names': sorted(rfd.get('pokemon_names', [])),
             'pokemon_ids': sorted(rfd.get('pokemon_ids', [])),
             'include_stats': rfd.get('include_stats', True),
@@ -55,6 +203,12 @@ class IPFSCache:
             'include_moves': rfd.get('include_moves', False)
         }
         
+        # The schema shapes Pokémon records, so RFDs with different schemas get different results
+        if cache_relevant_fields['data_type'] == 'pokemon':
+            schema_plan = compile_schema(rfd.get('schema'))
+            if schema_plan:
+                cache_relevant_fields['schema'] = schema_plan.signature()
+        
         # Remove None values for consistent hashing
         cleaned = {k: v for k, v in cache_relevant_fields.items() if v is not None}
         
@@ -63,86 +217,52 @@ class IPFSCache:
         return hashlib.sha256(stable_json.encode()).hexdigest()[:16]  # First 16 chars
     
     def _upload_to_pinata(self, data: Dict[str, Any], cache_key: str) -> Optional[str]:
-        """Upload data to Pinata and return CID."""
+        """Pin data to IPFS and return CID.
+        
+        The result is pinned as the same canonical bytes ``DatasetWriter``
+        writes for a compact JSON solution file (``canonical_dataset``), so
+        identical results always produce identical CIDs and the uploaded
+        solution file reuses this pin. Volatile metadata (fingerprint, store
+        time) lives in the Pinata keyvalues and the local index instead. A
+        result pinned before (for another fingerprint, or as a solution
+        file) reuses the existing CID without an upload; this fingerprint is
+        added to the pin's ``cache_key`` list so ``rebuild_index`` restores
+        every fingerprint sharing it.
+        """
         if not self.pinata_available:
             return None
             
         try:
-            import requests
-            
-            # Prepare the payload
-            cache_payload = {
-                'timestamp': int(time.time()),
-                'cache_key': cache_key,
-                'data': data
+            keyvalues = {
+                "type": "pokemon_cache",
+                "cache_key": cache_key,
+                "stored_at": str(int(time.time()))
             }
+            if isinstance(data, dict) and data.get('data_type'):
+                # Lets rebuild_index restore the entry's per-type TTL
+                keyvalues["data_type"] = str(data['data_type'])
             
-            # Create a JSON file in memory
-            json_data = json.dumps(cache_payload, indent=2)
-            
-            url = "https://api.pinata.cloud/pinning/pinJSONToIPFS"
-            headers = {
-                "Authorization": f"Bearer {os.getenv('PINATA_JWT_TOKEN', '')}",
-                "Content-Type": "application/json"
-            }
-            
-            # If no JWT token, use API keys
-            if not headers["Authorization"] or headers["Authorization"] == "Bearer ":
-                headers = {
-                    "pinata_api_key": os.getenv("PINATA_API_KEY"),
-                    "pinata_secret_api_key": os.getenv("PINATA_SECRET_API_KEY"),
-                    "Content-Type": "application/json"
-                }
-            
-            payload = {
-                "pinataContent": cache_payload,
-                "pinataMetadata": {
-                    "name": f"pokemon_cache_{cache_key}",
-                    "keyvalues": {
-                        "type": "pokemon_cache",
-                        "cache_key": cache_key
-                    }
-                }
-            }
-            
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
-            
-            if response.status_code == 200:
-                result = response.json()
-                cid = result.get("IpfsHash")
-                logger.debug(f"Cached data to IPFS: {cid}")
-                return cid
-            else:
-                logger.warning(f"Failed to upload to Pinata: {response.status_code} - {response.text}")
-                return None
+            cid, _ = pin_bytes(
+                canonical_dataset(data),
+                name=f"pokemon_cache_{cache_key}.json",
+                keyvalues=keyvalues,
+                timeout=30,
+                list_keys=("cache_key",)
+            )
+            logger.debug(f"Cached data to IPFS: {cid}")
+            return cid
                 
         except Exception as e:
             logger.warning(f"Error uploading to Pinata: {e}")
             return None
     
     def _fetch_from_ipfs(self, cid: str) -> Optional[Dict[str, Any]]:
-        """Fetch data from IPFS using Pinata gateway."""
+        """Fetch data from IPFS by racing the configured gateways."""
         try:
-            import requests
-            
-            # Use Pinata's dedicated gateway or a public one
-            gateway_url = f"https://gateway.pinata.cloud/ipfs/{cid}"
-            # Fallback to public gateway
-            fallback_url = f"https://ipfs.io/ipfs/{cid}"
-            
-            for url in [gateway_url, fallback_url]:
-                try:
-                    response = requests.get(url, timeout=10)
-                    if response.status_code == 200:
-                        data = response.json()
-                        logger.debug(f"Retrieved cached data from IPFS: {cid}")
-                        return data
-                except Exception as e:
-                    logger.debug(f"Failed to fetch from {url}: {e}")
-                    continue
-            
-            logger.warning(f"Could not fetch data from IPFS CID: {cid}")
-            return None
+            data = self.gateways.fetch(cid)
+            if data is None:
+                logger.warning(f"Could not fetch data from IPFS CID: {cid}")
+            return data
             
         except Exception as e:
             logger.warning(f"Error fetching from IPFS: {e}")
@@ -158,27 +278,54 @@ class IPFSCache:
             cache_key = self._fingerprint_rfd(rfd)
             logger.debug(f"Checking cache for key: {cache_key}")
             
+            # Results still waiting to be pinned are served straight from the queue
+            queued = self.write_queue.pending(cache_key) if self.write_queue else None
+            if queued is not None:
+                logger.info(f"Cache HIT (pending write) for RFD fingerprint: {cache_key}")
+                self.tier_hits['memory'] += 1
+                return dict(queued)
+            
             # Check if we have metadata for this cache key
-            if cache_key not in self.cache_metadata:
+            metadata = self.cache_metadata.get(cache_key)
+            if metadata is None:
                 logger.debug(f"No cache metadata for key: {cache_key}")
+                self.tier_misses += 1
                 return None
             
-            metadata = self.cache_metadata[cache_key]
-            current_time = int(time.time())
+            age = int(time.time()) - metadata['timestamp']
+            ttl = self.ttl_for(rfd_data_type(rfd))
             
             # Check if cache entry is expired
-            if current_time - metadata['timestamp'] > self.ttl_seconds:
-                logger.debug(f"Cache expired for key: {cache_key}")
-                del self.cache_metadata[cache_key]
-                return None
+            if age > ttl:
+                if self.revalidator is None or age > ttl + self.max_stale_seconds:
+                    logger.debug(f"Cache expired for key: {cache_key}")
+                    self.tier_misses += 1
+                    del self.cache_metadata[cache_key]
+                    return None
+                # Within the max-stale window: serve it and refresh in the background
+                logger.info(f"Cache entry for {cache_key} is {age - ttl}s stale, revalidating")
+                self.stale_hits += 1
+                self._revalidate(cache_key, rfd)
+            
+            # Serve from the local tiers before going to a gateway
+            local_data = self._get_local(metadata['cid'])
+            if local_data is not None:
+                logger.info(f"Cache HIT (local) for RFD fingerprint: {cache_key}")
+                return local_data
             
             # Fetch from IPFS
             cached_data = self._fetch_from_ipfs(metadata['cid'])
-            if cached_data:
+            if cached_data and isinstance(cached_data.get('data'), dict):
+                # Pins made before results were pinned as dataset documents wrap them in {"data": ...}
+                cached_data = cached_data['data']
+            if cached_data and cached_data.get('data') is not None:
                 logger.info(f"Cache HIT for RFD fingerprint: {cache_key}")
-                return cached_data.get('data')
+                self.tier_hits['ipfs'] += 1
+                self._put_local(metadata['cid'], cached_data)
+                return cached_data
             else:
                 # Remove invalid cache entry
+                self.tier_misses += 1
                 del self.cache_metadata[cache_key]
                 return None
                 
@@ -186,22 +333,135 @@ class IPFSCache:
             logger.warning(f"Error retrieving from cache: {e}")
             return None
     
+    def expires_in(self, rfd: Dict[str, Any]) -> Optional[int]:
+        """Return seconds until an RFD's cached result goes stale (negative once stale).
+        
+        Returns:
+            None if the RFD has no cached result
+        """
+        cache_key = self._fingerprint_rfd(rfd)
+        ttl = self.ttl_for(rfd_data_type(rfd))
+        if self.write_queue and self.write_queue.pending(cache_key) is not None:
+            return ttl
+        metadata = self.cache_metadata.get(cache_key)
+        if metadata is None:
+            return None
+        return ttl - (int(time.time()) - metadata['timestamp'])
+    
+    def record_request(self, rfd: Dict[str, Any]) -> None:
+        """Count a live request for an RFD so warm-up can replay the popular ones.
+        
+        Counts are buffered in memory and written to the index by a
+        background thread, so requests never wait on a SQLite commit.
+        Nothing is recorded without Pinata, since there is nothing to warm.
+        """
+        if not self.pinata_available:
+            return
+        try:
+            cache_key = self._fingerprint_rfd(rfd)
+            rfd_json = json.dumps(rfd, sort_keys=True)
+        except Exception as e:
+            logger.warning(f"Error recording RFD usage: {e}")
+            return
+        with self._usage_lock:
+            entry = self._usage.get(cache_key)
+            if entry is None:
+                self._usage[cache_key] = [rfd_json, 1, int(time.time())]
+            else:
+                entry[0], entry[1], entry[2] = rfd_json, entry[1] + 1, int(time.time())
+            if self._usage_flush_scheduled:
+                return
+            self._usage_flush_scheduled = True
+        try:
+            self._usage_executor.submit(self.flush_usage)
+        except RuntimeError:
+            # Executor already shut down (interpreter exiting)
+            with self._usage_lock:
+                self._usage_flush_scheduled = False
+    
+    def flush_usage(self) -> None:
+        """Write buffered request counts to the index in one transaction."""
+        with self._usage_lock:
+            usage, self._usage = self._usage, {}
+            self._usage_flush_scheduled = False
+        if not usage:
+            return
+        try:
+            self.cache_metadata.record_usage_many(
+                [(cache_key, rfd_json, hits, last_seen) for cache_key, (rfd_json, hits, last_seen) in usage.items()]
+            )
+        except Exception as e:
+            logger.warning(f"Error recording RFD usage: {e}")
+    
+    def popular_rfds(self, limit: int) -> List[Dict[str, Any]]:
+        """Return the most requested RFDs still within the cache retention window."""
+        self.flush_usage()
+        since = int(time.time()) - self._retention_seconds()
+        rfds = []
+        for cache_key, rfd, _ in self.cache_metadata.top_usage(limit, since):
+            try:
+                rfds.append(json.loads(rfd))
+            except ValueError:
+                logger.warning(f"Discarding corrupt usage record for {cache_key}")
+        return rfds
+    
+    def _revalidate(self, cache_key: str, rfd: Dict[str, Any]) -> None:
+        """Schedule a background refresh of a stale entry (at most one per key)."""
+        with self._revalidate_lock:
+            if cache_key in self._revalidating:
+                return
+            self._revalidating.add(cache_key)
+            self.revalidations += 1
+        
+        def refresh() -> None:
+            try:
+                self.revalidator(dict(rfd))
+            except Exception as e:
+                logger.warning(f"Background revalidation failed for {cache_key}: {e}")
+            finally:
+                with self._revalidate_lock:
+                    self._revalidating.discard(cache_key)
+        
+        try:
+            self._revalidate_executor.submit(refresh)
+        except RuntimeError as e:
+            # Executor already shut down (interpreter exiting)
+            logger.debug(f"Could not schedule revalidation for {cache_key}: {e}")
+            with self._revalidate_lock:
+                self._revalidating.discard(cache_key)
+    
     def store_cached(self, rfd: Dict[str, Any], result: Dict[str, Any]) -> bool:
-        """Store result in IPFS cache."""
+        """Store result in IPFS cache.
+        
+        With write-behind enabled the result is queued and pinned by a
+        background worker; True then means the write was accepted.
+        """
         if not self.pinata_available:
             return False
             
         try:
             cache_key = self._fingerprint_rfd(rfd)
-            
+            if self.write_queue:
+                return self.write_queue.submit(cache_key, dict(result))
+            return self._store_now(cache_key, result)
+                
+        except Exception as e:
+            logger.warning(f"Error storing in cache: {e}")
+            return False
+    
+    def _store_now(self, cache_key: str, result: Dict[str, Any]) -> bool:
+        """Pin a result and record its CID."""
+        try:
             # Upload to Pinata
             cid = self._upload_to_pinata(result, cache_key)
             if cid:
                 # Store metadata locally
                 self.cache_metadata[cache_key] = {
                     'cid': cid,
-                    'timestamp': int(time.time())
+                    'timestamp': int(time.time()),
+                    'data_type': result.get('data_type')
                 }
+                self._put_local(cid, result)
                 logger.info(f"Cache STORE for RFD fingerprint: {cache_key} -> {cid}")
                 return True
             else:
@@ -215,28 +475,114 @@ class IPFSCache:
         """Get cache statistics."""
         current_time = int(time.time())
         valid_entries = sum(1 for meta in self.cache_metadata.values() 
-                          if current_time - meta['timestamp'] <= self.ttl_seconds)
+                          if current_time - meta['timestamp'] <= self.ttl_for(meta['data_type']))
         
         return {
             'total_entries': len(self.cache_metadata),
             'valid_entries': valid_entries,
             'expired_entries': len(self.cache_metadata) - valid_entries,
             'ttl_seconds': self.ttl_seconds,
-            'pinata_available': self.pinata_available
+            'ttl_by_type': dict(self.ttl_by_type),
+            'max_stale_seconds': self.max_stale_seconds,
+            'stale_hits': self.stale_hits,
+            'revalidations': self.revalidations,
+            'pinata_available': self.pinata_available,
+            'tier_hits': dict(self.tier_hits),
+            'tier_misses': self.tier_misses,
+            'memory_tier': self.memory_tier.get_stats(),
+            'disk_tier': self.disk_tier.get_stats() if self.disk_tier else None,
+            'write_queue': self.write_queue.get_stats() if self.write_queue else None,
+            'gateways': self.gateways.get_stats(),
+            'content_index': get_content_index().get_stats()
         }
     
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write buffered request counts and wait for queued cache writes to be pinned.
+        
+        Returns:
+            True if every queued write finished within ``timeout``
+        """
+        self.flush_usage()
+        if not self.write_queue:
+            return True
+        return self.write_queue.flush(timeout)
+    
     def clear_expired(self) -> int:
-        """Clear expired cache entries and return count of cleared entries."""
-        current_time = int(time.time())
-        expired_keys = [
-            key for key, meta in self.cache_metadata.items()
-            if current_time - meta['timestamp'] > self.ttl_seconds
-        ]
+        """Clear expired cache entries, compact the index and return count of cleared entries.
+        
+        Entries still inside the max-stale window are kept, since they can be
+        served while being revalidated.
+        """
+        cutoff = int(time.time()) - self._retention_seconds()
+        cleared = self.cache_metadata.purge_older_than(cutoff)
+        
+        if cleared:
+            logger.info(f"Cleared {cleared} expired cache entries")
+        
+        return cleared
+    
+    def rebuild_index(self, page_size: int = 1000) -> int:
+        """Rebuild the metadata index from Pinata's pin list.
         
-        for key in expired_keys:
-            del self.cache_metadata[key]
+        Pins are matched on the ``type``/``cache_key`` keyvalues set at
+        upload time (``cache_key`` lists every fingerprint sharing the
+        pin); the newest pin per fingerprint wins.
         
-        if expired_keys:
-            logger.info(f"Cleared {len(expired_keys)} expired cache entries")
+        Args:
+            page_size: Pins requested per pinList page
+            
+        Returns:
+            Number of index entries added or updated
+        """
+        if not self.pinata_available:
+            return 0
         
-        return len(expired_keys) 
\ No newline at end of file
+        try:
+            url = "https://api.pinata.cloud/data/pinList"
+            headers = pinata_headers()
+            filter_json = json.dumps({"type": {"value": "pokemon_cache", "op": "eq"}})
+            entries = []
+            offset = 0
+            
+            while True:
+                params = {
+                    "status": "pinned",
+                    "metadata[keyvalues]": filter_json,
+                    "pageLimit": page_size,
+                    "pageOffset": offset
+                }
+                response = get_http_client().get(url, params=params, headers=headers, timeout=30)
+                if response.status_code != 200:
+                    logger.warning(f"Failed to list Pinata pins: {response.status_code} - {response.text}")
+                    break
+                
+                rows = response.json().get("rows", [])
+                for row in rows:
+                    keyvalues = (row.get("metadata") or {}).get("keyvalues") or {}
+                    cache_keys = [key for key in str(keyvalues.get("cache_key") or "").split(",") if key]
+                    cid = row.get("ipfs_pin_hash")
+                    if cache_keys and cid:
+                        stored_at = keyvalues.get("stored_at")
+                        timestamp = int(stored_at) if stored_at and stored_at.isdigit() else self._pin_timestamp(row.get("date_pinned"))
+                        entries.extend((cache_key, cid, timestamp, keyvalues.get("data_type")) for cache_key in cache_keys)
+                
+                if len(rows) < page_size:
+                    break
+                offset += page_size
+            
+            # Pins too old to serve, even stale, are not worth indexing
+            cutoff = int(time.time()) - self._retention_seconds()
+            updated = self.cache_metadata.put_many([entry for entry in entries if entry[2] >= cutoff])
+            logger.info(f"Rebuilt IPFS cache index from {len(entries)} Pinata pins ({updated} entries updated)")
+            return updated
+            
+        except Exception as e:
+            logger.warning(f"Error rebuilding cache index from Pinata: {e}")
+            return 0
+    
+    def _pin_timestamp(self, date_pinned: Optional[str]) -> int:
+        """Convert a Pinata ``date_pinned`` ISO string to a Unix timestamp."""
+        try:
+            return int(datetime.fromisoformat(date_pinned.replace("Z", "+00:00")).timestamp())
+        except (AttributeError, ValueError):
+            return 0
@@ -0,0 +1,124 @@
+"""Byte-size-bounded in-memory LRU cache with optional TTL."""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+
+def estimate_size(obj: Any) -> int:
+    """Approximate the memory footprint of a JSON-like object in bytes.
+
+    Walks dicts, lists and tuples recursively and sums ``sys.getsizeof`` for
+    every container, key and leaf value.
+    """
+    size = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return size
+
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by the estimated size of its values.
+
+    Least recently used entries are evicted once the total size exceeds
+    ``max_bytes``. When ``ttl_seconds`` is set, entries older than that are
+    treated as misses and dropped on access.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl_seconds: Optional[float] = None):
+        """Initialize the cache.
+
+        Args:
+            max_bytes: Memory budget for cached values
+            ttl_seconds: Optional time-to-live for entries (None disables expiry)
+        """
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value for ``key`` and mark it as recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, size, stored_at = entry
+            if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self._total_bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, size: Optional[int] = None) -> None:
+        """Insert or replace ``key``, evicting old entries to stay within budget.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            size: Precomputed size in bytes (estimated when omitted)
+        """
+        size = estimate_size(value) if size is None else size
+        if size > self.max_bytes:
+            # A single value larger than the whole budget would flush everything
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous[1]
+            self._entries[key] = (value, size, time.monotonic())
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes and self._entries:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+                self.evictions += 1
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return False
+        return self.ttl_seconds is None or time.monotonic() - entry[2] <= self.ttl_seconds
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Remove every entry (counters are preserved)."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'size_bytes': self._total_bytes,
+            'max_bytes': self.max_bytes,
+            'ttl_seconds': self.ttl_seconds,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations
+        }
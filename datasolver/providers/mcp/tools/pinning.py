@@ -0,0 +1,310 @@
+"""Content-addressed pinning to IPFS via Pinata.
+
+Every pin goes through ``pin_bytes``, which hashes the exact bytes first and
+looks the hash up in a local content index (SQLite, shared by the IPFS
+cache, the dataset uploader and the solution submitter). Content that has
+been pinned before is never uploaded again; its existing CID is reused.
+The IPFS cache pins results in the same canonical layout ``DatasetWriter``
+uses for compact JSON files (``canonical_dataset``), so a solution file
+and the cache entry for the same result share one upload and one CID.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Tuple
+
+from .http_client import get_http_client
+from .single_flight import SingleFlight
+
+logger = logging.getLogger('Pinning')
+
+PIN_FILE_URL = "https://api.pinata.cloud/pinning/pinFileToIPFS"
+PIN_METADATA_URL = "https://api.pinata.cloud/pinning/hashMetadata"
+DEFAULT_CONTENT_INDEX_PATH = os.path.join("data", "cache", "content_index.db")
+
+# Top-level result fields describing how this node served a dataset rather than the dataset itself
+SERVING_FIELDS = ("cached", "cache_stored", "source")
+
+# Most values a list keyvalue (see ``merge_keyvalues``) keeps
+KEYVALUE_LIST_LIMIT = 8
+
+
+def content_hash(content: bytes) -> str:
+    """Return the stable SHA-256 hex digest of ``content``."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def canonical_json(obj: Any) -> bytes:
+    """Serialize ``obj`` canonically: sorted keys, compact separators, UTF-8.
+
+    Always uses the standard library rather than the faster codec backends,
+    whose float and NaN formatting differs, so equal objects produce
+    identical bytes, content hashes and CIDs whichever backend is installed.
+    """
+    return json.dumps(obj, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def canonical_dataset(document: Dict[str, Any]) -> bytes:
+    """Serialize a ``{"data": [...], ...}`` dataset exactly as ``DatasetWriter`` writes compact JSON.
+
+    ``data`` comes first, then the other fields in key order without
+    ``SERVING_FIELDS``; every value is ``canonical_json``. The IPFS cache
+    pins these bytes, so uploading the solution file for the same result
+    reuses the cache's CID.
+    """
+    parts = [b'{"data":[', b",".join(canonical_json(record) for record in document.get("data") or []), b"]"]
+    for key in sorted(document):
+        if key == "data" or key in SERVING_FIELDS:
+            continue
+        parts.append(b"," + canonical_json(key) + b":" + canonical_json(document[key]))
+    parts.append(b"}")
+    return b"".join(parts)
+
+
+def merge_keyvalues(current: Dict[str, str], update: Dict[str, str],
+                    list_keys: Tuple[str, ...] = ()) -> Dict[str, str]:
+    """Merge ``update`` into a pin's keyvalues.
+
+    Keys in ``list_keys`` accumulate comma-separated values (newest last,
+    at most ``KEYVALUE_LIST_LIMIT``) instead of being replaced, so a pin
+    shared by several owners keeps every one of them.
+    """
+    merged = dict(current)
+    for key, value in update.items():
+        if key in list_keys and merged.get(key):
+            values = [item for item in str(merged[key]).split(",") if item and item != value]
+            merged[key] = ",".join((values + [value])[-KEYVALUE_LIST_LIMIT:])
+        else:
+            merged[key] = value
+    return merged
+
+
+def pinata_headers(content_type: Optional[str] = "application/json") -> Dict[str, str]:
+    """Build Pinata auth headers, preferring the JWT over API keys.
+
+    Args:
+        content_type: Content-Type to send (None for multipart uploads,
+            where the HTTP client sets it)
+    """
+    jwt = os.getenv("PINATA_JWT_TOKEN", "")
+    if jwt:
+        headers = {"Authorization": f"Bearer {jwt}"}
+    else:
+        headers = {
+            "pinata_api_key": os.getenv("PINATA_API_KEY"),
+            "pinata_secret_api_key": os.getenv("PINATA_SECRET_API_KEY")
+        }
+    if content_type:
+        headers["Content-Type"] = content_type
+    return headers
+
+
+class ContentIndex:
+    """Durable mapping of content hash to the CID it was pinned under."""
+
+    def __init__(self, path: str = DEFAULT_CONTENT_INDEX_PATH):
+        """Open (or create) the index.
+
+        Args:
+            path: SQLite database file path (":memory:" for a non-persistent index)
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS content (
+                hash TEXT PRIMARY KEY,
+                cid TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                pinned_at INTEGER NOT NULL,
+                keyvalues TEXT
+            )"""
+        )
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(content)")]
+        if "keyvalues" not in columns:
+            # Indexes created before pins were retagged; their keyvalues start out unknown
+            self._conn.execute("ALTER TABLE content ADD COLUMN keyvalues TEXT")
+        self._conn.commit()
+
+    def get(self, digest: str) -> Optional[str]:
+        """Return the CID pinned for a content hash, if any."""
+        with self._lock:
+            row = self._conn.execute("SELECT cid FROM content WHERE hash = ?", (digest,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def put(self, digest: str, cid: str, size: int, keyvalues: Optional[Dict[str, str]] = None) -> None:
+        """Record the CID a content hash was pinned under, and the keyvalues it was pinned with."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO content (hash, cid, size, pinned_at, keyvalues) VALUES (?, ?, ?, ?, ?)",
+                (digest, cid, size, int(time.time()), json.dumps(keyvalues or {}))
+            )
+            self._conn.commit()
+
+    def get_keyvalues(self, digest: str) -> Dict[str, str]:
+        """Return the keyvalues last set on the pin of a content hash (empty if unknown)."""
+        with self._lock:
+            row = self._conn.execute("SELECT keyvalues FROM content WHERE hash = ?", (digest,)).fetchone()
+        return json.loads(row[0]) if row and row[0] else {}
+
+    def set_keyvalues(self, digest: str, keyvalues: Dict[str, str]) -> None:
+        """Record the keyvalues now set on the pin of a content hash."""
+        with self._lock:
+            self._conn.execute("UPDATE content SET keyvalues = ? WHERE hash = ?", (json.dumps(keyvalues), digest))
+            self._conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index statistics."""
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM content").fetchone()
+        return {
+            'path': self.path,
+            'entries': entries,
+            'pinned_bytes': size,
+            'reused': self.hits,
+            'uploaded': self.misses
+        }
+
+
+_index: Optional[ContentIndex] = None
+_index_lock = threading.Lock()
+
+# Concurrent pins of the same bytes share one upload
+_upload_flight = SingleFlight()
+
+# Metadata updates of reused pins run here, off the caller's path
+_retag_lock = threading.Lock()
+_retag_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pin-metadata")
+
+
+def get_content_index() -> ContentIndex:
+    """Return the process-wide content index named by CONTENT_INDEX_PATH.
+
+    An empty CONTENT_INDEX_PATH, or a path that cannot be opened, keeps the
+    index in memory.
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            path = os.getenv("CONTENT_INDEX_PATH", DEFAULT_CONTENT_INDEX_PATH)
+            try:
+                _index = ContentIndex(path or ":memory:")
+            except Exception as e:
+                logger.warning(f"Could not open content index {path}, using memory: {e}")
+                _index = ContentIndex(":memory:")
+        return _index
+
+
+def pin_bytes(content: bytes, name: str, keyvalues: Optional[Dict[str, str]] = None,
+              timeout: float = 60, list_keys: Tuple[str, ...] = ()) -> Tuple[str, bool]:
+    """Pin ``content`` to IPFS unless identical bytes were pinned before.
+
+    When the bytes were pinned before, ``keyvalues`` are merged into the
+    existing pin's metadata (see ``merge_keyvalues``) in the background,
+    and only if they add something.
+
+    Args:
+        content: Exact bytes to pin
+        name: Pin name shown in Pinata
+        keyvalues: Optional Pinata metadata keyvalues
+        timeout: Upload timeout in seconds
+        list_keys: Keyvalues that accumulate values when a pin is reused
+
+    Returns:
+        ``(cid, reused)`` where ``reused`` is True if no upload was needed
+
+    Raises:
+        RuntimeError: If Pinata rejects the upload or returns no CID
+    """
+    index = get_content_index()
+    digest = content_hash(content)
+    cid = index.get(digest)
+    if not cid:
+        cid, shared = _upload_flight.do(digest, lambda: _upload(index, digest, content, name, keyvalues, timeout))
+        if not shared:
+            return cid, False
+
+    logger.info(f"Content {digest[:12]} already pinned as {cid}, skipping upload")
+    if keyvalues:
+        _retag(index, digest, cid, name, keyvalues, list_keys, timeout)
+    return cid, True
+
+
+def _upload(index: ContentIndex, digest: str, content: bytes, name: str,
+            keyvalues: Optional[Dict[str, str]], timeout: float) -> str:
+    """Upload ``content`` to Pinata and record its CID."""
+    metadata = {"name": name}
+    if keyvalues:
+        metadata["keyvalues"] = keyvalues
+    response = get_http_client().post(
+        PIN_FILE_URL,
+        files={"file": (name, content)},
+        data={"pinataMetadata": json.dumps(metadata)},
+        headers=pinata_headers(content_type=None),
+        timeout=timeout
+    )
+    if response.status_code != 200:
+        raise RuntimeError(f"Failed to pin to IPFS: {response.status_code} - {response.text}")
+
+    cid = response.json().get("IpfsHash")
+    if not cid:
+        raise RuntimeError("No IPFS hash returned in response")
+
+    index.put(digest, cid, len(content), keyvalues)
+    logger.debug(f"Pinned {len(content)} bytes as {cid}")
+    return cid
+
+
+def _retag(index: ContentIndex, digest: str, cid: str, name: str, keyvalues: Dict[str, str],
+           list_keys: Tuple[str, ...], timeout: float) -> None:
+    """Merge ``keyvalues`` into a reused pin's metadata, updating Pinata in the background."""
+    with _retag_lock:
+        current = index.get_keyvalues(digest)
+        merged = merge_keyvalues(current, keyvalues, list_keys)
+        if merged == current:
+            return
+        index.set_keyvalues(digest, merged)
+    _retag_executor.submit(update_pin_metadata, cid, name, merged, timeout)
+
+
+def update_pin_metadata(cid: str, name: str, keyvalues: Dict[str, str], timeout: float = 60) -> bool:
+    """Replace the name and set ``keyvalues`` on an existing pin.
+
+    Pinata merges the keyvalues into the pin's metadata, so keys given here
+    overwrite the ones set when the content was first pinned; ``pin_bytes``
+    sends the merged set.
+
+    Returns:
+        True if Pinata accepted the update
+    """
+    try:
+        response = get_http_client().put(
+            PIN_METADATA_URL,
+            data=json.dumps({"ipfsPinHash": cid, "name": name, "keyvalues": keyvalues}),
+            headers=pinata_headers(),
+            timeout=timeout
+        )
+        if response.status_code == 200:
+            return True
+        logger.warning(f"Failed to update metadata of pin {cid}: {response.status_code} - {response.text}")
+    except Exception as e:
+        logger.warning(f"Failed to update metadata of pin {cid}: {e}")
+    return False
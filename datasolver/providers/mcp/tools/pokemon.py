@@ -1,14 +1,34 @@
 """Pokémon MCP tool for generating Pokémon-related datasets using direct PokéAPI access."""
 
-import json
+import copy
 import logging
-import time
-from typing import Dict, Any, List, Optional
-from .tool import MCPTool
-from .ipfs_cache import IPFSCache
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
+from .tool import MCPTool, MetadataFrame, stream_result
+from . import codec
+from .ipfs_cache import IPFSCache, rfd_data_type
+from .rate_limiter import TokenBucket
+from .http_client import get_http_client
+from .response_store import ResponseStore
+from .memory_cache import LRUCache
+from .projection import project, PROJECTION_VERSION
+from .snapshot import PokedexSnapshot, GENERATION_RANGES
+from .columnar import ColumnarPokedex, STAT_NAMES, TYPE_NAMES
+from .single_flight import SingleFlight
+from .record_cache import RecordCache, record_key
+from .schema_plan import ProjectionPlan, compile_schema
 
 logger = logging.getLogger('PokemonTool')
 
+# PokéAPI resource behind each non-Pokémon data type
+RESOURCE_DATA_TYPES = {
+    "moves": "move",
+    "abilities": "ability",
+    "types": "type",
+    "evolution": "evolution-chain"
+}
+
 class PokemonTool(MCPTool):
     """MCP tool for generating Pokémon datasets using direct PokéAPI access.
     
@@ -21,14 +41,65 @@ class PokemonTool(MCPTool):
     - And more based on RFD requirements
     """
     
-    def __init__(self):
-        """Initialize the Pokémon tool with direct API access and IPFS cache."""
+    def __init__(self, max_concurrency: Optional[int] = None, requests_per_second: Optional[float] = None,
+                 memory_cache_mb: Optional[float] = None, memory_cache_ttl: Optional[float] = None,
+                 snapshot_path: Optional[str] = None, offline: Optional[bool] = None):
+        """Initialize the Pokémon tool with direct API access and IPFS cache.
+        
+        Args:
+            max_concurrency: Maximum number of PokéAPI requests in flight
+                (defaults to POKEAPI_MAX_CONCURRENCY or 8)
+            requests_per_second: Sustained PokéAPI request rate
+                (defaults to POKEAPI_RATE_LIMIT or 20)
+            memory_cache_mb: Memory budget for cached API responses
+                (defaults to POKEAPI_MEMORY_CACHE_MB or 64)
+            memory_cache_ttl: Optional TTL in seconds for cached API responses
+                (defaults to POKEAPI_MEMORY_CACHE_TTL, unset means no expiry)
+            snapshot_path: Local Pokédex snapshot to serve records from
+                (defaults to POKEDEX_SNAPSHOT_PATH or data/pokedex_snapshot.json.gz
+                if present; pass an empty string to disable)
+            offline: Never contact PokéAPI, answering only from the snapshot
+                (defaults to POKEDEX_OFFLINE)
+        """
         try:
-            import requests
-            self.session = requests.Session()
+            self.max_concurrency = max(1, int(max_concurrency or os.getenv("POKEAPI_MAX_CONCURRENCY", 8)))
+            rate = float(requests_per_second or os.getenv("POKEAPI_RATE_LIMIT", 20))
+            self.rate_limiter = TokenBucket(rate=rate)
+            # Shared keep-alive client, sized so concurrent workers don't discard connections
+            self.session = get_http_client(min_pool_size=self.max_concurrency)
             self.base_url = "https://pokeapi.co/api/v2"
-            self.cache = {}  # Simple in-memory cache for API responses
+            if memory_cache_mb is None:
+                memory_cache_mb = float(os.getenv("POKEAPI_MEMORY_CACHE_MB", 64))
+            if memory_cache_ttl is None:
+                # An empty variable means no expiry; an explicit 0 expires entries at once
+                env_ttl = os.getenv("POKEAPI_MEMORY_CACHE_TTL")
+                memory_cache_ttl = float(env_ttl) if env_ttl else None
+            # Bounded in-memory LRU cache for API responses
+            self.cache = LRUCache(
+                max_bytes=int(memory_cache_mb * 1024 * 1024),
+                ttl_seconds=memory_cache_ttl
+            )
+            self.response_store = ResponseStore.from_env()  # Persistent on-disk response store
+            if snapshot_path is None:
+                self.snapshot = PokedexSnapshot.from_env()
+            else:
+                self.snapshot = PokedexSnapshot.load(snapshot_path) if snapshot_path else None
+            self.offline = offline if offline is not None else os.getenv("POKEDEX_OFFLINE", "false").lower() == "true"
+            if self.offline and not self.snapshot:
+                logger.warning("Offline mode enabled without a Pokédex snapshot; requests will return no data")
+            self.columns = ColumnarPokedex.from_env()  # Memory-mapped index for filtered queries
+            # Built records per entity, so overlapping RFDs only fetch the delta
+            self.record_cache = RecordCache.from_env()
+            self.data_version = f"v{PROJECTION_VERSION}"
+            if self.snapshot:
+                self.data_version += f"-snapshot{self.snapshot.created_at}"
+            self.generation_index: Dict[int, List[int]] = {}  # generation -> member Pokémon IDs
             self.ipfs_cache = IPFSCache(ttl_minutes=30)  # 30-minute TTL for IPFS cache
+            # Concurrent identical RFDs and overlapping requests share one execution
+            self.rfd_flight = SingleFlight()
+            self.request_flight = SingleFlight()
+            # Stale IPFS cache hits are served at once and regenerated in the background
+            self.ipfs_cache.revalidator = self._revalidate_result
             logger.info("Initialized Pokémon tool with direct PokéAPI access and IPFS cache")
         except ImportError:
             logger.error("requests not installed. Install with: pip install requests")
@@ -86,6 +157,11 @@ class PokemonTool(MCPTool):
                     "required": False,
                     "description": "Filter by Pokémon type (e.g., 'fire', 'water')"
                 },
+                "min_stats": {
+                    "type": "object",
+                    "required": False,
+                    "description": "Minimum base stats, e.g. {'speed': 100}"
+                },
                 "include_stats": {
                     "type": "boolean",
                     "required": False,
@@ -103,6 +179,11 @@ class PokemonTool(MCPTool):
                     "required": False,
                     "default": False,
                     "description": "Include move data (can be large)"
+                },
+                "schema": {
+                    "type": "object",
+                    "required": False,
+                    "description": "JSON schema of the records; only the listed fields are fetched and emitted"
                 }
             },
             "output_format": "json",
@@ -110,29 +191,130 @@ class PokemonTool(MCPTool):
         }
     
     def _make_request(self, endpoint: str) -> Optional[Dict]:
-        """Make a request to PokéAPI with caching."""
+        """Make a request to PokéAPI with snapshot, in-memory and on-disk caching.
+        
+        Responses are projected to compact records (see ``projection``)
+        before they enter the in-memory cache, so builders and the cache
+        only ever see the fields the tool emits.
+        """
+        # Serve from the local snapshot when one is loaded
+        if self.snapshot:
+            record = self.snapshot.get(endpoint)
+            if record is not None:
+                return record
+        
+        return self._request_api(endpoint)
+    
+    def _request_api(self, endpoint: str) -> Optional[Dict]:
+        """Resolve an endpoint through the memory cache, response store and network."""
+        if self.offline:
+            logger.warning(f"Offline mode: {endpoint} not found in Pokédex snapshot")
+            return None
+        
         url = f"{self.base_url}/{endpoint}"
         
         # Check cache first
-        if url in self.cache:
-            return self.cache[url]
+        cached = self.cache.get(url)
+        if cached is not None:
+            return cached
+        
+        # Identical URLs already in flight (e.g. from an overlapping RFD) share one fetch
+        data, _ = self.request_flight.do(url, lambda: self._fetch_and_project(endpoint, url))
+        return data
+    
+    def _fetch_and_project(self, endpoint: str, url: str) -> Optional[Dict]:
+        """Fetch an endpoint, project it and add it to the memory cache."""
+        raw = self._fetch_raw(endpoint, url)
+        if raw is None:
+            return None
         
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Cache the response
-            self.cache[url] = data
+            data = project(endpoint, raw)
+        except (KeyError, IndexError, TypeError) as e:
+            logger.warning(f"Unexpected response shape for {url}: {e}")
+            return None
+        
+        # Cache the projected record
+        self.cache.set(url, data)
+        
+        return data
+    
+    def _fetch_raw(self, endpoint: str, url: str) -> Optional[Dict]:
+        """Fetch a raw PokéAPI document via the response store or the network.
+        
+        Fresh entries in the response store are served without touching the
+        network; stale ones are revalidated with a conditional GET.
+        """
+        stored = self.response_store.get(endpoint) if self.response_store else None
+        if stored and stored.is_fresh(self.response_store.max_age_seconds):
+            try:
+                return codec.loads(stored.body)
+            except ValueError:
+                logger.warning(f"Discarding corrupt stored response for {endpoint}")
+                stored = None
+        
+        try:
+            # Wait for a token to stay within the PokéAPI rate limit
+            self.rate_limiter.acquire()
+            headers = stored.conditional_headers() if stored else {}
+            response = self.session.get(url, headers=headers, timeout=10)
             
-            # Add small delay to be respectful to the API
-            time.sleep(0.1)
+            if stored and response.status_code == 304:
+                # Upstream confirmed our copy is current
+                self.response_store.touch(endpoint)
+                return codec.loads(stored.body)
             
+            response.raise_for_status()
+            data = codec.loads(response.content)
+            if self.response_store:
+                self.response_store.put(
+                    endpoint, response.content,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified")
+                )
             return data
         except Exception as e:
+            if stored:
+                # Serve the stale copy rather than failing outright
+                logger.warning(f"Revalidation of {url} failed, serving stored copy: {e}")
+                try:
+                    return codec.loads(stored.body)
+                except ValueError:
+                    pass
             logger.warning(f"Failed to fetch {url}: {e}")
             return None
     
+    def _fetch_many(self, endpoints: List[str]) -> List[Optional[Dict]]:
+        """Fetch several endpoints concurrently, preserving input order.
+        
+        Args:
+            endpoints: PokéAPI endpoints relative to the base URL
+            
+        Returns:
+            Responses in the same order as ``endpoints`` (None for failures)
+        """
+        results: List[Optional[Dict]] = [None] * len(endpoints)
+        pending = []
+        for index, endpoint in enumerate(endpoints):
+            # Snapshot lookups are local, so only misses go to the worker pool
+            record = self.snapshot.get(endpoint) if self.snapshot else None
+            if record is not None:
+                results[index] = record
+            else:
+                pending.append(index)
+        
+        if len(pending) <= 1 or self.max_concurrency == 1 or self.offline:
+            for index in pending:
+                results[index] = self._request_api(endpoints[index])
+            return results
+        
+        workers = min(self.max_concurrency, len(pending))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pokeapi") as executor:
+            fetched = executor.map(self._request_api, [endpoints[index] for index in pending])
+            for index, record in zip(pending, fetched):
+                results[index] = record
+        return results
+    
     def validate_rfd(self, rfd: Dict[str, Any]) -> bool:
         """Validate if the tool can handle the given RFD."""
         try:
@@ -160,6 +342,32 @@ class PokemonTool(MCPTool):
                 logger.warning(f"Requested {num_records} records exceeds maximum {self.capabilities['max_records']}")
                 return False
             
+            # An unknown type would scan every candidate without a match
+            type_filter = rfd.get("type_filter")
+            if type_filter is not None and (not isinstance(type_filter, str) or type_filter.lower() not in TYPE_NAMES):
+                logger.warning(f"Unknown type_filter: {type_filter!r} (expected one of {', '.join(TYPE_NAMES)})")
+                return False
+            
+            # Stat thresholds must name known base stats with integer minimums
+            min_stats = rfd.get("min_stats") or {}
+            if not isinstance(min_stats, dict):
+                logger.warning(f"min_stats must be an object, got {type(min_stats).__name__}")
+                return False
+            for stat, minimum in min_stats.items():
+                if stat not in STAT_NAMES:
+                    logger.warning(f"Unknown stat in min_stats: {stat} (expected one of {', '.join(STAT_NAMES)})")
+                    return False
+                if isinstance(minimum, bool) or not isinstance(minimum, int):
+                    logger.warning(f"min_stats[{stat}] must be an integer, got {minimum!r}")
+                    return False
+            
+            # A schema cannot require a section the RFD explicitly turns off
+            schema_plan = compile_schema(rfd.get("schema")) if data_type == "pokemon" else None
+            excluded = schema_plan.excluded_required(rfd) if schema_plan else []
+            if excluded:
+                logger.warning(f"Schema requires {', '.join(excluded)} but the RFD sets include_{excluded[0]} to false")
+                return False
+            
             return True
             
         except Exception as e:
@@ -167,75 +375,257 @@ class PokemonTool(MCPTool):
             return False
     
     def generate_data(self, rfd: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate Pokémon dataset according to the RFD with IPFS caching."""
+        """Generate Pokémon dataset according to the RFD with IPFS caching.
+        
+        When a local Pokédex snapshot is loaded the IPFS cache is bypassed,
+        since answering from the snapshot is faster than any gateway fetch.
+        """
         try:
-            # 1. Try IPFS cache first
-            cached_result = self.ipfs_cache.get_cached(rfd)
-            if cached_result is not None:
-                logger.info("Returning cached result from IPFS")
-                # Ensure cached result has the right structure
-                if isinstance(cached_result, dict) and 'data' in cached_result:
-                    cached_result['cached'] = True
-                    cached_result['source'] = 'IPFS Cache via Pinata'
-                    return cached_result
-                else:
-                    # If cached result doesn't have expected structure, treat as fresh data
-                    logger.warning("Cached result has unexpected structure, treating as fresh")
-                    pass
-            
-            # 2. Generate fresh data if not in cache
-            data_type = rfd.get("data_type") or rfd.get("type") or rfd.get("pokemon_data_type", "pokemon")
-            num_records = rfd.get("num_records", 10)
-            pokemon_names = rfd.get("pokemon_names", [])
-            pokemon_ids = rfd.get("pokemon_ids", [])
-            generation = rfd.get("generation")
-            type_filter = rfd.get("type_filter")
-            include_stats = rfd.get("include_stats", True)
-            include_abilities = rfd.get("include_abilities", True)
-            include_moves = rfd.get("include_moves", False)
-            
-            logger.info(f"Generating fresh {data_type} dataset with {num_records} records")
-            
-            # Generate data based on type
-            if data_type == "pokemon":
-                records = self._generate_pokemon_data(
-                    num_records, pokemon_names, pokemon_ids, generation, 
-                    type_filter, include_stats, include_abilities, include_moves
-                )
-            elif data_type == "moves":
-                records = self._generate_move_data(num_records)
-            elif data_type == "abilities":
-                records = self._generate_ability_data(num_records)
-            elif data_type == "types":
-                records = self._generate_type_data()
-            elif data_type == "evolution":
-                records = self._generate_evolution_data(num_records)
-            else:
-                raise ValueError(f"Unsupported data type: {data_type}")
-            
-            result = {
-                "data": records,
-                "count": len(records),
-                "data_type": data_type,
-                "source": "PokéAPI via direct requests",
-                "cached": False
-            }
-            
-            # 3. Store result in IPFS cache
-            cache_stored = self.ipfs_cache.store_cached(rfd, result)
-            if cache_stored:
-                result["cache_stored"] = True
-                logger.info("Result stored in IPFS cache")
-            
+            # Identical RFDs in flight share one generation (and one IPFS pin)
+            result, shared = self._do_rfd_flight(
+                self.ipfs_cache._fingerprint_rfd(rfd), lambda: self._generate_result(rfd)
+            )
+            if shared:
+                logger.info("Joined an in-flight generation for an identical RFD")
+                # Callers own their result; the leader's records must not be shared
+                result = copy.deepcopy(result)
             return result
             
         except Exception as e:
             logger.error(f"Error generating Pokémon data: {e}")
             raise RuntimeError(f"Failed to generate Pokémon data: {e}")
     
+    def _generate_result(self, rfd: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer an RFD from the IPFS cache or generate it fresh."""
+        # 1. Try IPFS cache first
+        cached_result = self._get_cached_result(rfd)
+        if cached_result is not None:
+            return cached_result
+        
+        # 2. Generate fresh data if not in cache
+        return self._generate_fresh(rfd)
+    
+    def _generate_fresh(self, rfd: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate an RFD's result, bypassing the IPFS cache, and store it."""
+        params = self._parse_rfd(rfd)
+        logger.info(f"Generating fresh {params['data_type']} dataset with {params['num_records']} records")
+        
+        if params["data_type"] == "pokemon":
+            records = self._generate_pokemon_data(**self._pokemon_args(params))
+        else:
+            records = self._generate_resource_data(params["data_type"], params["num_records"])
+        
+        result = self._build_result(params["data_type"], records)
+        
+        # 3. Store result in IPFS cache
+        self._store_result(rfd, result)
+        return result
+    
+    def stream_data(self, rfd: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Stream the RFD's records as they are built, then a ``MetadataFrame``.
+        
+        Cached results are replayed from the IPFS cache. Fresh records are
+        fetched ``max_concurrency`` at a time, so each chunk is one round of
+        concurrent requests; the complete result is stored in the IPFS
+        cache once the last record has been yielded.
+        
+        The stream runs under the same single-flight key as ``generate_data``
+        and ``warm``: a stream that finds an identical RFD already being
+        generated waits for it and replays its result, and callers arriving
+        while this stream generates join it in turn.
+        
+        Raises:
+            RuntimeError: If the RFD is invalid or data generation fails
+        """
+        try:
+            yield from self._stream_result(rfd)
+        except Exception as e:
+            logger.error(f"Error generating Pokémon data: {e}")
+            raise RuntimeError(f"Failed to generate Pokémon data: {e}") from e
+    
+    def _stream_result(self, rfd: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Stream an RFD from the IPFS cache, an identical in-flight generation, or fresh."""
+        cached_result = self._get_cached_result(rfd)
+        if cached_result is not None:
+            yield from stream_result(cached_result)
+            return
+        
+        flight_key = self.ipfs_cache._fingerprint_rfd(rfd)
+        call, leader = self.rfd_flight.begin(flight_key)
+        if not leader:
+            result = self.rfd_flight.wait(call)
+            if result is not None:
+                logger.info("Joined an in-flight generation for an identical RFD")
+                yield from stream_result(copy.deepcopy(result))
+                return
+            # The leading stream was abandoned before it finished; generate it ourselves
+            result, shared = self._do_rfd_flight(flight_key, lambda: self._generate_result(rfd))
+            yield from stream_result(copy.deepcopy(result) if shared else result)
+            return
+        
+        result = None
+        error = None
+        try:
+            params = self._parse_rfd(rfd)
+            logger.info(f"Streaming fresh {params['data_type']} dataset with {params['num_records']} records")
+            if params["data_type"] == "pokemon":
+                stream = self._iter_pokemon_data(**self._pokemon_args(params), chunk_size=self.max_concurrency)
+            else:
+                stream = self._iter_resource_data(params["data_type"], params["num_records"],
+                                                  chunk_size=self.max_concurrency)
+            
+            # The cache pins whole results, so the records are kept for the store at the end
+            records = []
+            for record in stream:
+                records.append(record)
+                yield record
+            
+            result = self._build_result(params["data_type"], records)
+            self._store_result(rfd, result)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            # Followers get the result, the error, or None if this stream was closed early
+            self.rfd_flight.finish(flight_key, call, result=result, error=error)
+        yield MetadataFrame({key: value for key, value in result.items() if key != "data"})
+    
+    def _revalidate_result(self, rfd: Dict[str, Any]) -> None:
+        """Regenerate and re-pin a stale cached RFD (runs on the cache's refresh thread)."""
+        # Keyed apart from live generations, which would hand back the stale result
+        self.rfd_flight.do(
+            f"revalidate:{self.ipfs_cache._fingerprint_rfd(rfd)}", lambda: self._generate_fresh(rfd)
+        )
+        logger.info("Revalidated stale cached result")
+    
+    def warm(self, rfd: Dict[str, Any]) -> Dict[str, Any]:
+        """Regenerate an RFD ahead of demand, skipping the IPFS cache lookup.
+        
+        Runs under the same single-flight key as ``generate_data`` (and
+        ``AsyncPokemonTool.generate_data_async``, which registers its
+        generations in ``rfd_flight`` too), so live requests for the RFD
+        that arrive meanwhile join the warm-up.
+        """
+        result, _ = self._do_rfd_flight(
+            self.ipfs_cache._fingerprint_rfd(rfd), lambda: self._generate_fresh(rfd)
+        )
+        return result
+    
+    def _do_rfd_flight(self, key: str, fn: Callable[[], Dict[str, Any]]) -> Tuple[Dict[str, Any], bool]:
+        """``rfd_flight.do`` that runs ``fn`` itself if the joined leader gave up without a result.
+        
+        Abandoned streams and cancelled async generations finish their
+        call with no result.
+        """
+        result, shared = self.rfd_flight.do(key, fn)
+        if shared and result is None:
+            return fn(), False
+        return result, shared
+    
+    def live_generations(self) -> int:
+        """Return the number of RFD generations currently in flight."""
+        return self.rfd_flight.get_stats()['in_flight']
+    
+    def _get_cached_result(self, rfd: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Look up an RFD in the IPFS cache (skipped when a snapshot is loaded)."""
+        self.ipfs_cache.record_request(rfd)
+        if self.snapshot:
+            return None
+        
+        cached_result = self.ipfs_cache.get_cached(rfd)
+        if cached_result is None:
+            return None
+        
+        logger.info("Returning cached result from IPFS")
+        # Ensure cached result has the right structure
+        if isinstance(cached_result, dict) and 'data' in cached_result:
+            cached_result['cached'] = True
+            cached_result['source'] = 'IPFS Cache via Pinata'
+            return cached_result
+        
+        # If cached result doesn't have expected structure, treat as fresh data
+        logger.warning("Cached result has unexpected structure, treating as fresh")
+        return None
+    
+    def _parse_rfd(self, rfd: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract generation parameters from an RFD, applying defaults.
+        
+        Raises:
+            ValueError: If the data type is not supported
+        """
+        data_type = rfd_data_type(rfd)
+        if data_type != "pokemon" and data_type not in RESOURCE_DATA_TYPES:
+            raise ValueError(f"Unsupported data type: {data_type}")
+        
+        include = {
+            "include_stats": rfd.get("include_stats", True),
+            "include_abilities": rfd.get("include_abilities", True),
+            "include_moves": rfd.get("include_moves", False)
+        }
+        
+        # The schema decides which optional sections are built; an explicit include_* = false still wins
+        schema_plan = compile_schema(rfd.get("schema")) if data_type == "pokemon" else None
+        if schema_plan:
+            excluded = schema_plan.excluded_required(rfd)
+            if excluded:
+                raise ValueError(f"Schema requires {', '.join(excluded)} but the RFD sets include_{excluded[0]} to false")
+            for section in ("stats", "abilities", "moves"):
+                include[f"include_{section}"] = (
+                    schema_plan.wants(section) and rfd.get(f"include_{section}") is not False
+                )
+        
+        return {
+            "data_type": data_type,
+            "num_records": rfd.get("num_records", 10),
+            "pokemon_names": rfd.get("pokemon_names", []),
+            "pokemon_ids": rfd.get("pokemon_ids", []),
+            "generation": rfd.get("generation"),
+            "type_filter": rfd.get("type_filter"),
+            "min_stats": rfd.get("min_stats") or {},
+            **include,
+            "schema_plan": schema_plan
+        }
+    
+    def _pokemon_args(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Select the ``_generate_pokemon_data`` arguments from parsed RFD parameters."""
+        return {key: value for key, value in params.items() if key != "data_type"}
+    
+    def _build_result(self, data_type: str, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Wrap generated records in the tool's result structure."""
+        return {
+            "data": records,
+            "count": len(records),
+            "data_type": data_type,
+            "source": "Local Pokédex snapshot" if self.snapshot else "PokéAPI via direct requests",
+            "cached": False
+        }
+    
+    def _store_result(self, rfd: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """Store a fresh result in the IPFS cache (skipped when a snapshot is loaded)."""
+        if self.snapshot:
+            return
+        
+        cache_stored = self.ipfs_cache.store_cached(rfd, result)
+        if cache_stored:
+            result["cache_stored"] = True
+            logger.info("Result stored in IPFS cache")
+    
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
-        return self.ipfs_cache.get_cache_stats()
+        stats = self.ipfs_cache.get_cache_stats()
+        stats['memory_cache'] = self.cache.get_stats()
+        if self.response_store:
+            stats['response_store'] = self.response_store.get_stats()
+        if self.snapshot:
+            stats['snapshot'] = self.snapshot.get_stats()
+        if self.columns:
+            stats['columnar_store'] = self.columns.get_stats()
+        stats['record_cache'] = self.record_cache.get_stats()
+        stats['single_flight'] = {
+            'rfds': self.rfd_flight.get_stats(),
+            'requests': self.request_flight.get_stats()
+        }
+        return stats
     
     def clear_expired_cache(self) -> int:
         """Clear expired cache entries."""
@@ -244,213 +634,347 @@ class PokemonTool(MCPTool):
     def _generate_pokemon_data(self, num_records: int, pokemon_names: List[str], 
                               pokemon_ids: List[int], generation: Optional[int],
                               type_filter: Optional[str], include_stats: bool,
-                              include_abilities: bool, include_moves: bool) -> List[Dict[str, Any]]:
+                              include_abilities: bool, include_moves: bool,
+                              min_stats: Optional[Dict[str, int]] = None,
+                              schema_plan: Optional[ProjectionPlan] = None) -> List[Dict[str, Any]]:
         """Generate Pokémon data records."""
-        records = []
+        return list(self._iter_pokemon_data(num_records, pokemon_names, pokemon_ids, generation, type_filter,
+                                            include_stats, include_abilities, include_moves, min_stats,
+                                            schema_plan))
+    
+    def _iter_pokemon_data(self, num_records: int, pokemon_names: List[str], 
+                           pokemon_ids: List[int], generation: Optional[int],
+                           type_filter: Optional[str], include_stats: bool,
+                           include_abilities: bool, include_moves: bool,
+                           min_stats: Optional[Dict[str, int]] = None,
+                           schema_plan: Optional[ProjectionPlan] = None,
+                           chunk_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Yield Pokémon data records batch by batch.
         
-        # Determine which Pokémon to fetch
-        if pokemon_names:
-            # Use specific names
-            targets = pokemon_names[:num_records]
-        elif pokemon_ids:
-            # Use specific IDs
-            targets = pokemon_ids[:num_records]
-        else:
-            # Generate range of IDs (first 151 Pokémon by default, or based on generation)
-            if generation:
-                # Approximate ranges for generations
-                ranges = {
-                    1: (1, 151), 2: (152, 251), 3: (252, 386), 4: (387, 493),
-                    5: (494, 649), 6: (650, 721), 7: (722, 809), 8: (810, 905), 9: (906, 1010)
-                }
-                start, end = ranges.get(generation, (1, 151))
-                targets = list(range(start, min(start + num_records, end + 1)))
-            else:
-                targets = list(range(1, min(num_records + 1, 152)))
+        Candidates are fetched in batches until ``num_records`` records pass
+        the filters (and the schema, when ``schema_plan`` is given) or the
+        candidate list is exhausted. ``chunk_size`` caps the batch size so
+        the first records are yielded early.
+        """
+        generation_endpoint, type_endpoint = self._planning_endpoints(
+            pokemon_names, pokemon_ids, generation, type_filter, min_stats
+        )
+        generation_data = self._make_request(generation_endpoint) if generation_endpoint else None
+        type_data = self._make_request(type_endpoint) if type_endpoint else None
+        targets = self._plan_pokemon_targets(num_records, pokemon_names, pokemon_ids, generation,
+                                             type_filter, min_stats, generation_data, type_data)
+        flags, build = self._pokemon_builder(include_stats, include_abilities, include_moves)
+        scan = self._filters_after_fetch(type_filter, min_stats, type_data)
         
-        for target in targets:
-            try:
-                # Fetch Pokémon data
-                if isinstance(target, str):
-                    endpoint = f"pokemon/{target.lower()}"
-                else:
-                    endpoint = f"pokemon/{target}"
-                
-                pokemon_data = self._make_request(endpoint)
-                if not pokemon_data:
-                    continue
-                
-                # Apply type filter if specified
-                if type_filter:
-                    pokemon_types = [t["type"]["name"] for t in pokemon_data["types"]]
-                    if type_filter.lower() not in pokemon_types:
-                        continue
-                
-                # Build record
-                record = {
-                    "id": pokemon_data["id"],
-                    "name": pokemon_data["name"],
-                    "height": pokemon_data["height"],
-                    "weight": pokemon_data["weight"],
-                    "types": [t["type"]["name"] for t in pokemon_data["types"]],
-                    "base_experience": pokemon_data.get("base_experience")
-                }
-                
-                # Add stats if requested
-                if include_stats:
-                    record["stats"] = {
-                        stat["stat"]["name"]: stat["base_stat"] for stat in pokemon_data["stats"]
-                    }
-                
-                # Add abilities if requested
-                if include_abilities:
-                    record["abilities"] = [
-                        {
-                            "name": ability["ability"]["name"],
-                            "is_hidden": ability["is_hidden"],
-                            "slot": ability["slot"]
-                        } for ability in pokemon_data["abilities"]
-                    ]
-                
-                # Add moves if requested (limited to first 10 to keep size manageable)
-                if include_moves:
-                    record["moves"] = [
-                        {
-                            "name": move["move"]["name"],
-                            "learn_method": move["version_group_details"][0]["move_learn_method"]["name"] if move["version_group_details"] else "unknown"
-                        } for move in pokemon_data["moves"][:10]
-                    ]
-                
-                records.append(record)
-                
-            except Exception as e:
-                logger.warning(f"Failed to fetch Pokémon {target}: {e}")
-                continue
+        rejected = []
+        produced = 0
+        position = 0
+        while produced < num_records and position < len(targets):
+            batch = targets[position:position + self._batch_size(num_records - produced, scan, chunk_size)]
+            position += len(batch)
+            
+            endpoints = [self._pokemon_endpoint(target) for target in batch]
+            entries, missing = self._cached_entries(endpoints, flags)
+            
+            # Fetch only records not already built for an earlier RFD; responses come back in order
+            responses = self._fetch_many([endpoints[index] for index in missing])
+            self._fill_entries(endpoints, entries, missing, responses, flags, build)
+            for record in self._select_pokemon_records(entries, type_filter, min_stats, schema_plan, rejected):
+                if produced == num_records:
+                    break
+                produced += 1
+                yield record
+        self._report_schema_rejections(num_records, produced, rejected)
+    
+    def _filters_after_fetch(self, type_filter: Optional[str], min_stats: Optional[Dict[str, int]],
+                             type_data: Optional[Dict]) -> bool:
+        """Check whether planned candidates can still fail the type or stat filters once fetched.
         
-        return records
+        The columnar store plans only matching Pokémon, and a resolved type
+        member list satisfies the type filter; anything else is a scan.
+        """
+        if self.columns:
+            return False
+        type_unresolved = bool(type_filter) and not (type_data and "pokemon" in type_data)
+        return bool(min_stats) or type_unresolved
     
-    def _generate_move_data(self, num_records: int) -> List[Dict[str, Any]]:
-        """Generate move data records."""
-        records = []
+    def _batch_size(self, remaining: int, scan: bool, chunk_size: Optional[int] = None) -> int:
+        """Return how many candidates to fetch next for ``remaining`` records.
         
-        for move_id in range(1, min(num_records + 1, 101)):  # First 100 moves
+        Scans fetch at least ``max_concurrency`` candidates per batch, since
+        many of them are filtered out; planned candidates fetch just the
+        records still missing.
+        """
+        size = max(remaining, self.max_concurrency) if scan else remaining
+        return min(size, chunk_size) if chunk_size else size
+    
+    def _pokemon_endpoint(self, target: Any) -> str:
+        """Return the PokéAPI endpoint for a Pokémon name or ID."""
+        return f"pokemon/{target.lower()}" if isinstance(target, str) else f"pokemon/{target}"
+    
+    def _pokemon_builder(self, include_stats: bool, include_abilities: bool,
+                         include_moves: bool) -> Tuple[str, Callable[[Dict[str, Any]], Dict[str, Any]]]:
+        """Return the record cache flags and entry builder for a set of projection flags.
+        
+        Entries keep the Pokémon's types and stats next to the output record so
+        filters can be applied to cached records that omit them.
+        """
+        flags = f"s{int(include_stats)}a{int(include_abilities)}m{int(include_moves)}"
+        
+        def build(pokemon: Dict[str, Any]) -> Dict[str, Any]:
+            return {
+                "record": self._build_pokemon_record(pokemon, include_stats, include_abilities, include_moves),
+                "types": list(pokemon["types"]),
+                "stats": dict(pokemon["stats"])
+            }
+        
+        return flags, build
+    
+    def _cached_entries(self, endpoints: List[str], flags: str) -> Tuple[List[Optional[Dict]], List[int]]:
+        """Look up record cache entries for endpoints built with ``flags``.
+        
+        Returns:
+            Entries aligned with ``endpoints`` (None for misses) and the indices of the misses
+        """
+        entries = self.record_cache.get_many(
+            [record_key(endpoint, flags, self.data_version) for endpoint in endpoints]
+        )
+        return entries, [index for index, entry in enumerate(entries) if entry is None]
+    
+    def _fill_entries(self, endpoints: List[str], entries: List[Optional[Dict]], missing: List[int],
+                      responses: List[Optional[Dict]], flags: str,
+                      build: Callable[[Dict[str, Any]], Dict[str, Any]]) -> None:
+        """Build entries for fetched responses in place and add them to the record cache."""
+        for index, data in zip(missing, responses):
             try:
-                move_data = self._make_request(f"move/{move_id}")
-                if not move_data:
+                if not data:
                     continue
-                    
-                record = {
-                    "id": move_data["id"],
-                    "name": move_data["name"],
-                    "power": move_data.get("power"),
-                    "pp": move_data.get("pp"),
-                    "accuracy": move_data.get("accuracy"),
-                    "priority": move_data.get("priority"),
-                    "type": move_data["type"]["name"] if move_data.get("type") else None,
-                    "damage_class": move_data["damage_class"]["name"] if move_data.get("damage_class") else None,
-                    "effect_chance": move_data.get("effect_chance")
-                }
-                records.append(record)
+                entry = build(data)
             except Exception as e:
-                logger.warning(f"Failed to fetch move {move_id}: {e}")
+                logger.warning(f"Failed to fetch {endpoints[index]}: {e}")
                 continue
-        
-        return records
+            entries[index] = entry
+            self.record_cache.set(record_key(endpoints[index], flags, self.data_version), entry)
     
-    def _generate_ability_data(self, num_records: int) -> List[Dict[str, Any]]:
-        """Generate ability data records."""
+    def _select_pokemon_records(self, entries: List[Optional[Dict]], type_filter: Optional[str],
+                                min_stats: Optional[Dict[str, int]],
+                                schema_plan: Optional[ProjectionPlan] = None,
+                                rejected: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Apply the type and stat filters to entries and return their output records.
+        
+        With a ``schema_plan`` records are projected to the schema's fields
+        and records that do not match it are dropped; the reason for each
+        is appended to ``rejected`` when given.
+        """
         records = []
         
-        for ability_id in range(1, min(num_records + 1, 101)):  # First 100 abilities
-            try:
-                ability_data = self._make_request(f"ability/{ability_id}")
-                if not ability_data:
-                    continue
-                    
-                record = {
-                    "id": ability_data["id"],
-                    "name": ability_data["name"],
-                    "is_main_series": ability_data.get("is_main_series"),
-                    "generation": ability_data["generation"]["name"] if ability_data.get("generation") else None,
-                    "effect": ability_data["effect_entries"][0]["short_effect"] if ability_data.get("effect_entries") else None
-                }
-                records.append(record)
-            except Exception as e:
-                logger.warning(f"Failed to fetch ability {ability_id}: {e}")
+        for entry in entries:
+            if entry is None:
+                continue
+            
+            # Apply type filter if specified
+            if type_filter and type_filter.lower() not in entry["types"]:
+                continue
+            
+            # Apply minimum stat thresholds if specified
+            if min_stats and any(
+                entry["stats"].get(stat, 0) < minimum for stat, minimum in min_stats.items()
+            ):
+                continue
+            
+            if schema_plan is None:
+                records.append(dict(entry["record"]))
+                continue
+            
+            record = schema_plan.project(entry["record"])
+            error = schema_plan.validate(record)
+            if error:
+                logger.warning(f"Dropping {record.get('name', 'record')} that does not match the RFD schema: {error}")
+                if rejected is not None:
+                    rejected.append(error)
                 continue
+            records.append(record)
         
         return records
     
-    def _generate_type_data(self) -> List[Dict[str, Any]]:
-        """Generate type effectiveness data."""
-        records = []
+    def _report_schema_rejections(self, num_records: int, produced: int, rejected: List[str]) -> None:
+        """Surface a dataset cut short by records that failed the RFD schema.
         
-        # Get all types (there are 18 main types)
-        type_names = ['normal', 'fire', 'water', 'electric', 'grass', 'ice', 'fighting', 
-                     'poison', 'ground', 'flying', 'psychic', 'bug', 'rock', 'ghost', 
-                     'dragon', 'dark', 'steel', 'fairy']
+        Raises:
+            ValueError: If the schema rejected every candidate record
+        """
+        if not rejected or produced >= num_records:
+            return
+        if not produced:
+            raise ValueError(f"No records match the RFD schema ({len(rejected)} rejected, first: {rejected[0]})")
+        logger.warning(
+            f"Returning {produced} of {num_records} requested records: "
+            f"{len(rejected)} did not match the RFD schema (first: {rejected[0]})"
+        )
+    
+    def _planning_endpoints(self, pokemon_names: List[str], pokemon_ids: List[int],
+                            generation: Optional[int], type_filter: Optional[str],
+                            min_stats: Optional[Dict[str, int]]) -> Tuple[Optional[str], Optional[str]]:
+        """Return the generation and type endpoints target planning needs resolved.
         
-        for type_name in type_names:
-            try:
-                type_data = self._make_request(f"type/{type_name}")
-                if not type_data:
-                    continue
-                    
-                record = {
-                    "id": type_data["id"],
-                    "name": type_data["name"],
-                    "damage_relations": {
-                        "double_damage_to": [t["name"] for t in type_data["damage_relations"]["double_damage_to"]],
-                        "half_damage_to": [t["name"] for t in type_data["damage_relations"]["half_damage_to"]],
-                        "no_damage_to": [t["name"] for t in type_data["damage_relations"]["no_damage_to"]],
-                        "double_damage_from": [t["name"] for t in type_data["damage_relations"]["double_damage_from"]],
-                        "half_damage_from": [t["name"] for t in type_data["damage_relations"]["half_damage_from"]],
-                        "no_damage_from": [t["name"] for t in type_data["damage_relations"]["no_damage_from"]]
-                    }
-                }
-                records.append(record)
-            except Exception as e:
-                logger.warning(f"Failed to fetch type {type_name}: {e}")
-                continue
+        Returns:
+            ``(generation_endpoint, type_endpoint)``; either may be None
+        """
+        if pokemon_names or pokemon_ids:
+            return None, None
+        if self.columns and (generation or type_filter or min_stats):
+            return None, None
         
-        return records
+        generation_endpoint = None
+        if generation and generation not in self.generation_index:
+            generation_endpoint = f"generation/{generation}"
+        type_endpoint = f"type/{type_filter.lower()}" if type_filter else None
+        return generation_endpoint, type_endpoint
     
-    def _generate_evolution_data(self, num_records: int) -> List[Dict[str, Any]]:
-        """Generate evolution chain data."""
-        records = []
+    def _plan_pokemon_targets(self, num_records: int, pokemon_names: List[str],
+                              pokemon_ids: List[int], generation: Optional[int],
+                              type_filter: Optional[str], min_stats: Optional[Dict[str, int]],
+                              generation_data: Optional[Dict] = None,
+                              type_data: Optional[Dict] = None) -> List[Any]:
+        """Determine which Pokémon to fetch, in priority order.
         
-        for chain_id in range(1, min(num_records + 1, 51)):  # First 50 evolution chains
-            try:
-                chain_data = self._make_request(f"evolution-chain/{chain_id}")
-                if not chain_data:
-                    continue
-                    
-                record = {
-                    "id": chain_data["id"],
-                    "baby_trigger_item": chain_data["baby_trigger_item"]["name"] if chain_data.get("baby_trigger_item") else None,
-                    "chain": self._parse_evolution_chain(chain_data["chain"])
-                }
-                records.append(record)
-            except Exception as e:
-                logger.warning(f"Failed to fetch evolution chain {chain_id}: {e}")
-                continue
+        Explicit names or IDs are used as given. Otherwise filters are resolved
+        up front (via the columnar store or the type's member list) so that
+        only candidates likely to match are fetched. ``generation_data`` and
+        ``type_data`` are the projected records for the endpoints returned by
+        ``_planning_endpoints``.
+        """
+        if pokemon_names:
+            # Use specific names
+            return pokemon_names[:num_records]
+        if pokemon_ids:
+            # Use specific IDs
+            return pokemon_ids[:num_records]
         
-        return records
+        if self.columns and (generation or type_filter or min_stats):
+            # Scan the columnar store so only matching Pokémon are fetched
+            return self.columns.query(generation, type_filter, min_stats)
+        
+        if generation:
+            candidates = self._generation_members(generation, generation_data)
+        else:
+            # First 151 Pokémon by default
+            candidates = list(range(1, 152))
+        
+        if type_filter:
+            members = self._type_members(type_filter, type_data)
+            if members is not None:
+                if generation:
+                    in_generation = set(candidates)
+                    return [pokemon_id for pokemon_id in members if pokemon_id in in_generation]
+                return members
+        
+        if type_filter or min_stats:
+            # Filters are applied after fetching, so keep scanning every candidate
+            return candidates
+        return candidates[:num_records]
+    
+    def _generation_members(self, generation: int, generation_data: Optional[Dict]) -> List[int]:
+        """Return the sorted IDs of Pokémon introduced in a generation.
+        
+        Membership comes from ``generation/{n}`` (served from the snapshot or
+        the persistent response store when available) and is indexed in memory
+        after the first lookup. Falls back to the approximate ID ranges when
+        the endpoint cannot be reached.
+        """
+        members = self.generation_index.get(generation)
+        if members is not None:
+            return members
+        
+        if generation_data and generation_data.get("pokemon_species"):
+            members = list(generation_data["pokemon_species"])
+            self.generation_index[generation] = members
+            return members
+        
+        logger.warning(f"Could not resolve generation {generation} members, using approximate ID range")
+        start, end = GENERATION_RANGES.get(generation, (1, 151))
+        return list(range(start, end + 1))
+    
+    def _type_members(self, type_name: str, type_data: Optional[Dict]) -> Optional[List[int]]:
+        """Return the sorted National Dex IDs of Pokémon with the given type.
+        
+        The member list comes from the projected ``type/{name}`` record, which
+        is cached with the rest of the responses. Alternate forms (IDs above
+        10000) are skipped.
+        """
+        if not type_data or "pokemon" not in type_data:
+            logger.warning(f"Could not resolve members of type {type_name}, filtering after fetch")
+            return None
+        return sorted(pokemon_id for pokemon_id in type_data["pokemon"] if pokemon_id < 10000)
     
-    def _parse_evolution_chain(self, chain_link) -> Dict[str, Any]:
-        """Parse an evolution chain link recursively."""
-        result = {
-            "species": chain_link["species"]["name"],
-            "evolves_to": []
+    def _build_pokemon_record(self, pokemon: Dict[str, Any], include_stats: bool,
+                              include_abilities: bool, include_moves: bool) -> Dict[str, Any]:
+        """Build an output record from a projected Pokémon record."""
+        record = {
+            "id": pokemon["id"],
+            "name": pokemon["name"],
+            "height": pokemon["height"],
+            "weight": pokemon["weight"],
+            "types": list(pokemon["types"]),
+            "base_experience": pokemon.get("base_experience")
         }
         
-        for evolution in chain_link["evolves_to"]:
-            evolution_details = {
-                "species": evolution["species"]["name"],
-                "min_level": evolution["evolution_details"][0]["min_level"] if evolution["evolution_details"] else None,
-                "trigger": evolution["evolution_details"][0]["trigger"]["name"] if evolution["evolution_details"] else None,
-                "evolves_to": self._parse_evolution_chain(evolution)["evolves_to"] if evolution["evolves_to"] else []
-            }
-            result["evolves_to"].append(evolution_details)
+        # Add stats if requested
+        if include_stats:
+            record["stats"] = dict(pokemon["stats"])
+        
+        # Add abilities if requested
+        if include_abilities:
+            record["abilities"] = [dict(ability) for ability in pokemon["abilities"]]
+        
+        # Add moves if requested (projection keeps only the first few to keep size manageable)
+        if include_moves:
+            record["moves"] = [dict(move) for move in pokemon["moves"]]
+        
+        return record
+    
+    def _resource_targets(self, data_type: str, num_records: int) -> Tuple[str, List[Any]]:
+        """Return the PokéAPI resource and identifiers to fetch for a non-Pokémon data type."""
+        resource = RESOURCE_DATA_TYPES[data_type]
+        if data_type == "types":
+            # Get all types (there are 18 main types)
+            return resource, list(TYPE_NAMES)
+        if data_type == "evolution":
+            return resource, list(range(1, min(num_records + 1, 51)))  # First 50 evolution chains
+        return resource, list(range(1, min(num_records + 1, 101)))  # First 100 moves / abilities
+    
+    def _generate_resource_data(self, data_type: str, num_records: int) -> List[Dict[str, Any]]:
+        """Generate move, ability, type or evolution chain records."""
+        return list(self._iter_resource_data(data_type, num_records))
+    
+    def _iter_resource_data(self, data_type: str, num_records: int,
+                            chunk_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Yield move, ability, type or evolution chain records, ``chunk_size`` targets at a time."""
+        resource, targets = self._resource_targets(data_type, num_records)
+        build = self._resource_builder(resource)
+        step = chunk_size or len(targets) or 1
+        for position in range(0, len(targets), step):
+            endpoints = [f"{resource}/{target}" for target in targets[position:position + step]]
+            entries, missing = self._cached_entries(endpoints, "")
+            responses = self._fetch_many([endpoints[index] for index in missing])
+            self._fill_entries(endpoints, entries, missing, responses, "", build)
+            for entry in entries:
+                if entry is not None:
+                    yield dict(entry["record"])
+    
+    def _resource_builder(self, resource: str) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        """Return the record cache entry builder for a move, ability, type or evolution chain."""
+        def build(data: Dict[str, Any]) -> Dict[str, Any]:
+            if resource == "type":
+                record = {
+                    "id": data["id"],
+                    "name": data["name"],
+                    "damage_relations": {
+                        relation: list(names) for relation, names in data["damage_relations"].items()
+                    }
+                }
+            else:
+                record = dict(data)
+            return {"record": record}
         
-        return result 
\ No newline at end of file
+        return build
@@ -0,0 +1,169 @@
+"""Projection of raw PokéAPI responses into compact canonical records.
+
+Full PokéAPI documents carry large arrays (``moves``, ``game_indices``,
+``sprites``, localized text) that the record builders never read. Each
+projector keeps only the fields the tool emits so that caches and builders
+work on small objects.
+"""
+
+from typing import Dict, Any, Callable, Optional
+
+# Number of moves kept per projected Pokémon
+MAX_PROJECTED_MOVES = 10
+
+# Bumped whenever the projected record layout changes
+PROJECTION_VERSION = 1
+
+
+def id_from_url(url: Optional[str]) -> Optional[int]:
+    """Extract the numeric resource ID from a PokéAPI resource URL."""
+    if not url:
+        return None
+    try:
+        return int(url.rstrip("/").rsplit("/", 1)[-1])
+    except ValueError:
+        return None
+
+
+def _name(resource: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Return the ``name`` of a named API resource, or None if absent."""
+    return resource["name"] if resource else None
+
+
+def project_pokemon(raw: Dict[str, Any], max_moves: int = MAX_PROJECTED_MOVES) -> Dict[str, Any]:
+    """Reduce a ``pokemon/{id}`` response to stats, types, abilities and moves."""
+    return {
+        "id": raw["id"],
+        "name": raw["name"],
+        "height": raw["height"],
+        "weight": raw["weight"],
+        "base_experience": raw.get("base_experience"),
+        "types": [t["type"]["name"] for t in raw["types"]],
+        "stats": {stat["stat"]["name"]: stat["base_stat"] for stat in raw["stats"]},
+        "abilities": [
+            {
+                "name": ability["ability"]["name"],
+                "is_hidden": ability["is_hidden"],
+                "slot": ability["slot"]
+            } for ability in raw["abilities"]
+        ],
+        "moves": [
+            {
+                "name": move["move"]["name"],
+                "learn_method": move["version_group_details"][0]["move_learn_method"]["name"] if move["version_group_details"] else "unknown"
+            } for move in raw["moves"][:max_moves]
+        ]
+    }
+
+
+def project_move(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a ``move/{id}`` response to its battle attributes."""
+    return {
+        "id": raw["id"],
+        "name": raw["name"],
+        "power": raw.get("power"),
+        "pp": raw.get("pp"),
+        "accuracy": raw.get("accuracy"),
+        "priority": raw.get("priority"),
+        "type": _name(raw.get("type")),
+        "damage_class": _name(raw.get("damage_class")),
+        "effect_chance": raw.get("effect_chance")
+    }
+
+
+def project_ability(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce an ``ability/{id}`` response to its description fields."""
+    return {
+        "id": raw["id"],
+        "name": raw["name"],
+        "is_main_series": raw.get("is_main_series"),
+        "generation": _name(raw.get("generation")),
+        "effect": raw["effect_entries"][0]["short_effect"] if raw.get("effect_entries") else None
+    }
+
+
+def project_type(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a ``type/{name}`` response to damage relations and member IDs."""
+    relations = raw["damage_relations"]
+    return {
+        "id": raw["id"],
+        "name": raw["name"],
+        "damage_relations": {
+            relation: [t["name"] for t in relations[relation]]
+            for relation in ("double_damage_to", "half_damage_to", "no_damage_to",
+                             "double_damage_from", "half_damage_from", "no_damage_from")
+        },
+        "pokemon": [
+            pid for pid in (id_from_url(member["pokemon"]["url"]) for member in raw.get("pokemon", []))
+            if pid is not None
+        ]
+    }
+
+
+def parse_evolution_chain(chain_link: Dict[str, Any]) -> Dict[str, Any]:
+    """Parse an evolution chain link recursively."""
+    result = {
+        "species": chain_link["species"]["name"],
+        "evolves_to": []
+    }
+
+    for evolution in chain_link["evolves_to"]:
+        evolution_details = {
+            "species": evolution["species"]["name"],
+            "min_level": evolution["evolution_details"][0]["min_level"] if evolution["evolution_details"] else None,
+            "trigger": evolution["evolution_details"][0]["trigger"]["name"] if evolution["evolution_details"] else None,
+            "evolves_to": parse_evolution_chain(evolution)["evolves_to"] if evolution["evolves_to"] else []
+        }
+        result["evolves_to"].append(evolution_details)
+
+    return result
+
+
+def project_evolution_chain(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce an ``evolution-chain/{id}`` response to its parsed tree."""
+    return {
+        "id": raw["id"],
+        "baby_trigger_item": _name(raw.get("baby_trigger_item")),
+        "chain": parse_evolution_chain(raw["chain"])
+    }
+
+
+def project_generation(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a ``generation/{n}`` response to its member species IDs."""
+    return {
+        "id": raw["id"],
+        "name": raw["name"],
+        "pokemon_species": sorted(
+            sid for sid in (id_from_url(species["url"]) for species in raw.get("pokemon_species", []))
+            if sid is not None
+        )
+    }
+
+
+# Projector per endpoint resource; endpoints not listed are passed through
+PROJECTORS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "pokemon": project_pokemon,
+    "move": project_move,
+    "ability": project_ability,
+    "type": project_type,
+    "evolution-chain": project_evolution_chain,
+    "generation": project_generation
+}
+
+
+def project(endpoint: str, raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Project a raw response according to the resource in ``endpoint``.
+
+    Args:
+        endpoint: PokéAPI endpoint such as ``pokemon/25``
+        raw: Decoded response document
+
+    Returns:
+        The compact record, or ``raw`` unchanged for unknown resources
+    """
+    resource, _, identifier = endpoint.partition("/")
+    projector = PROJECTORS.get(resource)
+    # List endpoints (no identifier or with a query string) are never projected
+    if projector is None or not identifier or "?" in identifier:
+        return raw
+    return projector(raw)
@@ -0,0 +1,74 @@
+"""Thread-safe token-bucket rate limiter for outbound API calls."""
+
+import asyncio
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """Token-bucket rate limiter shared between worker threads.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    Each request consumes one token; callers block only when the bucket is
+    empty, so bursts up to ``capacity`` go out immediately while the
+    sustained rate stays bounded.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[int] = None):
+        """Initialize the token bucket.
+
+        Args:
+            rate: Sustained number of tokens added per second
+            capacity: Maximum burst size (defaults to one second of tokens)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1, int(rate)))
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last refill (lock must be held)."""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Take tokens without blocking.
+
+        Returns:
+            True if the tokens were available and consumed
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1) -> None:
+        """Block until the requested number of tokens can be consumed."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1) -> None:
+        """Wait until the requested tokens can be consumed without blocking the event loop."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            await asyncio.sleep(wait)
@@ -0,0 +1,112 @@
+"""Record-level cache of built output records, shared across overlapping RFDs."""
+
+import logging
+import os
+import time
+from typing import Dict, Any, List, Optional
+
+from . import codec
+from .memory_cache import LRUCache
+from .response_store import ResponseStore
+
+logger = logging.getLogger('RecordCache')
+
+DEFAULT_RECORD_CACHE_PATH = os.path.join("data", "cache", "records.db")
+
+
+def record_key(entity: str, flags: str, data_version: str) -> str:
+    """Build the cache key for one entity built with the given projection flags.
+
+    Args:
+        entity: PokéAPI endpoint of the entity, e.g. ``pokemon/25``
+        flags: Projection flags the record was built with, e.g. ``s1a1m0``
+        data_version: Version of the underlying data and projection
+    """
+    return f"{data_version}|{entity}|{flags}"
+
+
+class RecordCache:
+    """Two-tier (memory, then SQLite) cache of per-entity output records.
+
+    The RFD-level IPFS cache only helps when a whole RFD repeats. This
+    cache holds each built record on its own, so an RFD that overlaps an
+    earlier one (say ``num_records=20`` after ``num_records=10``) only
+    fetches and builds the records it does not share.
+    """
+
+    def __init__(self, memory_bytes: int = 32 * 1024 * 1024, store: Optional[ResponseStore] = None,
+                 max_age_seconds: int = 7 * 24 * 3600):
+        """Initialize the cache.
+
+        Args:
+            memory_bytes: Memory budget for the in-memory tier
+            store: Optional persistent tier
+            max_age_seconds: Age after which persisted records are ignored
+        """
+        self.memory = LRUCache(max_bytes=memory_bytes)
+        self.store = store
+        self.max_age_seconds = max_age_seconds
+        self.disk_hits = 0
+
+    @classmethod
+    def from_env(cls) -> "RecordCache":
+        """Create a cache from RECORD_CACHE_* environment variables.
+
+        An empty RECORD_CACHE_PATH keeps records in memory only.
+        """
+        path = os.getenv("RECORD_CACHE_PATH", DEFAULT_RECORD_CACHE_PATH)
+        store = None
+        if path:
+            try:
+                store = ResponseStore(
+                    path,
+                    max_bytes=int(float(os.getenv("RECORD_CACHE_MAX_MB", 128)) * 1024 * 1024),
+                    max_age_seconds=0
+                )
+            except Exception as e:
+                logger.warning(f"Record cache disk tier disabled, could not open {path}: {e}")
+        return cls(
+            memory_bytes=int(float(os.getenv("RECORD_CACHE_MEMORY_MB", 32)) * 1024 * 1024),
+            store=store,
+            max_age_seconds=int(float(os.getenv("RECORD_CACHE_MAX_AGE_HOURS", 168)) * 3600)
+        )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached entry in memory, then on disk."""
+        entry = self.memory.get(key)
+        if entry is not None:
+            return entry
+
+        if self.store:
+            stored = self.store.get(key)
+            if stored is not None and int(time.time()) - stored.fetched_at <= self.max_age_seconds:
+                try:
+                    entry = codec.loads(stored.body)
+                except ValueError:
+                    return None
+                self.memory.set(key, entry, size=len(stored.body))
+                self.disk_hits += 1
+                return entry
+        return None
+
+    def get_many(self, keys: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Look up several entries, preserving order (None for misses)."""
+        return [self.get(key) for key in keys]
+
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        """Cache an entry in both tiers."""
+        body = codec.dumpb(entry)
+        self.memory.set(key, entry, size=len(body))
+        if self.store:
+            try:
+                self.store.put(key, body)
+            except Exception as e:
+                logger.warning(f"Failed to persist record {key}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            'memory': self.memory.get_stats(),
+            'disk_hits': self.disk_hits,
+            'disk': self.store.get_stats() if self.store else None
+        }
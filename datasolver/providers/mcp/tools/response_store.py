@@ -0,0 +1,222 @@
+"""Persistent on-disk store for PokéAPI HTTP responses backed by SQLite."""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger('ResponseStore')
+
+
+@dataclass
+class StoredResponse:
+    """A response body plus the validators needed to revalidate it."""
+    endpoint: str
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: int
+
+    def is_fresh(self, max_age_seconds: int) -> bool:
+        """Check whether the response can be served without revalidation."""
+        return int(time.time()) - self.fetched_at <= max_age_seconds
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for revalidation."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseStore:
+    """Size-bounded SQLite store of raw API responses keyed by endpoint.
+
+    Entries survive restarts so a warm node answers repeat lookups from disk.
+    Entries older than ``max_age_seconds`` are revalidated with their ETag /
+    Last-Modified validators, and the least recently used entries are evicted
+    once the stored bodies exceed ``max_bytes``. Reads only note their
+    access time in memory; the times are written back in one batch every
+    ``touch_interval`` seconds (or ``touch_batch`` reads), and before an
+    eviction, so a lookup does not cost a disk write.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024,
+                 max_age_seconds: int = 7 * 24 * 3600, touch_interval: float = 60,
+                 touch_batch: int = 1000):
+        """Open (or create) the response store.
+
+        Args:
+            path: SQLite database file path
+            max_bytes: Upper bound on the total size of stored bodies
+            max_age_seconds: Age after which entries must be revalidated
+            touch_interval: Longest time, in seconds, read access times stay in memory
+            touch_batch: Buffered access times that trigger an early write
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.touch_interval = touch_interval
+        self.touch_batch = touch_batch
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._accessed: Dict[str, int] = {}  # endpoint -> last read time not yet written
+        self._accessed_flushed_at = time.monotonic()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                endpoint TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at INTEGER NOT NULL,
+                accessed_at INTEGER NOT NULL,
+                size INTEGER NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        logger.info(f"Opened response store at {path} ({self._total_bytes} bytes)")
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseStore"]:
+        """Create a store from POKEAPI_STORE_* environment variables.
+
+        Returns:
+            The store, or None if POKEAPI_STORE_PATH is set to an empty string
+            or the database cannot be opened
+        """
+        path = os.getenv("POKEAPI_STORE_PATH", os.path.join("data", "cache", "pokeapi_responses.db"))
+        if not path:
+            return None
+        try:
+            return cls(
+                path,
+                max_bytes=int(float(os.getenv("POKEAPI_STORE_MAX_MB", 256)) * 1024 * 1024),
+                max_age_seconds=int(float(os.getenv("POKEAPI_STORE_MAX_AGE_HOURS", 168)) * 3600)
+            )
+        except Exception as e:
+            logger.warning(f"Response store disabled, could not open {path}: {e}")
+            return None
+
+    def get(self, endpoint: str) -> Optional[StoredResponse]:
+        """Look up a stored response and mark it as recently used."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM responses WHERE endpoint = ?",
+                (endpoint,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._accessed[endpoint] = int(time.time())
+            if (len(self._accessed) >= self.touch_batch
+                    or time.monotonic() - self._accessed_flushed_at >= self.touch_interval):
+                self._flush_accessed()
+                self._conn.commit()
+        return StoredResponse(endpoint, bytes(row[0]), row[1], row[2], row[3])
+
+    def _flush_accessed(self) -> None:
+        """Write buffered read access times without committing (lock must be held)."""
+        if self._accessed:
+            # MAX keeps a newer time written by put() or touch() in the meantime
+            self._conn.executemany(
+                "UPDATE responses SET accessed_at = MAX(accessed_at, ?) WHERE endpoint = ?",
+                [(accessed_at, endpoint) for endpoint, accessed_at in self._accessed.items()]
+            )
+            self._accessed.clear()
+        self._accessed_flushed_at = time.monotonic()
+
+    def put(self, endpoint: str, body: bytes, etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> None:
+        """Store (or replace) a response body and its validators."""
+        now = int(time.time())
+        size = len(body)
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT size FROM responses WHERE endpoint = ?", (endpoint,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(endpoint, body, etag, last_modified, fetched_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (endpoint, sqlite3.Binary(body), etag, last_modified, now, now, size)
+            )
+            self._total_bytes += size - (previous[0] if previous else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def touch(self, endpoint: str) -> None:
+        """Mark an entry as freshly validated after a 304 Not Modified."""
+        now = int(time.time())
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE endpoint = ?",
+                (now, now, endpoint)
+            )
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until under 90% of the budget (lock must be held)."""
+        self._flush_accessed()
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute(
+            "SELECT endpoint, size FROM responses ORDER BY accessed_at ASC"
+        ).fetchall()
+        evicted = []
+        for endpoint, size in rows:
+            if self._total_bytes <= target:
+                break
+            evicted.append((endpoint,))
+            self._total_bytes -= size
+        self._conn.executemany("DELETE FROM responses WHERE endpoint = ?", evicted)
+        self.evictions += len(evicted)
+        logger.debug(f"Evicted {len(evicted)} responses from store")
+
+    def clear(self) -> int:
+        """Remove all stored responses and return how many were removed."""
+        with self._lock:
+            count = self._conn.execute("DELETE FROM responses").rowcount
+            self._conn.commit()
+            self._accessed.clear()
+            self._total_bytes = 0
+        return count
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store statistics."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {
+            'path': self.path,
+            'entries': entries,
+            'size_bytes': self._total_bytes,
+            'max_bytes': self.max_bytes,
+            'max_age_seconds': self.max_age_seconds,
+            'evictions': self.evictions
+        }
+
+    def flush(self) -> None:
+        """Write buffered read access times to disk."""
+        with self._lock:
+            self._flush_accessed()
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Write buffered access times and close the underlying database connection."""
+        with self._lock:
+            self._flush_accessed()
+            self._conn.commit()
+            self._conn.close()
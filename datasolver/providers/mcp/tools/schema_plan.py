@@ -0,0 +1,154 @@
+"""Compile an RFD's JSON schema into a projection plan for Pokémon records."""
+
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger('SchemaPlan')
+
+# Fields a Pokémon record can carry, in output order
+POKEMON_FIELDS = ("id", "name", "height", "weight", "types", "base_experience", "stats", "abilities", "moves")
+
+# Fields that are only built (and cached) when asked for
+OPTIONAL_SECTIONS = ("stats", "abilities", "moves")
+
+JSON_TYPES = {
+    "integer": (int,),
+    "number": (int, float),
+    "string": (str,),
+    "boolean": (bool,),
+    "array": (list,),
+    "object": (dict,),
+    "null": (type(None),)
+}
+
+
+def _type_names(spec: Any) -> Tuple[str, ...]:
+    """Return the known JSON types named by a schema's ``type`` (empty means any)."""
+    if isinstance(spec, str):
+        spec = [spec]
+    if not isinstance(spec, list):
+        return ()
+    return tuple(name for name in spec if name in JSON_TYPES)
+
+
+def _matches(value: Any, type_names: Tuple[str, ...]) -> bool:
+    """Check a value against JSON types (booleans are not integers or numbers)."""
+    if not type_names:
+        return True
+    for name in type_names:
+        if isinstance(value, bool) and name in ("integer", "number"):
+            continue
+        if isinstance(value, JSON_TYPES[name]):
+            return True
+    return False
+
+
+class ProjectionPlan:
+    """Which fields to build for an RFD and how to validate the records.
+
+    Compiled from an RFD's ``schema`` wherever the RFD is parsed (the
+    cache fingerprint and generation each compile their own; it is a few
+    dict lookups). Optional sections the schema does not list are neither
+    built nor cached, other unlisted fields are dropped from the output,
+    and every record is checked against the listed types and required
+    fields in a single pass.
+    """
+
+    def __init__(self, fields: List[str], required: List[str], types: Dict[str, Tuple[str, ...]],
+                 item_types: Dict[str, Tuple[str, ...]]):
+        """Create a plan.
+
+        Args:
+            fields: Output fields, in output order
+            required: Fields every record must carry
+            types: Allowed JSON types per field (empty means any)
+            item_types: Allowed JSON types of array items per field
+        """
+        self.fields = fields
+        self.required = required
+        self.types = types
+        self.item_types = item_types
+        self._required = set(required)
+
+    def wants(self, field: str) -> bool:
+        """Check whether the schema asks for a field."""
+        return field in self.types
+
+    def excluded_required(self, rfd: Dict[str, Any]) -> List[str]:
+        """Return required optional sections that the RFD turns off with ``include_*: false``."""
+        return [
+            section for section in OPTIONAL_SECTIONS
+            if section in self._required and rfd.get(f"include_{section}") is False
+        ]
+
+    def project(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep only the planned fields of a record."""
+        return {field: record[field] for field in self.fields if field in record}
+
+    def validate(self, record: Dict[str, Any]) -> Optional[str]:
+        """Check a projected record in one pass.
+
+        PokéAPI leaves some fields null (``base_experience`` for many forms),
+        so null is accepted for fields the schema does not require.
+
+        Returns:
+            A description of the first problem found, or None if the record is valid
+        """
+        for field in self.fields:
+            if field not in record:
+                if field in self._required:
+                    return f"missing required field '{field}'"
+                continue
+            value = record[field]
+            if value is None and field not in self._required:
+                continue
+            if not _matches(value, self.types[field]):
+                return f"field '{field}' is not of type {'/'.join(self.types[field])}"
+            item_types = self.item_types.get(field)
+            if item_types and isinstance(value, list) and not all(_matches(item, item_types) for item in value):
+                return f"items of field '{field}' are not of type {'/'.join(item_types)}"
+        return None
+
+    def signature(self) -> Dict[str, Any]:
+        """Return a stable description of the plan for cache keys."""
+        return {
+            "fields": list(self.fields),
+            "required": list(self.required),
+            "types": {field: list(types) for field, types in self.types.items() if types},
+            "item_types": {field: list(types) for field, types in self.item_types.items()}
+        }
+
+
+def compile_schema(schema: Any) -> Optional[ProjectionPlan]:
+    """Compile an RFD schema (``{"properties": ..., "required": [...]}``) into a plan.
+
+    Properties a Pokémon record cannot carry are ignored with a warning.
+
+    Returns:
+        The plan, or None if the schema lists no Pokémon fields (the
+        ``include_*`` flags then decide on their own)
+    """
+    if not isinstance(schema, dict) or not isinstance(schema.get("properties"), dict):
+        return None
+    properties = schema["properties"]
+
+    unknown = [name for name in properties if name not in POKEMON_FIELDS]
+    if unknown:
+        logger.debug(f"Ignoring schema properties the Pokémon tool cannot produce: {', '.join(unknown)}")
+
+    fields = [name for name in POKEMON_FIELDS if name in properties]
+    if not fields:
+        logger.debug("Schema lists no Pokémon fields, ignoring it")
+        return None
+
+    types = {}
+    item_types = {}
+    for name in fields:
+        spec = properties[name] if isinstance(properties[name], dict) else {}
+        types[name] = _type_names(spec.get("type"))
+        items = spec.get("items")
+        if isinstance(items, dict) and _type_names(items.get("type")):
+            item_types[name] = _type_names(items.get("type"))
+
+    required = [name for name in schema.get("required") or [] if name in types]
+    return ProjectionPlan(fields, required, types, item_types)
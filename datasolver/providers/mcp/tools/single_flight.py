@@ -0,0 +1,143 @@
+"""Single-flight call coalescing: concurrent callers for one key share one execution."""
+
+import asyncio
+import threading
+from typing import Dict, Any, Awaitable, Callable, Optional, Tuple
+
+
+class _Call:
+    """An in-flight execution that followers wait on."""
+
+    def __init__(self):
+        """Create an unfinished call."""
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Thread-safe coalescing of concurrent calls that share a key.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is running wait for it and receive the same result or
+    exception. Nothing is cached once the call finishes.
+    """
+
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run ``fn`` unless a call for ``key`` is already in flight.
+
+        Returns:
+            ``(result, shared)`` where ``shared`` is True if the result came
+            from another caller's execution
+        """
+        call, leader = self.begin(key)
+        if not leader:
+            return self.wait(call), True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self.finish(key, call, error=e)
+            raise
+        self.finish(key, call, result=result)
+        return result, False
+
+    def begin(self, key: str) -> Tuple[_Call, bool]:
+        """Join the call in flight for ``key``, or start one and lead it.
+
+        For work that cannot be wrapped in one function (such as a
+        generator); the leader must call ``finish`` exactly once.
+
+        Returns:
+            ``(call, leader)`` where ``leader`` is True if the caller must run the work
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                return call, True
+            self.coalesced += 1
+            return call, False
+
+    def wait(self, call: _Call) -> Any:
+        """Wait for a joined call and return its result (or raise its error)."""
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def finish(self, key: str, call: _Call, result: Any = None,
+               error: Optional[BaseException] = None) -> None:
+        """Publish the leader's result or error to followers and release the key."""
+        call.result = result
+        call.error = error
+        with self._lock:
+            del self._calls[key]
+        call.done.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get execution and coalescing counters."""
+        with self._lock:
+            in_flight = len(self._calls)
+        return {
+            'executions': self.executions,
+            'coalesced': self.coalesced,
+            'in_flight': in_flight
+        }
+
+
+class AsyncSingleFlight:
+    """Coalescing of concurrent coroutine calls that share a key on one event loop."""
+
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self._calls: Dict[str, "asyncio.Future"] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Await ``fn()`` unless a call for ``key`` is already in flight.
+
+        Returns:
+            ``(result, shared)`` where ``shared`` is True if the result came
+            from another caller's execution
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            # Shield so a cancelled follower does not cancel the leader's call
+            return await asyncio.shield(future), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.executions += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved; followers (if any) re-raise it
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            del self._calls[key]
+        return result, False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get execution and coalescing counters."""
+        return {
+            'executions': self.executions,
+            'coalesced': self.coalesced,
+            'in_flight': len(self._calls)
+        }
@@ -0,0 +1,211 @@
+"""Local Pokédex snapshot: a compact offline copy of the PokéAPI dataset.
+
+A snapshot is a gzip-compressed JSON file holding the projected record (see
+``projection``) of every pokemon, move, ability, type, evolution chain and
+generation.
+``PokemonTool`` can answer RFDs from it without any network access.
+"""
+
+import gzip
+import logging
+import os
+import time
+from typing import Dict, Any, List, Optional
+
+from . import codec
+from .projection import PROJECTION_VERSION, id_from_url
+from .columnar import DEFAULT_COLUMNS_PATH, write_columns
+
+logger = logging.getLogger('PokedexSnapshot')
+
+DEFAULT_SNAPSHOT_PATH = os.path.join("data", "pokedex_snapshot.json.gz")
+
+# Resources crawled into a snapshot, in crawl order
+SNAPSHOT_RESOURCES = ["pokemon", "move", "ability", "type", "evolution-chain", "generation"]
+
+# Approximate National Dex ID ranges per generation, used only when
+# generation membership cannot be resolved from PokéAPI or a snapshot
+GENERATION_RANGES = {
+    1: (1, 151), 2: (152, 251), 3: (252, 386), 4: (387, 493),
+    5: (494, 649), 6: (650, 721), 7: (722, 809), 8: (810, 905), 9: (906, 1010)
+}
+
+
+def generation_for_id(pokemon_id: int) -> Optional[int]:
+    """Return the generation whose National Dex range contains ``pokemon_id``."""
+    for generation, (start, end) in GENERATION_RANGES.items():
+        if start <= pokemon_id <= end:
+            return generation
+    return None
+
+
+class PokedexSnapshot:
+    """In-memory index over a loaded snapshot file."""
+
+    def __init__(self, resources: Dict[str, List[Dict[str, Any]]], created_at: int,
+                 version: int = PROJECTION_VERSION, path: Optional[str] = None):
+        """Index snapshot records by resource, ID and name.
+
+        Args:
+            resources: Projected records per resource name
+            created_at: Unix timestamp of the crawl
+            version: Projection version the records were built with
+            path: File the snapshot was loaded from, if any
+        """
+        self.created_at = created_at
+        self.version = version
+        self.path = path
+        self._by_id: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        self._by_name: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+        for resource, records in resources.items():
+            self._by_id[resource] = {record["id"]: record for record in records}
+            self._by_name[resource] = {
+                record["name"]: record for record in records if "name" in record
+            }
+
+    @classmethod
+    def load(cls, path: str) -> "PokedexSnapshot":
+        """Load a snapshot file.
+
+        Raises:
+            ValueError: If the file was built with a different projection version
+        """
+        with gzip.open(path, "rb") as f:
+            payload = codec.loads(f.read())
+
+        version = payload.get("version")
+        if version != PROJECTION_VERSION:
+            raise ValueError(
+                f"Snapshot {path} has projection version {version}, expected {PROJECTION_VERSION}; rebuild it"
+            )
+
+        snapshot = cls(payload["resources"], payload.get("created_at", 0), version, path)
+        logger.info(f"Loaded Pokédex snapshot from {path} ({snapshot.counts()})")
+        return snapshot
+
+    @classmethod
+    def from_env(cls) -> Optional["PokedexSnapshot"]:
+        """Load the snapshot named by POKEDEX_SNAPSHOT_PATH (or the default path) if present."""
+        path = os.getenv("POKEDEX_SNAPSHOT_PATH", DEFAULT_SNAPSHOT_PATH)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            return cls.load(path)
+        except Exception as e:
+            logger.warning(f"Could not load Pokédex snapshot {path}: {e}")
+            return None
+
+    def get(self, endpoint: str) -> Optional[Dict[str, Any]]:
+        """Look up the projected record for an endpoint such as ``pokemon/25``."""
+        resource, _, identifier = endpoint.partition("/")
+        identifier = identifier.strip("/").lower()
+        record = None
+        if identifier.isdigit():
+            record = self._by_id.get(resource, {}).get(int(identifier))
+        elif identifier:
+            record = self._by_name.get(resource, {}).get(identifier)
+
+        if record is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return record
+
+    def ids(self, resource: str) -> List[int]:
+        """Return the sorted IDs available for a resource."""
+        return sorted(self._by_id.get(resource, {}))
+
+    def records(self, resource: str) -> List[Dict[str, Any]]:
+        """Return every record for a resource in ID order."""
+        by_id = self._by_id.get(resource, {})
+        return [by_id[record_id] for record_id in sorted(by_id)]
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of records per resource."""
+        return {resource: len(records) for resource, records in self._by_id.items()}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get snapshot statistics."""
+        return {
+            'path': self.path,
+            'created_at': self.created_at,
+            'version': self.version,
+            'records': self.counts(),
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+def build_snapshot(tool, path: str = DEFAULT_SNAPSHOT_PATH,
+                   resources: Optional[List[str]] = None,
+                   columns_path: Optional[str] = DEFAULT_COLUMNS_PATH) -> Dict[str, int]:
+    """Crawl PokéAPI through ``tool`` and write a snapshot file.
+
+    Every record is fetched with the tool's own concurrent, rate-limited
+    request path, so the crawl also warms its response store. When Pokémon
+    are crawled, a columnar store is written alongside for filtered queries.
+
+    Args:
+        tool: A ``PokemonTool`` used for fetching
+        path: Destination snapshot file
+        resources: Resources to crawl (defaults to SNAPSHOT_RESOURCES)
+        columns_path: Destination columnar store (None to skip it)
+
+    Returns:
+        Number of records written per resource
+    """
+    crawled = {}
+    for resource in resources or SNAPSHOT_RESOURCES:
+        listing = tool._make_request(f"{resource}?limit=100000&offset=0")
+        if not listing:
+            raise RuntimeError(f"Could not list {resource} resources")
+
+        ids = [
+            resource_id for resource_id in (id_from_url(entry.get("url")) for entry in listing.get("results", []))
+            if resource_id is not None
+        ]
+        logger.info(f"Crawling {len(ids)} {resource} records")
+
+        records = tool._fetch_many([f"{resource}/{resource_id}" for resource_id in ids])
+        crawled[resource] = [record for record in records if record]
+
+        missing = len(ids) - len(crawled[resource])
+        if missing:
+            logger.warning(f"Skipped {missing} {resource} records that could not be fetched")
+
+    payload = {
+        "version": PROJECTION_VERSION,
+        "created_at": int(time.time()),
+        "resources": crawled
+    }
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # Write to a temp file first so a crashed crawl never leaves a truncated snapshot
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, "wb") as f:
+        f.write(codec.dumpb(payload))
+    os.replace(tmp_path, path)
+
+    if columns_path and crawled.get("pokemon"):
+        # Species IDs match the IDs of their default Pokémon
+        generations = {
+            species_id: record["id"]
+            for record in crawled.get("generation", [])
+            for species_id in record["pokemon_species"]
+        }
+        for record in crawled["pokemon"]:
+            if record["id"] not in generations:
+                generation = generation_for_id(record["id"])
+                if generation is not None:
+                    generations[record["id"]] = generation
+        write_columns(columns_path, crawled["pokemon"], generations)
+
+    counts = {resource: len(records) for resource, records in crawled.items()}
+    logger.info(f"Wrote Pokédex snapshot to {path}: {counts}")
+    return counts
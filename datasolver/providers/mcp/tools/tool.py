@@ -1,9 +1,55 @@
 """Base class for MCP tools that handle specific data operations."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterable, Iterator
 import json
 
+class MetadataFrame(dict):
+    """Trailing frame of a record stream.
+    
+    Holds the dataset's top-level fields other than ``data`` (count,
+    data_type, source, ...). Records are plain dicts; a stream ends with
+    exactly one ``MetadataFrame``.
+    """
+
+def stream_result(result: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Turn a complete ``generate_data`` result into a record stream.
+    
+    Args:
+        result: Dataset dictionary with the records under ``data``
+        
+    Returns:
+        Iterator over the records followed by a ``MetadataFrame``
+    """
+    yield from result.get("data") or []
+    yield MetadataFrame({key: value for key, value in result.items() if key != "data"})
+
+class DatasetStream:
+    """Single-pass, lazy view of a record stream.
+    
+    Iterating yields the records as the tool produces them; once the
+    stream is exhausted ``metadata`` holds the trailing frame.
+    """
+    
+    def __init__(self, frames: Iterable[Dict[str, Any]]):
+        """Wrap a stream of records ending in a ``MetadataFrame``."""
+        self._frames = iter(frames)
+        self.metadata: Optional[Dict[str, Any]] = None
+        self.count = 0
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for frame in self._frames:
+            if isinstance(frame, MetadataFrame):
+                self.metadata = dict(frame)
+                continue
+            self.count += 1
+            yield frame
+    
+    def collect(self) -> Dict[str, Any]:
+        """Drain the stream into a complete dataset dictionary."""
+        records = list(self)
+        return {"data": records, **(self.metadata or {})}
+
 class MCPTool(ABC):
     """Abstract base class for MCP tools.
     
@@ -75,4 +121,24 @@ class MCPTool(ABC):
             ValueError: If the RFD is invalid or requirements can't be met
             RuntimeError: If data generation fails
         """
-        pass 
\ No newline at end of file
+        pass
+    
+    def stream_data(self, rfd: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Generate data according to the RFD as a stream of records.
+        
+        Tools that can produce records incrementally override this so
+        consumers can write or upload the first records while later ones
+        are still being fetched. The default streams a complete
+        ``generate_data`` result.
+        
+        Args:
+            rfd: The request for data specifying what to generate
+            
+        Returns:
+            Iterator over the records followed by a ``MetadataFrame``
+            
+        Raises:
+            ValueError: If the RFD is invalid or requirements can't be met
+            RuntimeError: If data generation fails
+        """
+        yield from stream_result(self.generate_data(rfd)) 
\ No newline at end of file
@@ -0,0 +1,220 @@
+"""Background warm-up of popular RFDs before live traffic needs them."""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger('WarmupScheduler')
+
+
+class WarmupScheduler:
+    """Replay popular RFDs at startup and shortly before their cache entries go stale.
+
+    Targets are a configured list of RFDs plus the ``top_n`` most requested
+    RFDs recorded by the IPFS cache. Every ``interval_seconds`` each target
+    whose cached result is missing or expires within ``lead_seconds`` is
+    regenerated through ``PokemonTool.warm``. Warm-ups run on at most
+    ``concurrency`` threads and each one waits (up to ``max_defer_seconds``)
+    for live generations to finish before starting, so warming never
+    competes with live RFDs for the PokéAPI rate limit.
+    """
+
+    def __init__(self, tool, rfds: Optional[List[Dict[str, Any]]] = None, top_n: int = 10,
+                 concurrency: int = 1, interval_seconds: float = 300, lead_seconds: float = 300,
+                 max_defer_seconds: float = 30, idle_poll_seconds: float = 0.5):
+        """Initialize the scheduler.
+
+        Args:
+            tool: PokemonTool whose results are warmed
+            rfds: RFDs always kept warm
+            top_n: Number of most requested RFDs to keep warm as well
+            concurrency: Maximum number of warm-ups running at once
+            interval_seconds: Delay between warm-up passes
+            lead_seconds: Warm results this long before their TTL runs out
+            max_defer_seconds: Longest a warm-up waits for live generations to finish
+            idle_poll_seconds: How often a deferred warm-up checks for live generations
+        """
+        self.tool = tool
+        self.rfds = list(rfds or [])
+        self.top_n = top_n
+        self.concurrency = max(1, concurrency)
+        self.interval_seconds = interval_seconds
+        self.lead_seconds = lead_seconds
+        self.max_defer_seconds = max_defer_seconds
+        self.idle_poll_seconds = idle_poll_seconds
+
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="warmup")
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._active = 0
+
+        self.passes = 0
+        self.warmed = 0
+        self.skipped = 0
+        self.failed = 0
+        self.deferred_seconds = 0.0
+
+    @classmethod
+    def from_env(cls, tool) -> "WarmupScheduler":
+        """Create a scheduler from WARMUP_* environment variables.
+
+        WARMUP_RFDS is either a JSON list of RFDs or the path of a JSON file
+        holding one.
+        """
+        return cls(
+            tool,
+            rfds=cls._load_rfds(os.getenv("WARMUP_RFDS", "")),
+            top_n=int(os.getenv("WARMUP_TOP_N", 10)),
+            concurrency=int(os.getenv("WARMUP_CONCURRENCY", 1)),
+            interval_seconds=float(os.getenv("WARMUP_INTERVAL_SECONDS", 300)),
+            lead_seconds=float(os.getenv("WARMUP_LEAD_SECONDS", 300)),
+            max_defer_seconds=float(os.getenv("WARMUP_MAX_DEFER_SECONDS", 30))
+        )
+
+    @staticmethod
+    def _load_rfds(spec: str) -> List[Dict[str, Any]]:
+        """Parse WARMUP_RFDS as inline JSON or as a path to a JSON file."""
+        spec = spec.strip()
+        if not spec:
+            return []
+        try:
+            if spec.startswith("["):
+                rfds = json.loads(spec)
+            else:
+                with open(spec, 'r') as f:
+                    rfds = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring invalid WARMUP_RFDS: {e}")
+            return []
+        if not isinstance(rfds, list):
+            logger.warning("Ignoring WARMUP_RFDS: expected a JSON list of RFDs")
+            return []
+        return [rfd for rfd in rfds if isinstance(rfd, dict)]
+
+    def targets(self) -> List[Dict[str, Any]]:
+        """Return the configured and most requested RFDs, one per fingerprint."""
+        cache = self.tool.ipfs_cache
+        candidates = self.rfds + (cache.popular_rfds(self.top_n) if self.top_n > 0 else [])
+        seen = set()
+        targets = []
+        for rfd in candidates:
+            if not self.tool.validate_rfd(rfd):
+                continue
+            key = cache._fingerprint_rfd(rfd)
+            if key not in seen:
+                seen.add(key)
+                targets.append(rfd)
+        return targets
+
+    def is_due(self, rfd: Dict[str, Any]) -> bool:
+        """Check whether an RFD's cached result is missing or about to go stale."""
+        remaining = self.tool.ipfs_cache.expires_in(rfd)
+        return remaining is None or remaining <= self.lead_seconds
+
+    def run_once(self) -> int:
+        """Run one warm-up pass and wait for it to finish.
+
+        Returns:
+            Number of RFDs warmed
+        """
+        if self.tool.snapshot:
+            # Snapshot answers are local and the IPFS cache is bypassed; nothing to warm
+            return 0
+        if not self.tool.ipfs_cache.pinata_available:
+            # Nothing can be cached, so every pass would regenerate every target
+            return 0
+
+        targets = self.targets()
+        due = [rfd for rfd in targets if self.is_due(rfd)]
+        with self._lock:
+            self.passes += 1
+            self.skipped += len(targets) - len(due)
+        if not due:
+            return 0
+
+        logger.info(f"Warming {len(due)} of {len(targets)} RFDs")
+        futures = [self._executor.submit(self._warm, rfd) for rfd in due]
+        wait(futures)
+        # Futures cancelled by ``stop`` never ran
+        return sum(1 for future in futures if not future.cancelled() and future.result())
+
+    def _warm(self, rfd: Dict[str, Any]) -> bool:
+        """Warm one RFD once live generations have drained (or the deferral runs out)."""
+        self._wait_for_idle()
+        if self._stop.is_set():
+            return False
+        with self._lock:
+            self._active += 1
+        try:
+            self.tool.warm(rfd)
+            with self._lock:
+                self.warmed += 1
+            return True
+        except Exception as e:
+            logger.warning(f"Warm-up failed for RFD {rfd}: {e}")
+            with self._lock:
+                self.failed += 1
+            return False
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def _wait_for_idle(self) -> None:
+        """Block while live generations are running, up to ``max_defer_seconds``."""
+        started = time.monotonic()
+        deadline = started + self.max_defer_seconds
+        while time.monotonic() < deadline and not self._stop.is_set():
+            with self._lock:
+                own = self._active
+            if self.tool.live_generations() <= own:
+                break
+            self._stop.wait(self.idle_poll_seconds)
+        with self._lock:
+            self.deferred_seconds += time.monotonic() - started
+
+    def start(self) -> None:
+        """Start warming in a background thread: once now, then every interval.
+        
+        Does nothing without Pinata, since warmed results could not be cached.
+        """
+        if self._thread is not None:
+            return
+        if not self.tool.ipfs_cache.pinata_available:
+            logger.info("Pinata not configured, warm-up scheduler not started")
+            return
+        self._thread = threading.Thread(target=self._run, name="warmup-scheduler", daemon=True)
+        self._thread.start()
+        logger.info(f"Warm-up scheduler started (top {self.top_n}, {len(self.rfds)} configured RFDs)")
+
+    def _run(self) -> None:
+        """Scheduler loop."""
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.warning(f"Warm-up pass failed: {e}")
+            self._stop.wait(self.interval_seconds)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop scheduling warm-ups; warm-ups already running finish in the background."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get warm-up counters."""
+        with self._lock:
+            return {
+                'passes': self.passes,
+                'warmed': self.warmed,
+                'skipped': self.skipped,
+                'failed': self.failed,
+                'active': self._active,
+                'deferred_seconds': round(self.deferred_seconds, 3)
+            }
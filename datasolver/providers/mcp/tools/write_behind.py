@@ -0,0 +1,223 @@
+"""Bounded write-behind queue that runs slow writes on background threads."""
+
+import logging
+import queue
+import threading
+import time
+from typing import Dict, Any, Callable, Optional, Set, Tuple
+
+logger = logging.getLogger('WriteBehindQueue')
+
+
+class WriteBehindQueue:
+    """Accept keyed writes immediately and apply them in the background.
+
+    Callers ``submit`` a key and item and return at once; worker threads
+    drain the queue in batches and call ``handler(key, item)``, which
+    returns True on success. Failed writes are retried with exponential
+    backoff. Submitting a key that is still queued replaces its item, so
+    repeated writes for the same key collapse into one; submitting a key
+    whose write is in flight stores the newer item, which is queued again
+    once the current write finishes. When the queue is full new writes are
+    dropped rather than blocking the caller.
+    """
+
+    def __init__(self, handler: Callable[[str, Any], bool], max_size: int = 1000,
+                 batch_size: int = 10, workers: int = 1, max_retries: int = 3,
+                 backoff_seconds: float = 1.0, name: str = "write-behind"):
+        """Initialize the queue and start its workers.
+
+        Args:
+            handler: Called as ``handler(key, item)``; returns True on success
+            max_size: Maximum number of queued keys
+            batch_size: Maximum number of keys a worker takes per batch
+            workers: Number of background worker threads
+            max_retries: Retries per write after the first failed attempt
+            backoff_seconds: Delay before the first retry (doubled per retry)
+            name: Thread name prefix
+        """
+        self.handler = handler
+        self.max_size = max_size
+        self.batch_size = max(1, batch_size)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+
+        self._queue: "queue.Queue[str]" = queue.Queue(maxsize=max_size)
+        self._pending: Dict[str, Tuple[Any, float]] = {}  # key -> (item, enqueued_at)
+        self._inflight: Set[str] = set()
+        self._outstanding = 0
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._closed = False
+
+        self.submitted = 0
+        self.coalesced = 0
+        self.completed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.retries = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+        self._threads = [
+            threading.Thread(target=self._run, name=f"{name}-{index}", daemon=True)
+            for index in range(max(1, workers))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, key: str, item: Any) -> bool:
+        """Queue a write for ``key``.
+
+        Returns:
+            True if the write was queued (or merged into a queued write),
+            False if the queue is full or closed
+        """
+        with self._lock:
+            if self._closed:
+                return False
+            if key in self._pending:
+                if key in self._inflight:
+                    # Being written: keep the newer item, ``_write`` queues it again on completion
+                    self._pending[key] = (item, time.monotonic())
+                else:
+                    # Still waiting for a worker: the newer item replaces the queued one
+                    self._pending[key] = (item, self._pending[key][1])
+                self.coalesced += 1
+                return True
+            try:
+                self._queue.put_nowait(key)
+            except queue.Full:
+                self.dropped += 1
+                logger.warning(f"Write-behind queue full, dropping write for {key}")
+                return False
+            self._pending[key] = (item, time.monotonic())
+            self._outstanding += 1
+            self.submitted += 1
+            return True
+
+    def pending(self, key: str) -> Optional[Any]:
+        """Return the item queued or being written for ``key``, if any."""
+        with self._lock:
+            entry = self._pending.get(key)
+        return entry[0] if entry else None
+
+    def _run(self) -> None:
+        """Worker loop: take a batch of keys and write each one."""
+        while True:
+            key = self._queue.get()
+            if key is None:
+                return
+            batch = [key]
+            while len(batch) < self.batch_size:
+                try:
+                    key = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if key is None:
+                    # Leave the stop marker for this worker's next loop
+                    self._queue.put(None)
+                    break
+                batch.append(key)
+
+            for key in batch:
+                try:
+                    self._write(key)
+                except Exception as e:
+                    # Never let one bad write stop the worker
+                    logger.error(f"Write-behind worker failed on {key}: {e}")
+
+    def _write(self, key: str) -> None:
+        """Apply the queued write for ``key`` with retry and backoff."""
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is None:
+                # Nothing to write for this queue slot; release it so flush() can finish
+                logger.warning(f"No pending write for {key}, skipping")
+                self._outstanding -= 1
+                self._idle.notify_all()
+                return
+            item, enqueued_at = entry
+            self._inflight.add(key)
+
+        success = False
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                with self._lock:
+                    self.retries += 1
+                time.sleep(self.backoff_seconds * (2 ** (attempt - 1)))
+            try:
+                success = bool(self.handler(key, item))
+            except Exception as e:
+                logger.warning(f"Write-behind handler failed for {key}: {e}")
+                success = False
+            if success:
+                break
+
+        latency = time.monotonic() - enqueued_at
+        with self._lock:
+            self._inflight.discard(key)
+            if self._pending.get(key, (None,))[0] is item:
+                del self._pending[key]
+            else:
+                # A newer item arrived while this one was being written; queue it again
+                try:
+                    self._queue.put_nowait(key)
+                    self._outstanding += 1
+                except queue.Full:
+                    del self._pending[key]
+                    self.dropped += 1
+            if success:
+                self.completed += 1
+                self._latency_total += latency
+                self._latency_max = max(self._latency_max, latency)
+            else:
+                self.failed += 1
+                logger.warning(f"Giving up on write for {key} after {self.max_retries + 1} attempts")
+            self._outstanding -= 1
+            self._idle.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued write has been applied (or given up on).
+
+        Returns:
+            True if the queue drained within ``timeout``
+        """
+        with self._lock:
+            return self._idle.wait_for(lambda: self._outstanding == 0, timeout=timeout)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Stop accepting writes, flush the queue and stop the workers.
+
+        Returns:
+            True if the queue drained within ``timeout``
+        """
+        with self._lock:
+            if self._closed:
+                return self._outstanding == 0
+            self._closed = True
+        drained = self.flush(timeout)
+        if not drained:
+            logger.warning(f"Write-behind queue closed with {self._outstanding} writes outstanding")
+        for _ in self._threads:
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                break
+        return drained
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth, throughput and latency metrics."""
+        with self._lock:
+            return {
+                'depth': self._outstanding,
+                'max_size': self.max_size,
+                'submitted': self.submitted,
+                'coalesced': self.coalesced,
+                'completed': self.completed,
+                'failed': self.failed,
+                'dropped': self.dropped,
+                'retries': self.retries,
+                'avg_latency_seconds': self._latency_total / self.completed if self.completed else 0.0,
+                'max_latency_seconds': self._latency_max
+            }
@@ -0,0 +1,373 @@
+"""Streaming dataset writers with atomic replacement.
+
+Datasets can be written as JSON, JSON Lines or in a columnar layout
+(Arrow IPC or Parquet when ``pyarrow`` is installed, column-oriented JSON
+otherwise), optionally gzip- or zstd-compressed.
+"""
+
+import gzip
+import io
+import logging
+import os
+import tempfile
+import textwrap
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from .providers.mcp.tools import codec
+from .providers.mcp.tools.pinning import SERVING_FIELDS, canonical_json
+
+logger = logging.getLogger('DatasetWriter')
+
+FORMATS = ("json", "jsonl", "columnar", "parquet")
+COMPRESSIONS = ("gzip", "zstd")
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+
+class DatasetWriter:
+    """Write a dataset to disk one record at a time.
+
+    The file is laid out as ``{"data": [...records...], ...metadata}``, so
+    records can be written as they arrive and the metadata (count,
+    data_type, ...) once they are done. Compact output is canonical (sorted
+    keys, metadata in key order, no ``SERVING_FIELDS``) and byte-identical
+    to the IPFS cache's pin of the same result, so uploading it reuses
+    that CID. Output goes to a temp file next to ``path``
+    and is renamed over it on ``close``, so readers never see a partial
+    dataset and a failed generation leaves any previous file untouched.
+    """
+
+    extension = ".json"
+
+    def __init__(self, path: str, pretty: bool = False, compression: Optional[str] = None):
+        """Open a temp file for the dataset.
+
+        Args:
+            path: Final dataset file path
+            pretty: Indent the JSON (larger on disk and on IPFS) instead of
+                writing it compactly
+            compression: ``gzip``, ``zstd`` or None
+        """
+        self.path = path
+        self.pretty = pretty
+        self.compression = compression
+        self.count = 0
+        self.closed = False
+
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, self._temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+        os.close(fd)
+        os.chmod(self._temp_path, 0o644)  # mkstemp creates owner-only files
+        self._file = None
+        self._open()
+
+    def __enter__(self) -> "DatasetWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is not None or not self.closed:
+            # An exception, or a writer left without close(): keep the old file
+            self.abort()
+
+    def _open(self) -> None:
+        """Open the (possibly compressed) text stream and write the header."""
+        self._file = io.TextIOWrapper(_open_compressed(self._temp_path, self.compression), encoding='utf-8')
+        self._file.write('{\n  "data": [' if self.pretty else '{"data":[')
+
+    def _dumps(self, value: Any) -> str:
+        """Serialize one value in the configured style."""
+        if self.pretty:
+            return codec.dumps(value, indent=True)
+        return canonical_json(value).decode('utf-8')
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Append one record to the dataset."""
+        if self.pretty:
+            prefix = ",\n" if self.count else "\n"
+            self._file.write(prefix + textwrap.indent(self._dumps(record), "    "))
+        else:
+            self._file.write(("," if self.count else "") + self._dumps(record))
+        self.count += 1
+
+    def write_all(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Append every record from an iterable, consuming it lazily."""
+        for record in records:
+            self.write(record)
+
+    def _finish(self, metadata: Dict[str, Any]) -> None:
+        """Write the metadata and footer, then close the stream."""
+        if self.pretty:
+            self._file.write("\n  ]" if self.count else "]")
+            for key, value in metadata.items():
+                self._file.write(f",\n  {codec.dumps(key)}: " + self._dumps(value).replace("\n", "\n  "))
+            self._file.write("\n}")
+        else:
+            self._file.write("]")
+            for key, value in sorted(metadata.items()):
+                self._file.write(f",{self._dumps(key)}:" + self._dumps(value))
+            self._file.write("}")
+        self._file.close()
+
+    def close(self, metadata: Optional[Dict[str, Any]] = None) -> str:
+        """Finish the dataset with its metadata and move it into place.
+
+        Args:
+            metadata: Top-level fields written after ``data`` (``SERVING_FIELDS``
+                describe this node's cache, not the dataset, and are left out)
+
+        Returns:
+            The final dataset path
+        """
+        self._finish({
+            key: value for key, value in (metadata or {}).items()
+            if key != "data" and key not in SERVING_FIELDS
+        })
+
+        # Make the bytes durable before the rename publishes them
+        fd = os.open(self._temp_path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(self._temp_path, self.path)
+        self.closed = True
+        logger.debug(f"Wrote {self.count} records to {self.path}")
+        return self.path
+
+    def abort(self) -> None:
+        """Discard the partial dataset."""
+        if self._file is not None and not self._file.closed:
+            try:
+                self._file.close()
+            except Exception:
+                pass
+        try:
+            os.remove(self._temp_path)
+        except FileNotFoundError:
+            pass
+
+
+class JSONLinesWriter(DatasetWriter):
+    """Write one JSON record per line, ending with a ``{"_metadata": {...}}`` line."""
+
+    extension = ".jsonl"
+
+    def _open(self) -> None:
+        self._file = io.TextIOWrapper(_open_compressed(self._temp_path, self.compression), encoding='utf-8')
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._file.write(codec.dumps(record) + "\n")
+        self.count += 1
+
+    def _finish(self, metadata: Dict[str, Any]) -> None:
+        self._file.write(codec.dumps({"_metadata": metadata}) + "\n")
+        self._file.close()
+
+
+class ColumnarWriter(DatasetWriter):
+    """Write records column by column.
+
+    Nested objects are flattened into dotted columns (``stats.hp``), so
+    each column holds values of one type, which compresses far better than
+    row-oriented JSON. Uses an Arrow IPC stream when ``pyarrow`` is
+    installed and column-oriented JSON (``{"columns": {...}, ...metadata}``)
+    otherwise. Columns are only complete once every record is in, so
+    records are buffered until ``close``.
+    """
+
+    extension = ".arrows"
+    fallback_extension = ".columns.json"
+
+    def _open(self) -> None:
+        self._records: List[Dict[str, Any]] = []
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._records.append(flatten_record(record))
+        self.count += 1
+
+    def _finish(self, metadata: Dict[str, Any]) -> None:
+        pyarrow = _import_pyarrow()
+        if pyarrow is None:
+            self._write_columns_json(metadata)
+        else:
+            self._write_arrow(pyarrow, metadata)
+
+    def _columns(self) -> Dict[str, List[Any]]:
+        """Pivot the buffered records into columns, padding missing fields with None."""
+        names: Dict[str, None] = {}
+        for record in self._records:
+            names.update(dict.fromkeys(record))
+        return {name: [record.get(name) for record in self._records] for name in names}
+
+    def _write_columns_json(self, metadata: Dict[str, Any]) -> None:
+        self._file = io.TextIOWrapper(_open_compressed(self._temp_path, self.compression), encoding='utf-8')
+        self._file.write(codec.dumps({"columns": self._columns(), **metadata}))
+        self._file.close()
+
+    def _arrow_table(self, pyarrow, metadata: Dict[str, Any]):
+        """Build a table carrying the dataset metadata in its schema."""
+        table = pyarrow.Table.from_pydict(self._columns())
+        return table.replace_schema_metadata({"dataset_metadata": codec.dumps(metadata)})
+
+    def _write_arrow(self, pyarrow, metadata: Dict[str, Any]) -> None:
+        table = self._arrow_table(pyarrow, metadata)
+        if self.compression:
+            sink = pyarrow.CompressedOutputStream(self._temp_path, self.compression)
+        else:
+            sink = pyarrow.OSFile(self._temp_path, 'wb')
+        with sink, pyarrow.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    def abort(self) -> None:
+        self._records = []
+        super().abort()
+
+
+class ParquetWriter(ColumnarWriter):
+    """Write records as a Parquet file (column-oriented JSON without ``pyarrow``).
+
+    Compression is applied per column chunk inside the file rather than
+    around it.
+    """
+
+    extension = ".parquet"
+
+    def _write_arrow(self, pyarrow, metadata: Dict[str, Any]) -> None:
+        import pyarrow.parquet as parquet
+        parquet.write_table(self._arrow_table(pyarrow, metadata), self._temp_path,
+                            compression=self.compression or 'none')
+
+
+WRITERS = {
+    "json": DatasetWriter,
+    "jsonl": JSONLinesWriter,
+    "columnar": ColumnarWriter,
+    "parquet": ParquetWriter
+}
+
+
+def flatten_record(record: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """Flatten nested objects into dotted keys; lists and scalars are kept as values.
+
+    Empty objects become None (here and inside lists): a column of empty
+    structs cannot be written to Parquet, and ``{}`` next to ``stats.hp``
+    columns from other records carries no information anyway.
+    """
+    flat = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict) and value:
+            flat.update(flatten_record(value, f"{name}."))
+        else:
+            flat[name] = _empty_objects_to_none(value)
+    return flat
+
+
+def _empty_objects_to_none(value: Any) -> Any:
+    """Replace empty objects, at any depth, with None."""
+    if isinstance(value, dict):
+        return {key: _empty_objects_to_none(item) for key, item in value.items()} if value else None
+    if isinstance(value, list):
+        return [_empty_objects_to_none(item) for item in value]
+    return value
+
+
+def _import_pyarrow():
+    """Return the ``pyarrow`` module, or None if it is not installed."""
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+        return pyarrow
+    except ImportError:
+        return None
+
+
+def _zstd_available() -> bool:
+    """Check whether the ``zstandard`` package is installed."""
+    try:
+        import zstandard  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _open_compressed(path: str, compression: Optional[str]):
+    """Open ``path`` for binary writing through the given compressor."""
+    if compression == "gzip":
+        return gzip.open(path, 'wb')
+    if compression == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor().stream_writer(open(path, 'wb'))
+    return open(path, 'wb')
+
+
+def output_options(rfd: Optional[Dict[str, Any]] = None, output_format: Optional[str] = None,
+                   compression: Optional[str] = None) -> Tuple[str, Optional[str]]:
+    """Resolve the dataset format and compression.
+
+    The RFD's ``output_format``/``compression`` win over the given defaults,
+    which win over DATASET_FORMAT/DATASET_COMPRESSION. Unknown values fall
+    back to uncompressed JSON with a warning.
+
+    Returns:
+        ``(format, compression)`` where compression is None for none
+    """
+    rfd = rfd or {}
+    output_format = (rfd.get("output_format") or output_format or os.getenv("DATASET_FORMAT") or "json").lower()
+    compression = (rfd.get("compression") or compression or os.getenv("DATASET_COMPRESSION") or "none").lower()
+
+    if output_format not in FORMATS:
+        logger.warning(f"Unknown dataset format {output_format}, writing JSON")
+        output_format = "json"
+    if compression in ("none", "false", ""):
+        compression = None
+    elif compression not in COMPRESSIONS:
+        logger.warning(f"Unknown dataset compression {compression}, writing uncompressed")
+        compression = None
+    return output_format, compression
+
+
+def open_writer(stem: str, output_format: str = "json", compression: Optional[str] = None,
+                pretty: bool = False) -> DatasetWriter:
+    """Open a writer for ``stem`` plus the extension of the chosen format.
+
+    Falls back to gzip when zstd is requested but ``zstandard`` is not
+    installed, and to column-oriented JSON when a columnar format is
+    requested without ``pyarrow``.
+
+    Raises:
+        ValueError: If the format or compression is unknown
+    """
+    if output_format not in WRITERS:
+        raise ValueError(f"Unsupported dataset format: {output_format}")
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(f"Unsupported dataset compression: {compression}")
+
+    writer_class = WRITERS[output_format]
+    extension = writer_class.extension
+    fallback = issubclass(writer_class, ColumnarWriter) and _import_pyarrow() is None
+    if fallback:
+        logger.warning(f"pyarrow not installed, writing {output_format} data as column-oriented JSON")
+        extension = writer_class.fallback_extension
+
+    # Parquet compresses inside the file; every other format is wrapped in a compressed stream
+    if compression and not (output_format == "parquet" and not fallback):
+        if compression == "zstd" and not _zstd_available():
+            logger.warning("zstandard not installed, compressing with gzip instead")
+            compression = "gzip"
+        extension += COMPRESSION_SUFFIXES[compression]
+
+    return writer_class(stem + extension, pretty=pretty, compression=compression)
+
+
+def write_dataset(path: str, records: Iterable[Dict[str, Any]], metadata: Optional[Dict[str, Any]] = None,
+                  pretty: bool = False) -> int:
+    """Stream ``records`` and ``metadata`` to ``path`` as JSON, atomically.
+
+    Returns:
+        Number of records written
+    """
+    with DatasetWriter(path, pretty=pretty) as writer:
+        writer.write_all(records)
+        writer.close(metadata)
+    return writer.count
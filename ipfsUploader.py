@@ -1,7 +1,6 @@
-import requests
 import os
-import json
 from dotenv import load_dotenv
+from datasolver.providers.mcp.tools.pinning import pin_bytes
 
 # Load environment variables
 load_dotenv()
@@ -10,9 +9,15 @@ load_dotenv()
 PINATA_API_KEY = os.environ.get("PINATA_API_KEY")
 PINATA_SECRET_API_KEY = os.environ.get("PINATA_SECRET_API_KEY")
 
+# Datasets can be large, so uploads get far longer than the 60s API default
+UPLOAD_TIMEOUT = float(os.environ.get("PINATA_UPLOAD_TIMEOUT", 600))
+
 def upload_to_ipfs(file_path: str) -> str:
     """Uploads a file to IPFS using Pinata
     
+    The upload is skipped when a file with identical bytes was pinned before;
+    its existing CID is returned instead.
+    
     Args:
         file_path: Path to the file to upload
         
@@ -26,55 +31,19 @@ def upload_to_ipfs(file_path: str) -> str:
     if not PINATA_API_KEY or not PINATA_SECRET_API_KEY:
         raise Exception("Pinata API keys are missing. Please set PINATA_API_KEY and PINATA_SECRET_API_KEY in your .env file.")
     
-    # Pinata API endpoint for file uploads
-    url = "https://api.pinata.cloud/pinning/pinFileToIPFS"
-    
-    # Set up headers with Pinata API keys
-    headers = {
-        "pinata_api_key": PINATA_API_KEY,
-        "pinata_secret_api_key": PINATA_SECRET_API_KEY
-    }
-    
-    # Set up optional Pinata metadata
-    file_name = os.path.basename(file_path)
-    pinata_metadata = json.dumps({
-        "name": file_name
-    })
-    
     # Open and read the file
+    file_name = os.path.basename(file_path)
     try:
         with open(file_path, 'rb') as file:
-            files = {
-                'file': (file_name, file)
-            }
-            
-            data = {
-                'pinataMetadata': pinata_metadata
-            }
-            
-            # Make the request
-            response = requests.post(url, files=files, headers=headers, data=data)
-            
-            # Check response
-            if response.status_code == 200:
-                # Extract CID from response
-                data = response.json()
-                cid = data.get('IpfsHash')
-                if not cid:
-                    raise Exception("No IPFS hash returned in response")
-                return f"ipfs://{cid}"
-            else:
-                # Handle error
-                error_message = response.text
-                try:
-                    error_data = response.json()
-                    error_message = json.dumps(error_data)
-                except json.JSONDecodeError:
-                    pass
-                raise Exception(f"Failed to upload to IPFS: {response.status_code} - {error_message}")
-                
+            content = file.read()
     except FileNotFoundError:
         raise Exception(f"File not found at path: {file_path}")
+    
+    # Pin by content: identical bytes pinned before reuse their CID. A compact JSON
+    # solution file matches the IPFS cache's pin of the same result byte for byte
+    try:
+        cid, _ = pin_bytes(content, name=file_name, timeout=UPLOAD_TIMEOUT)
+        return f"ipfs://{cid}"
     except Exception as e:
         raise Exception(f"Unexpected error during IPFS upload: {str(e)}")
 
@@ -140,6 +140,22 @@ def cache_stats():
         print(f"  • Expired Entries: {stats['expired_entries']}")
         print(f"  • TTL: {stats['ttl_seconds']} seconds ({stats['ttl_seconds']//60} minutes)")
         
+        tier_hits = stats.get('tier_hits')
+        if tier_hits:
+            print(f"  • Hits by tier: memory {tier_hits['memory']}, disk {tier_hits['disk']}, IPFS {tier_hits['ipfs']}")
+            print(f"  • Misses: {stats['tier_misses']}")
+        
+        write_queue = stats.get('write_queue')
+        if write_queue:
+            print(f"  • Pending Writes: {write_queue['depth']} (avg latency {write_queue['avg_latency_seconds']:.2f}s, {write_queue['failed']} failed)")
+        
+        memory = stats.get('memory_cache')
+        if memory:
+            print(f"\n🧠 Memory Cache:")
+            print(f"  • Entries: {memory['entries']} ({memory['size_bytes'] // 1024} KB of {memory['max_bytes'] // 1024} KB)")
+            print(f"  • Hits / Misses: {memory['hits']} / {memory['misses']}")
+            print(f"  • Evictions: {memory['evictions']}")
+        
         if stats['expired_entries'] > 0:
             cleared = tool.clear_expired_cache()
             print(f"  • Cleared {cleared} expired entries")
@@ -147,5 +163,96 @@ def cache_stats():
     except Exception as e:
         logger.error(f"Cache stats failed: {str(e)}")
 
+@cli.command()
+def cache_rebuild():
+    """Rebuild the IPFS cache index from Pinata's pin list"""
+    print(BANNER)
+    print("\n🔁 Rebuilding IPFS cache index from Pinata...")
+    
+    try:
+        from datasolver.providers.mcp.tools.ipfs_cache import IPFSCache
+        cache = IPFSCache(ttl_minutes=30, rebuild_on_start=False)
+        if not cache.pinata_available:
+            print("❌ Pinata not configured")
+            return
+        
+        updated = cache.rebuild_index()
+        print(f"✅ Index rebuilt: {updated} entries updated, {len(cache.cache_metadata)} total")
+    except Exception as e:
+        logger.error(f"Cache rebuild failed: {str(e)}")
+
+@cli.command()
+@click.option('--top', 'top_n', type=int, default=None, help='Number of most requested RFDs to warm (defaults to WARMUP_TOP_N or 10)')
+def cache_warm(top_n: Optional[int]):
+    """Warm the configured and most requested RFDs once"""
+    print(BANNER)
+    print("\n🔥 Warming popular RFDs...")
+    
+    try:
+        from datasolver.providers.mcp.tools.pokemon import PokemonTool
+        from datasolver.providers.mcp.tools.warmup import WarmupScheduler
+        tool = PokemonTool()
+        scheduler = WarmupScheduler.from_env(tool)
+        if top_n is not None:
+            scheduler.top_n = top_n
+        
+        warmed = scheduler.run_once()
+        stats = scheduler.get_stats()
+        print(f"✅ Warmed {warmed} RFDs ({stats['skipped']} still fresh, {stats['failed']} failed)")
+        tool.ipfs_cache.flush(30)
+    except Exception as e:
+        logger.error(f"Cache warm-up failed: {str(e)}")
+
+@cli.group()
+def snapshot():
+    """Build and inspect the local Pokédex snapshot"""
+    pass
+
+@snapshot.command('build')
+@click.option('--output', default=None, help='Snapshot file path (defaults to POKEDEX_SNAPSHOT_PATH or data/pokedex_snapshot.json.gz)')
+@click.option('--resource', 'resources', multiple=True, help='Resource to crawl (repeatable; defaults to all)')
+def snapshot_build(output: Optional[str], resources: tuple):
+    """Crawl PokéAPI once into a local snapshot file"""
+    print(BANNER)
+    
+    try:
+        import os
+        from datasolver.providers.mcp.tools.pokemon import PokemonTool
+        from datasolver.providers.mcp.tools.snapshot import build_snapshot, DEFAULT_SNAPSHOT_PATH
+        from datasolver.providers.mcp.tools.columnar import DEFAULT_COLUMNS_PATH
+        
+        path = output or os.getenv("POKEDEX_SNAPSHOT_PATH") or DEFAULT_SNAPSHOT_PATH
+        columns_path = os.getenv("POKEDEX_COLUMNS_PATH") or DEFAULT_COLUMNS_PATH
+        print(f"\n📦 Building Pokédex snapshot at {path}...")
+        
+        # Crawl live data, never an existing snapshot
+        tool = PokemonTool(snapshot_path="", offline=False)
+        counts = build_snapshot(tool, path, list(resources) or None, columns_path=columns_path)
+        
+        print(f"✅ Snapshot written:")
+        for resource, count in counts.items():
+            print(f"  • {resource}: {count} records")
+    except Exception as e:
+        logger.error(f"Snapshot build failed: {str(e)}")
+
+@snapshot.command('info')
+@click.option('--path', default=None, help='Snapshot file path')
+def snapshot_info(path: Optional[str]):
+    """Show the contents of the local Pokédex snapshot"""
+    try:
+        import os
+        from datetime import datetime
+        from datasolver.providers.mcp.tools.snapshot import PokedexSnapshot, DEFAULT_SNAPSHOT_PATH
+        
+        path = path or os.getenv("POKEDEX_SNAPSHOT_PATH") or DEFAULT_SNAPSHOT_PATH
+        snap = PokedexSnapshot.load(path)
+        
+        print(f"📦 Pokédex snapshot: {path}")
+        print(f"  • Built: {datetime.fromtimestamp(snap.created_at).isoformat()}")
+        for resource, count in snap.counts().items():
+            print(f"  • {resource}: {count} records")
+    except Exception as e:
+        logger.error(f"Snapshot info failed: {str(e)}")
+
 if __name__ == '__main__':
     cli()
\ No newline at end of file
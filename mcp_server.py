@@ -4,7 +4,6 @@
 import asyncio
 import sys
 import os
-import json
 import logging
 from typing import Any, Dict, List, Optional
 from dotenv import load_dotenv
@@ -35,14 +34,20 @@ except ImportError:
     logger.error("MCP package not installed. Install with: pip install mcp")
     sys.exit(1)
 
-from providers.mcp.tools.pokemon import PokemonTool
+from providers.mcp.tools import codec
+from providers.mcp.tools.async_pokemon import AsyncPokemonTool
+from providers.mcp.tools.warmup import WarmupScheduler
 
 class EdgeDxMCPServer:
     """MCP Server for EdgeDx Pokemon data tools."""
     
     def __init__(self):
         """Initialize the EdgeDx MCP server."""
-        self.pokemon_tool = PokemonTool()
+        self.pokemon_tool = AsyncPokemonTool()
+        self.warmup = None
+        if os.getenv("WARMUP_ENABLED", "true").lower() == "true":
+            # Keep popular RFDs warm across restarts and TTL expiry
+            self.warmup = WarmupScheduler.from_env(self.pokemon_tool)
         self.server = Server("edgedx")
         self._setup_handlers()
     
@@ -156,8 +161,8 @@ class EdgeDxMCPServer:
             if not self.pokemon_tool.validate_rfd(rfd):
                 return [TextContent(type="text", text="Invalid request parameters")]
             
-            # Generate the data
-            result = self.pokemon_tool.generate_data(rfd)
+            # Generate the data without blocking the event loop
+            result = await self.pokemon_tool.generate_data_async(rfd)
             
             # Format the response
             response = {
@@ -183,7 +188,7 @@ class EdgeDxMCPServer:
             return [
                 TextContent(
                     type="text", 
-                    text=f"{summary}\n\nResult:\n{json.dumps(response, indent=2)}"
+                    text=f"{summary}\n\nResult:\n{codec.dumps(response, indent=True)}"
                 )
             ]
             
@@ -217,7 +222,7 @@ class EdgeDxMCPServer:
             return [
                 TextContent(
                     type="text",
-                    text=f"{summary}\n\nDetailed Stats:\n{json.dumps(response, indent=2)}"
+                    text=f"{summary}\n\nDetailed Stats:\n{codec.dumps(response, indent=True)}"
                 )
             ]
             
@@ -244,21 +249,30 @@ class EdgeDxMCPServer:
 async def main():
     """Main entry point for the MCP server."""
     server_instance = EdgeDxMCPServer()
+    if server_instance.warmup:
+        server_instance.warmup.start()
     
     # Run the server
-    async with stdio_server() as (read_stream, write_stream):
-        await server_instance.server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="edgedx",
-                server_version="1.0.0",
-                capabilities=server_instance.server.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server_instance.server.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="edgedx",
+                    server_version="1.0.0",
+                    capabilities=server_instance.server.get_capabilities(
+                        notification_options=NotificationOptions(),
+                        experimental_capabilities={},
+                    ),
                 ),
-            ),
-        )
+            )
+    finally:
+        if server_instance.warmup:
+            server_instance.warmup.stop(timeout=5)
+        await server_instance.pokemon_tool.aclose()
+        # Pin any results still waiting in the write-behind queue
+        await asyncio.get_running_loop().run_in_executor(None, server_instance.pokemon_tool.ipfs_cache.flush, 30)
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
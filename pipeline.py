@@ -9,6 +9,9 @@ from datetime import datetime
 import os
 from dotenv import load_dotenv
 
+from datasolver.providers.mcp.tools.tool import DatasetStream
+from datasolver.writer import open_writer, output_options
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -132,6 +135,10 @@ class DataGenerationStage(PipelineStage):
                 }
                 self.logger.info("Generated mock dataset")
                 context.add_stage_result(PipelineStageType.DATA_GENERATION, mock_data)
+            elif hasattr(self.provider, "stream_dataset"):
+                # Lazy: records are produced as the storage stage consumes them
+                stream = self.provider.stream_dataset(context.rfd)
+                context.add_stage_result(PipelineStageType.DATA_GENERATION, stream)
             else:
                 dataset = self.provider.generate_dataset(context.rfd)
                 context.add_stage_result(PipelineStageType.DATA_GENERATION, dataset)
@@ -167,9 +174,20 @@ class StorageStage(PipelineStage):
             if not pinata_api_key or not pinata_secret:
                 raise ValueError("Pinata credentials not found in environment variables")
             
+            storage_result = {}
+            dataset = context.get_stage_result(PipelineStageType.DATA_GENERATION)
+            if isinstance(dataset, DatasetStream):
+                # Drain the stream to disk record by record as the tool produces them
+                rfd_id = context.rfd.get("rfd_id", "unknown")
+                output_format, compression = output_options(context.rfd)
+                with open_writer(f"data/pokemon_rfd_{rfd_id}_solution", output_format, compression) as writer:
+                    writer.write_all(dataset)
+                    storage_result["path"] = writer.close(dataset.metadata)
+                self.logger.info(f"Wrote {writer.count} streamed records to {storage_result['path']}")
+            
             # Add actual IPFS upload logic here
-            storage_uri = "ipfs://mock_cid"  # Placeholder
-            context.add_stage_result(PipelineStageType.STORAGE, {"uri": storage_uri})
+            storage_result["uri"] = "ipfs://mock_cid"  # Placeholder
+            context.add_stage_result(PipelineStageType.STORAGE, storage_result)
             
         except Exception as e:
             context.add_error(f"Storage failed: {str(e)}")
@@ -58,14 +58,19 @@ class SolutionSubmitter:
         
         Args:
             rfd_id: The Request for Data ID
-            file_path: Path to the solution file to upload
+            file_path: Path to the solution file to upload, or an ``ipfs://``
+                URI of a solution that is already pinned
             
         Returns:
             Optional[str]: Transaction hash if successful, None otherwise
         """
         try:
-            # Upload to IPFS
-            ipfs_uri = upload_to_ipfs(file_path)
+            if file_path.startswith("ipfs://"):
+                # Already pinned; submit the existing URI instead of uploading again
+                ipfs_uri = file_path
+            else:
+                # Upload to IPFS
+                ipfs_uri = upload_to_ipfs(file_path)
             if not ipfs_uri:
                 raise Exception("Failed to get IPFS URI")
 
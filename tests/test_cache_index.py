@@ -0,0 +1,72 @@
+"""Tests for the SQLite fingerprint→CID index of the IPFS cache."""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'datasolver'))
+
+from providers.mcp.tools.cache_index import CacheIndex
+
+
+class CacheIndexTest(unittest.TestCase):
+
+    def open(self, path=":memory:"):
+        index = CacheIndex(path)
+        self.addCleanup(index.close)
+        return index
+
+    def test_behaves_like_a_dict(self):
+        index = self.open()
+        index["k1"] = {"cid": "cid1", "timestamp": 100, "data_type": "pokemon"}
+        self.assertIn("k1", index)
+        self.assertEqual(index["k1"], {"cid": "cid1", "timestamp": 100, "data_type": "pokemon"})
+        self.assertEqual(len(index), 1)
+        del index["k1"]
+        self.assertNotIn("k1", index)
+        with self.assertRaises(KeyError):
+            index["k1"]
+
+    def test_put_many_keeps_the_newest_entry(self):
+        index = self.open()
+        index.put("k1", "cid1", 200, "pokemon")
+
+        changed = index.put_many([
+            ("k1", "older", 100, "pokemon"),
+            ("k2", "cid2", 100, "type"),
+            ("k2", "newer", 150, "type")
+        ])
+        self.assertEqual(changed, 2)
+        self.assertEqual(index["k1"]["cid"], "cid1")
+        self.assertEqual(index["k2"], {"cid": "newer", "timestamp": 150, "data_type": "type"})
+
+        self.assertEqual(index.put_many([("k1", "newest", 300, "pokemon")]), 1)
+        self.assertEqual(dict(index.items())["k1"]["cid"], "newest")
+
+    def test_purge_removes_old_entries_and_usage(self):
+        index = self.open()
+        index.put_many([("old", "cid1", 100, None), ("new", "cid2", 300, None)])
+        index.record_usage_many([("old", "{}", 5, 100), ("new", "{}", 1, 300)])
+
+        self.assertEqual(index.purge_older_than(200), 1)
+        self.assertEqual([key for key, _ in index.items()], ["new"])
+        self.assertEqual(index.top_usage(10), [("new", "{}", 1)])
+        self.assertEqual(index.purge_older_than(200), 0)
+
+    def test_entries_survive_reopening(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "index.db")
+            index = CacheIndex(path)
+            index.put("k1", "cid1", 100, "pokemon")
+            index.close()
+
+            reopened = CacheIndex(path)
+            try:
+                self.assertEqual(reopened["k1"]["cid"], "cid1")
+            finally:
+                reopened.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Tests for the memory-mapped columnar Pokédex store."""
+
+import itertools
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'datasolver'))
+
+from providers.mcp.tools.columnar import ColumnarPokedex, STAT_NAMES, TYPE_NAMES, write_columns
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def pokemon(index):
+    return {
+        "id": index,
+        "name": f"pokemon-{index}",
+        "height": index % 20,
+        "weight": index * 7 % 1000,
+        # Missing for some forms; stored as -1
+        "base_experience": None if index % 9 == 0 else index * 3 % 300,
+        "types": [TYPE_NAMES[index % len(TYPE_NAMES)], TYPE_NAMES[index * 5 % len(TYPE_NAMES)]][:1 + index % 2],
+        "stats": {stat: (index * (offset + 3)) % 160 for offset, stat in enumerate(STAT_NAMES)}
+    }
+
+
+class ColumnarPokedexTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "pokedex_columns.bin")
+        cls.records = [pokemon(index) for index in range(1, 201)]
+        write_columns(cls.path, cls.records, {index: 1 + index // 40 for index in range(1, 201)})
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def open(self):
+        store = ColumnarPokedex(self.path)
+        self.addCleanup(store.close)
+        return store
+
+    def expected(self, generation=None, type_filter=None, min_stats=None):
+        return [
+            record["id"] for record in self.records
+            if (generation is None or 1 + record["id"] // 40 == generation)
+            and (type_filter is None or type_filter in record["types"])
+            and all(record["stats"][stat] >= minimum for stat, minimum in (min_stats or {}).items())
+        ]
+
+    def test_scan_matches_the_records(self):
+        store = self.open()
+        store._arrays = None
+        self.assertEqual(store.query(generation=2), self.expected(generation=2))
+        self.assertEqual(store.query(type_filter="Fire"), self.expected(type_filter="fire"))
+        self.assertEqual(store.query(type_filter="water", min_stats={"speed": 80}, limit=3),
+                         self.expected(type_filter="water", min_stats={"speed": 80})[:3])
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_numpy_and_scan_agree(self):
+        store = self.open()
+        self.assertTrue(store.get_stats()['vectorized'])
+        scan = self.open()
+        scan._arrays = None
+
+        for generation, type_filter, min_stats in itertools.product(
+                (None, 1, 3, 9),
+                (None, "grass", "dragon"),
+                (None, {"speed": 100}, {"hp": 50, "attack": 90}, {"defense": 0})):
+            with self.subTest(generation=generation, type_filter=type_filter, min_stats=min_stats):
+                ids = store.query(generation, type_filter, min_stats)
+                self.assertEqual(ids, scan.query(generation, type_filter, min_stats))
+                self.assertEqual(ids, self.expected(generation, type_filter, min_stats))
+
+    def test_unknown_type_matches_nothing(self):
+        self.assertEqual(self.open().query(type_filter="plasma"), [])
+
+    def test_unknown_stat_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.open().query(min_stats={"luck": 10})
+
+
+if __name__ == '__main__':
+    unittest.main()
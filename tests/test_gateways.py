@@ -0,0 +1,89 @@
+"""Tests for racing IPFS gateways."""
+
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'datasolver'))
+
+from providers.mcp.tools import gateways
+from providers.mcp.tools.gateways import GatewayPool
+
+FAST = "https://fast/ipfs/"
+SLOW = "https://slow/ipfs/"
+DOWN = "https://down/ipfs/"
+
+
+class FakeResponse:
+
+    def __init__(self, status_code, chunks, delay):
+        self.status_code = status_code
+        self.closed = threading.Event()
+        self._chunks = chunks
+        self._delay = delay
+
+    def iter_content(self, chunk_size):
+        for chunk in self._chunks:
+            time.sleep(self._delay)
+            yield chunk
+
+    def close(self):
+        self.closed.set()
+
+
+class FakeGateways:
+    """``FAST`` answers at once, ``SLOW`` trickles its body, ``DOWN`` returns 502."""
+
+    def __init__(self):
+        self.responses = []
+
+    def get(self, url, timeout=None, stream=False):
+        body = json.dumps({"data": [1, 2, 3]}).encode()
+        if url.startswith(FAST):
+            response = FakeResponse(200, [body], 0)
+        elif url.startswith(SLOW):
+            response = FakeResponse(200, [body[:1]] * 100 + [body[1:]], 0.05)
+        else:
+            response = FakeResponse(502, [b"bad gateway"], 0)
+        self.responses.append((url, response))
+        return response
+
+
+class GatewayPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = FakeGateways()
+        patcher = mock.patch.object(gateways, "get_http_client", return_value=self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_losing_gateway_closes_its_response(self):
+        pool = GatewayPool([SLOW, FAST], race_width=2, max_workers=2)
+        self.assertEqual(pool.fetch("cid"), {"data": [1, 2, 3]})
+
+        slow = [response for url, response in self.client.responses if url.startswith(SLOW)]
+        self.assertEqual(len(slow), 1)
+        # Far sooner than the 5s the slow body takes to arrive
+        self.assertTrue(slow[0].closed.wait(1))
+        self.assertEqual(pool.get_stats()[SLOW]['failures'], 0)
+
+    def test_stragglers_do_not_starve_later_fetches(self):
+        pool = GatewayPool([SLOW, FAST], race_width=2, max_workers=2)
+        started = time.monotonic()
+        for _ in range(5):
+            self.assertEqual(pool.fetch("cid"), {"data": [1, 2, 3]})
+        self.assertLess(time.monotonic() - started, 2)
+
+    def test_failed_gateway_falls_back_to_the_next(self):
+        pool = GatewayPool([DOWN, FAST], race_width=1)
+        with mock.patch.object(pool, "ranked", return_value=[DOWN, FAST]):
+            self.assertEqual(pool.fetch("cid"), {"data": [1, 2, 3]})
+        self.assertEqual(pool.get_stats()[DOWN]['failures'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""Tests for rebuilding the IPFS cache index from Pinata's pin list."""
+
+import json
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'datasolver'))
+
+from providers.mcp.tools import ipfs_cache
+from providers.mcp.tools.ipfs_cache import IPFSCache
+
+PIN_FILTER = json.dumps({"type": {"value": "pokemon_cache", "op": "eq"}})
+
+
+class FakeResponse:
+
+    def __init__(self, payload):
+        self.status_code = 200
+        self.text = json.dumps(payload)
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+class FakePinList:
+    """Serve ``rows`` a page at a time, like Pinata's pinList, recording each request."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.requests = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.requests.append(dict(params))
+        # Pinata filters on the keyvalues JSON; anything else lists every pin
+        rows = self.rows if params["metadata[keyvalues]"] == PIN_FILTER else self.rows + [{"unrelated": True}]
+        offset, limit = params["pageOffset"], params["pageLimit"]
+        return FakeResponse({"rows": rows[offset:offset + limit]})
+
+
+def pin_row(index, stored_at):
+    return {
+        "ipfs_pin_hash": f"cid{index}",
+        "date_pinned": "2024-01-01T00:00:00Z",
+        "metadata": {"keyvalues": {
+            "type": "pokemon_cache", "cache_key": f"k{index}",
+            "stored_at": str(stored_at), "data_type": "pokemon"
+        }}
+    }
+
+
+class RebuildIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        env = mock.patch.dict(os.environ, {
+            "PINATA_API_KEY": "key", "PINATA_SECRET_API_KEY": "secret", "PINATA_JWT_TOKEN": "",
+            "IPFS_CACHE_INDEX_PATH": "", "IPFS_CACHE_DISK_PATH": "", "CONTENT_INDEX_PATH": "",
+            "IPFS_CACHE_WRITE_BEHIND": "false", "IPFS_CACHE_REBUILD_ON_START": "false"
+        })
+        env.start()
+        self.addCleanup(env.stop)
+        self.cache = IPFSCache()
+        self.addCleanup(self.cache.cache_metadata.close)
+
+    def test_every_page_sends_the_keyvalues_filter(self):
+        now = int(time.time())
+        pins = FakePinList([pin_row(index, now - index) for index in range(5)])
+        with mock.patch.object(ipfs_cache, "get_http_client", return_value=pins):
+            self.assertEqual(self.cache.rebuild_index(page_size=2), 5)
+
+        self.assertEqual([request["pageOffset"] for request in pins.requests], [0, 2, 4])
+        for request in pins.requests:
+            self.assertEqual(request["metadata[keyvalues]"], PIN_FILTER)
+        self.assertEqual(
+            {key: entry["cid"] for key, entry in self.cache.cache_metadata.items()},
+            {f"k{index}": f"cid{index}" for index in range(5)}
+        )
+        self.assertEqual(self.cache.cache_metadata["k3"]["timestamp"], now - 3)
+        self.assertEqual(self.cache.cache_metadata["k3"]["data_type"], "pokemon")
+
+    def test_shared_pin_restores_every_fingerprint(self):
+        row = pin_row(0, int(time.time()))
+        row["metadata"]["keyvalues"]["cache_key"] = "k0,k9"
+        with mock.patch.object(ipfs_cache, "get_http_client", return_value=FakePinList([row])):
+            self.assertEqual(self.cache.rebuild_index(), 2)
+        self.assertEqual(self.cache.cache_metadata["k9"]["cid"], "cid0")
+        self.assertEqual(self.cache.cache_metadata["k0"]["cid"], "cid0")
+
+    def test_pins_past_retention_are_skipped(self):
+        pins = FakePinList([pin_row(0, int(time.time())), pin_row(1, 1)])
+        with mock.patch.object(ipfs_cache, "get_http_client", return_value=pins):
+            self.assertEqual(self.cache.rebuild_index(page_size=1), 1)
+        self.assertIn("k0", self.cache.cache_metadata)
+        self.assertNotIn("k1", self.cache.cache_metadata)
+
+
+if __name__ == '__main__':
+    unittest.main()
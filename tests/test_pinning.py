@@ -0,0 +1,132 @@
+"""Tests for content-addressed pinning shared by the IPFS cache and the dataset uploader."""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datasolver.writer import open_writer
+from datasolver.providers.mcp.tools import pinning
+from datasolver.providers.mcp.tools.pinning import ContentIndex, merge_keyvalues, pin_bytes
+
+RESULT = {
+    "data": [{"id": 1, "name": "bulbasaur", "stats": {"hp": 45}}, {"id": 4, "name": "charmander"}],
+    "count": 2,
+    "data_type": "pokemon",
+    "source": "PokéAPI via direct requests",
+    "cached": False
+}
+
+
+class FakeResponse:
+
+    def __init__(self, payload):
+        self.status_code = 200
+        self.text = json.dumps(payload)
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+class FakePinata:
+    """Record uploads and metadata updates; every upload gets a CID named after its order."""
+
+    def __init__(self):
+        self.uploads = []
+        self.updates = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def post(self, url, files=None, data=None, headers=None, timeout=None):
+        self.release.wait(5)
+        self.uploads.append((files["file"][1], json.loads(data["pinataMetadata"])))
+        return FakeResponse({"IpfsHash": f"cid{len(self.uploads)}"})
+
+    def put(self, url, data=None, headers=None, timeout=None):
+        self.updates.append(json.loads(data))
+        return FakeResponse({})
+
+
+class PinBytesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.pinata = FakePinata()
+        for patcher in (
+            mock.patch.object(pinning, "_index", ContentIndex(":memory:")),
+            mock.patch.object(pinning, "get_http_client", return_value=self.pinata)
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def drain_retags(self):
+        pinning._retag_executor.submit(lambda: None).result(timeout=5)
+
+    def test_solution_file_reuses_cache_pin(self):
+        cache_cid, reused = pin_bytes(pinning.canonical_dataset(RESULT), "pokemon_cache_k1.json",
+                                      keyvalues={"type": "pokemon_cache", "cache_key": "k1"},
+                                      list_keys=("cache_key",))
+        self.assertFalse(reused)
+
+        with tempfile.TemporaryDirectory() as directory:
+            with open_writer(os.path.join(directory, "solution"), "json", None) as writer:
+                writer.write_all(RESULT["data"])
+                path = writer.close(dict(RESULT, data=None, cache_stored=True))
+            with open(path, "rb") as f:
+                file_cid, reused = pin_bytes(f.read(), "solution.json")
+
+        self.assertEqual(file_cid, cache_cid)
+        self.assertTrue(reused)
+        self.assertEqual(len(self.pinata.uploads), 1)
+        self.drain_retags()
+        self.assertEqual(self.pinata.updates, [])
+
+    def test_reused_pin_keeps_every_cache_key(self):
+        content = pinning.canonical_dataset(RESULT)
+        pin_bytes(content, "a", keyvalues={"cache_key": "k1", "stored_at": "1"}, list_keys=("cache_key",))
+        pin_bytes(content, "b", keyvalues={"cache_key": "k2", "stored_at": "2"}, list_keys=("cache_key",))
+        # Nothing new: no metadata round trip
+        pin_bytes(content, "b", keyvalues={"cache_key": "k2", "stored_at": "2"}, list_keys=("cache_key",))
+        self.drain_retags()
+
+        self.assertEqual(len(self.pinata.uploads), 1)
+        self.assertEqual(len(self.pinata.updates), 1)
+        self.assertEqual(self.pinata.updates[0]["keyvalues"], {"cache_key": "k1,k2", "stored_at": "2"})
+
+    def test_concurrent_pins_share_one_upload(self):
+        self.pinata.release.clear()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(pin_bytes(b"same", "x"))) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        self.pinata.release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(self.pinata.uploads), 1)
+        self.assertEqual({cid for cid, _ in results}, {"cid1"})
+        self.assertEqual(sorted(reused for _, reused in results), [False, True, True])
+
+
+class MergeKeyvaluesTest(unittest.TestCase):
+
+    def test_list_keys_accumulate_up_to_the_limit(self):
+        keyvalues = {}
+        for index in range(pinning.KEYVALUE_LIST_LIMIT + 2):
+            keyvalues = merge_keyvalues(keyvalues, {"cache_key": f"k{index}", "type": "t"}, ("cache_key",))
+        keys = keyvalues["cache_key"].split(",")
+        self.assertEqual(len(keys), pinning.KEYVALUE_LIST_LIMIT)
+        self.assertEqual(keys[-1], f"k{pinning.KEYVALUE_LIST_LIMIT + 1}")
+        self.assertEqual(keyvalues["type"], "t")
+
+    def test_other_keys_are_replaced(self):
+        self.assertEqual(merge_keyvalues({"stored_at": "1"}, {"stored_at": "2"}), {"stored_at": "2"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""Tests for the SQLite response store behind the PokéAPI, record and IPFS disk caches."""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'datasolver'))
+
+from providers.mcp.tools import response_store
+from providers.mcp.tools.response_store import ResponseStore
+
+
+class ResponseStoreTest(unittest.TestCase):
+
+    def open(self, **kwargs):
+        store = ResponseStore(":memory:", **kwargs)
+        self.addCleanup(store.close)
+        return store
+
+    def accessed_at(self, store, endpoint):
+        return store._conn.execute("SELECT accessed_at FROM responses WHERE endpoint = ?", (endpoint,)).fetchone()[0]
+
+    def test_reads_do_not_write(self):
+        store = self.open()
+        store.put("pokemon/1", b"bulbasaur")
+        changes = store._conn.total_changes
+
+        for _ in range(10):
+            self.assertEqual(store.get("pokemon/1").body, b"bulbasaur")
+        self.assertIsNone(store.get("pokemon/2"))
+        self.assertEqual(store._conn.total_changes, changes)
+
+    def test_access_times_are_written_in_batches(self):
+        store = self.open(touch_batch=2)
+        with mock.patch.object(response_store.time, "time", return_value=1000):
+            store.put("pokemon/1", b"a")
+            store.put("pokemon/2", b"b")
+        with mock.patch.object(response_store.time, "time", return_value=2000):
+            store.get("pokemon/1")
+            self.assertEqual(self.accessed_at(store, "pokemon/1"), 1000)
+            store.get("pokemon/2")
+        self.assertEqual(self.accessed_at(store, "pokemon/1"), 2000)
+        self.assertEqual(self.accessed_at(store, "pokemon/2"), 2000)
+
+    def test_eviction_sees_buffered_reads(self):
+        store = self.open(max_bytes=25)
+        with mock.patch.object(response_store.time, "time", return_value=1000):
+            store.put("pokemon/1", b"x" * 10)
+            store.put("pokemon/2", b"x" * 10)
+        with mock.patch.object(response_store.time, "time", return_value=2000):
+            # Only in memory until the eviction below flushes it
+            store.get("pokemon/1")
+            store.put("pokemon/3", b"x" * 10)
+
+        self.assertIsNotNone(store.get("pokemon/1"))
+        self.assertIsNone(store.get("pokemon/2"))
+        self.assertEqual(store.evictions, 1)
+
+    def test_flush_keeps_newer_write_times(self):
+        store = self.open()
+        with mock.patch.object(response_store.time, "time", return_value=1000):
+            store.put("pokemon/1", b"a")
+            store.get("pokemon/1")
+        with mock.patch.object(response_store.time, "time", return_value=3000):
+            store.touch("pokemon/1")
+        store.flush()
+        self.assertEqual(self.accessed_at(store, "pokemon/1"), 3000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""Tests for compiling RFD schemas into projection plans."""
+
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'datasolver'))
+
+from providers.mcp.tools.schema_plan import compile_schema
+
+RECORD = {
+    "id": 25, "name": "pikachu", "height": 4, "weight": 60, "types": ["electric"],
+    "base_experience": 112, "stats": {"hp": 35}, "abilities": ["static"], "moves": ["thunder-shock"]
+}
+
+
+def schema(required=(), **properties):
+    return {"properties": properties, "required": list(required)}
+
+
+class CompileSchemaTest(unittest.TestCase):
+
+    def test_schemas_without_pokemon_fields_compile_to_nothing(self):
+        self.assertIsNone(compile_schema(None))
+        self.assertIsNone(compile_schema({}))
+        self.assertIsNone(compile_schema(schema(color={"type": "string"})))
+
+    def test_plan_keeps_listed_fields_in_record_order(self):
+        plan = compile_schema(schema(stats={"type": "object"}, name={"type": "string"}, color={"type": "string"}))
+        self.assertEqual(plan.fields, ["name", "stats"])
+        self.assertTrue(plan.wants("stats"))
+        self.assertFalse(plan.wants("moves"))
+        self.assertEqual(plan.project(RECORD), {"name": "pikachu", "stats": {"hp": 35}})
+
+    def test_required_fields_the_record_cannot_carry_are_dropped(self):
+        plan = compile_schema(schema(required=["name", "color"], name={"type": "string"}))
+        self.assertEqual(plan.required, ["name"])
+
+
+class ValidateTest(unittest.TestCase):
+
+    def test_valid_record(self):
+        plan = compile_schema(schema(required=["id"], id={"type": "integer"},
+                                     types={"type": "array", "items": {"type": "string"}}))
+        self.assertIsNone(plan.validate(plan.project(RECORD)))
+
+    def test_missing_required_field(self):
+        plan = compile_schema(schema(required=["stats"], name={"type": "string"}, stats={"type": "object"}))
+        self.assertEqual(plan.validate({"name": "pikachu"}), "missing required field 'stats'")
+        # Optional fields may be absent
+        plan = compile_schema(schema(name={"type": "string"}, stats={"type": "object"}))
+        self.assertIsNone(plan.validate({"name": "pikachu"}))
+
+    def test_wrong_type(self):
+        plan = compile_schema(schema(height={"type": "integer"}))
+        self.assertEqual(plan.validate({"height": "4"}), "field 'height' is not of type integer")
+        # Booleans are not integers
+        self.assertIsNotNone(plan.validate({"height": True}))
+
+    def test_wrong_item_type(self):
+        plan = compile_schema(schema(types={"type": "array", "items": {"type": "string"}}))
+        self.assertEqual(plan.validate({"types": ["electric", 1]}), "items of field 'types' are not of type string")
+
+    def test_null_base_experience_is_allowed_when_optional(self):
+        plan = compile_schema(schema(base_experience={"type": "integer"}))
+        self.assertIsNone(plan.validate({"base_experience": None}))
+
+    def test_null_base_experience_is_rejected_when_required(self):
+        plan = compile_schema(schema(required=["base_experience"], base_experience={"type": "integer"}))
+        self.assertEqual(plan.validate({"base_experience": None}), "field 'base_experience' is not of type integer")
+        # Unless the schema allows null itself
+        plan = compile_schema(schema(required=["base_experience"], base_experience={"type": ["integer", "null"]}))
+        self.assertIsNone(plan.validate({"base_experience": None}))
+
+
+class ExcludedRequiredTest(unittest.TestCase):
+
+    def test_required_sections_turned_off_by_the_rfd(self):
+        plan = compile_schema(schema(required=["stats", "moves"], stats={"type": "object"},
+                                     moves={"type": "array"}, abilities={"type": "array"}))
+        self.assertEqual(plan.excluded_required({"include_stats": False, "include_abilities": False}), ["stats"])
+        self.assertEqual(plan.excluded_required({"include_stats": True}), [])
+        self.assertEqual(plan.excluded_required({}), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
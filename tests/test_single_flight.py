@@ -0,0 +1,155 @@
+"""Tests for single-flight coalescing of identical RFDs and PokéAPI requests."""
+
+import asyncio
+import os
+import sys
+import threading
+import types
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'datasolver'))
+
+from providers.mcp.tools.pokemon import PokemonTool
+from providers.mcp.tools.single_flight import AsyncSingleFlight, SingleFlight
+
+
+class SingleFlightTest(unittest.TestCase):
+
+    def start_followers(self, flight, key, count, results):
+        """Start ``count`` threads calling ``flight.do(key)`` and wait until they have joined."""
+        threads = []
+        for _ in range(count):
+            def follow():
+                try:
+                    results.append(flight.do(key, lambda: "own"))
+                except Exception as e:
+                    results.append(e)
+            threads.append(threading.Thread(target=follow))
+            threads[-1].start()
+        while flight.get_stats()['coalesced'] < count:
+            threading.Event().wait(0.001)
+        return threads
+
+    def test_followers_share_the_leader_result(self):
+        flight = SingleFlight()
+        call, leader = flight.begin("k")
+        self.assertTrue(leader)
+        results = []
+        threads = self.start_followers(flight, "k", 3, results)
+
+        flight.finish("k", call, result="shared")
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(results, [("shared", True)] * 3)
+        self.assertEqual(flight.get_stats(), {'executions': 1, 'coalesced': 3, 'in_flight': 0})
+
+    def test_leader_error_reaches_every_follower(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def fail():
+            started.set()
+            release.wait(5)
+            raise ValueError("generation failed")
+
+        leader_error = []
+        leader = threading.Thread(target=lambda: self.assertRaises(ValueError, flight.do, "k", fail) or
+                                  leader_error.append(True))
+        leader.start()
+        self.assertTrue(started.wait(5))
+        results = []
+        threads = self.start_followers(flight, "k", 2, results)
+        release.set()
+        for thread in threads + [leader]:
+            thread.join(5)
+
+        self.assertEqual(leader_error, [True])
+        self.assertEqual(len(results), 2)
+        for result in results:
+            self.assertIsInstance(result, ValueError)
+        # The key is released, so the next call runs again
+        self.assertEqual(flight.do("k", lambda: "fresh"), ("fresh", False))
+
+    def test_abandoned_leader_releases_followers_without_a_result(self):
+        flight = SingleFlight()
+        call, _ = flight.begin("k")
+        results = []
+        threads = self.start_followers(flight, "k", 1, results)
+
+        # A stream closed before it finished publishes no result
+        flight.finish("k", call)
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(results, [(None, True)])
+        self.assertEqual(flight.get_stats()['in_flight'], 0)
+
+    def test_follower_of_an_abandoned_stream_generates_itself(self):
+        tool = types.SimpleNamespace(rfd_flight=SingleFlight())
+        call, _ = tool.rfd_flight.begin("k")
+        results = []
+        follower = threading.Thread(
+            target=lambda: results.append(PokemonTool._do_rfd_flight(tool, "k", lambda: {"count": 1})))
+        follower.start()
+        while tool.rfd_flight.get_stats()['coalesced'] < 1:
+            threading.Event().wait(0.001)
+
+        tool.rfd_flight.finish("k", call)
+        follower.join(5)
+        self.assertEqual(results, [({"count": 1}, False)])
+
+
+class AsyncSingleFlightTest(unittest.TestCase):
+
+    def test_coroutines_share_one_execution(self):
+        flight = AsyncSingleFlight()
+        runs = []
+
+        async def generate():
+            runs.append(1)
+            await asyncio.sleep(0.01)
+            return {"count": 1}
+
+        async def main():
+            return await asyncio.gather(*(flight.do("k", generate) for _ in range(4)))
+
+        results = asyncio.run(main())
+        self.assertEqual(len(runs), 1)
+        self.assertEqual(sorted(shared for _, shared in results), [False, True, True, True])
+        self.assertEqual(flight.get_stats()['in_flight'], 0)
+
+    def test_leader_error_reaches_followers(self):
+        flight = AsyncSingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("generation failed")
+
+        async def main():
+            return await asyncio.gather(*(flight.do("k", fail) for _ in range(3)), return_exceptions=True)
+
+        results = asyncio.run(main())
+        self.assertEqual(len(results), 3)
+        for result in results:
+            self.assertIsInstance(result, ValueError)
+
+    def test_cancelled_follower_does_not_cancel_the_leader(self):
+        flight = AsyncSingleFlight()
+
+        async def generate():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        async def main():
+            leader = asyncio.ensure_future(flight.do("k", generate))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(flight.do("k", generate))
+            await asyncio.sleep(0.01)
+            follower.cancel()
+            return await leader
+
+        self.assertEqual(asyncio.run(main()), ("done", False))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""Tests for the write-behind queue used by the IPFS cache."""
+
+import os
+import sys
+import threading
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'datasolver'))
+
+from providers.mcp.tools.write_behind import WriteBehindQueue
+
+
+class WriteBehindQueueTest(unittest.TestCase):
+
+    def test_resubmit_while_in_flight_writes_latest_item(self):
+        started = threading.Event()
+        release = threading.Event()
+        written = []
+
+        def handler(key, item):
+            written.append((key, item))
+            if item == 1:
+                started.set()
+                release.wait(5)
+            return True
+
+        writes = WriteBehindQueue(handler, backoff_seconds=0)
+        self.assertTrue(writes.submit('k', 1))
+        self.assertTrue(started.wait(5))
+
+        # 1 is being written: 2 and 3 collapse into one follow-up write
+        self.assertTrue(writes.submit('k', 2))
+        self.assertTrue(writes.submit('k', 3))
+        release.set()
+
+        self.assertTrue(writes.flush(timeout=5))
+        self.assertEqual(written, [('k', 1), ('k', 3)])
+        stats = writes.get_stats()
+        self.assertEqual(stats['depth'], 0)
+        self.assertEqual(stats['completed'], 2)
+        self.assertEqual(stats['coalesced'], 2)
+        self.assertIsNone(writes.pending('k'))
+
+        # The worker is still alive after the interleaving
+        self.assertTrue(writes.submit('k', 4))
+        self.assertTrue(writes.close(timeout=5))
+        self.assertEqual(written[-1], ('k', 4))
+
+    def test_resubmit_while_queued_replaces_item(self):
+        release = threading.Event()
+        written = []
+
+        def handler(key, item):
+            release.wait(5)
+            written.append((key, item))
+            return True
+
+        writes = WriteBehindQueue(handler, backoff_seconds=0)
+        writes.submit('blocker', 0)
+        writes.submit('k', 1)
+        writes.submit('k', 2)
+        release.set()
+
+        self.assertTrue(writes.close(timeout=5))
+        self.assertIn(('k', 2), written)
+        self.assertNotIn(('k', 1), written)
+
+    def test_failed_writes_are_retried_then_given_up(self):
+        attempts = []
+        writes = WriteBehindQueue(lambda key, item: attempts.append(key) or False,
+                                  max_retries=2, backoff_seconds=0)
+        writes.submit('k', 1)
+
+        self.assertTrue(writes.close(timeout=5))
+        self.assertEqual(len(attempts), 3)
+        stats = writes.get_stats()
+        self.assertEqual(stats['failed'], 1)
+        self.assertEqual(stats['retries'], 2)
+
+    def test_orphaned_key_does_not_stall_flush(self):
+        writes = WriteBehindQueue(lambda key, item: True, backoff_seconds=0)
+        with writes._lock:
+            # A queue slot without a pending item must not kill the worker
+            writes._outstanding += 1
+            writes._queue.put_nowait('ghost')
+
+        self.assertTrue(writes.flush(timeout=5))
+        writes.submit('k', 1)
+        self.assertTrue(writes.close(timeout=5))
+        self.assertEqual(writes.get_stats()['completed'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+"""Round-trip tests for the dataset writers in every format and compression."""
+
+import gzip
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datasolver import writer
+from datasolver.writer import open_writer, flatten_record
+from datasolver.providers.mcp.tools.pinning import canonical_dataset
+
+RECORDS = [
+    {
+        "id": 1,
+        "name": "bulbasaur",
+        "types": ["grass", "poison"],
+        "stats": {"hp": 45, "speed": 45},
+        "abilities": [{"name": "overgrow", "is_hidden": False, "slot": 1}]
+    },
+    {
+        # Empty nested values next to populated ones in the other record
+        "id": 2,
+        "name": "pokémon-2",
+        "types": [],
+        "stats": {},
+        "abilities": []
+    }
+]
+METADATA = {"count": 2, "data_type": "pokemon", "source": "test", "cached": False}
+# How this node served the dataset is not part of the file
+WRITTEN_METADATA = {"count": 2, "data_type": "pokemon"}
+COMPRESSIONS = (None, "gzip", "zstd")
+
+
+def read_bytes(path):
+    """Read a file, decompressing it according to its suffix."""
+    if path.endswith(".gz"):
+        with gzip.open(path, "rb") as f:
+            return f.read()
+    if path.endswith(".zst"):
+        import zstandard
+        with open(path, "rb") as f:
+            return zstandard.ZstdDecompressor().stream_reader(f).read()
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def flattened_columns():
+    """Return the columns ``ColumnarWriter`` should produce for ``RECORDS``."""
+    rows = [flatten_record(record) for record in RECORDS]
+    names = {}
+    for row in rows:
+        names.update(dict.fromkeys(row))
+    return {name: [row.get(name) for row in rows] for name in names}
+
+
+class WriterRoundTripTest(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+
+    def write(self, output_format, compression, pretty=False):
+        stem = os.path.join(self._dir.name, f"dataset_{output_format}_{compression}")
+        with open_writer(stem, output_format, compression, pretty=pretty) as dataset_writer:
+            dataset_writer.write_all(RECORDS)
+            path = dataset_writer.close(dict(METADATA, data=["ignored"]))
+        self.assertEqual(dataset_writer.count, len(RECORDS))
+        # Only the final file is left behind
+        self.assertEqual(os.listdir(self._dir.name), [os.path.basename(path)])
+        return path
+
+    def test_json(self):
+        for compression in COMPRESSIONS:
+            for pretty in (False, True):
+                with self.subTest(compression=compression, pretty=pretty):
+                    dataset = json.loads(read_bytes(self.write("json", compression, pretty)))
+                    self.assertEqual(dataset, dict(WRITTEN_METADATA, data=RECORDS))
+                    self.clear()
+
+    def test_compact_json_matches_cache_pin(self):
+        # The IPFS cache pins canonical_dataset bytes, so the uploaded file reuses its CID
+        path = self.write("json", None)
+        self.assertEqual(read_bytes(path), canonical_dataset(dict(METADATA, data=RECORDS, cache_stored=True)))
+
+    def test_jsonl(self):
+        for compression in COMPRESSIONS:
+            with self.subTest(compression=compression):
+                lines = read_bytes(self.write("jsonl", compression)).decode("utf-8").splitlines()
+                self.assertEqual([json.loads(line) for line in lines[:-1]], RECORDS)
+                self.assertEqual(json.loads(lines[-1]), {"_metadata": WRITTEN_METADATA})
+                self.clear()
+
+    def test_columnar_and_parquet_without_pyarrow(self):
+        with mock.patch.object(writer, "_import_pyarrow", return_value=None):
+            for output_format in ("columnar", "parquet"):
+                for compression in COMPRESSIONS:
+                    with self.subTest(output_format=output_format, compression=compression):
+                        path = self.write(output_format, compression)
+                        self.assertIn(".columns.json", path)
+                        dataset = json.loads(read_bytes(path))
+                        self.assertEqual(dataset, dict(WRITTEN_METADATA, columns=flattened_columns()))
+                        self.clear()
+
+    def test_columnar_with_pyarrow(self):
+        pyarrow = writer._import_pyarrow()
+        if pyarrow is None:
+            self.skipTest("pyarrow not installed")
+        for compression in COMPRESSIONS:
+            with self.subTest(compression=compression):
+                path = self.write("columnar", compression)
+                self.assertIn(".arrows", path)
+                with pyarrow.input_stream(path, compression="detect") as source:
+                    table = pyarrow.ipc.open_stream(source).read_all()
+                self.assert_table(table)
+                self.clear()
+
+    def test_parquet_with_pyarrow(self):
+        pyarrow = writer._import_pyarrow()
+        if pyarrow is None:
+            self.skipTest("pyarrow not installed")
+        import pyarrow.parquet as parquet
+        for compression in COMPRESSIONS:
+            with self.subTest(compression=compression):
+                path = self.write("parquet", compression)
+                self.assertTrue(path.endswith(".parquet"))
+                self.assert_table(parquet.read_table(path))
+                self.clear()
+
+    def assert_table(self, table):
+        self.assertEqual(table.to_pydict(), flattened_columns())
+        metadata = json.loads(table.schema.metadata[b"dataset_metadata"])
+        self.assertEqual(metadata, WRITTEN_METADATA)
+
+    def clear(self):
+        for name in os.listdir(self._dir.name):
+            os.remove(os.path.join(self._dir.name, name))
+
+
+class FlattenRecordTest(unittest.TestCase):
+
+    def test_empty_objects_become_none(self):
+        self.assertEqual(
+            flatten_record({"stats": {}, "abilities": [{}, {"name": "x", "extra": {}}], "moves": []}),
+            {"stats": None, "abilities": [None, {"name": "x", "extra": None}], "moves": []}
+        )
+
+    def test_nested_objects_become_dotted_columns(self):
+        self.assertEqual(flatten_record({"stats": {"hp": 1, "speed": 2}}), {"stats.hp": 1, "stats.speed": 2})
+
+
+class WriterAbortTest(unittest.TestCase):
+
+    def test_failed_write_keeps_previous_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "dataset.json")
+            with open(path, "w") as f:
+                f.write("previous")
+            with self.assertRaises(ValueError):
+                with writer.DatasetWriter(path) as dataset_writer:
+                    dataset_writer.write(RECORDS[0])
+                    raise ValueError("generation failed")
+            with open(path) as f:
+                self.assertEqual(f.read(), "previous")
+            self.assertEqual(os.listdir(directory), ["dataset.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()